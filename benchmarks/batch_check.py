@@ -0,0 +1,82 @@
+import argparse                                                                                        # Command line options
+import os                                                                                              # Paths of the argument files and outputs
+import subprocess                                                                                      # Every solver runs main.py like a user would
+import sys                                                                                             # Path of the interpreter
+import tempfile                                                                                        # Snapshot and outputs of the check
+from benchmarks.synthetic_catalog import generate_catalog, write_snapshot                              # Made up pages (no Selenium)
+from genetic_algorithm.class_schedule_solver import SOLVERS                                            # Every solver that can be selected
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))                                     # Directory of main.py
+
+
+def write_argument_files(directory, contents):
+    """
+    Writes the argument files of a batch: one that asks for every course, the same courses in another order (solved only once) and one
+    course of every department.
+
+    :param directory: A string that is the directory of the argument files, it is made if it does not exist.
+    :param contents: A list of (department code, list of course numbers) tuples, see synthetic_catalog.write_snapshot.
+    :return: A list of strings that are the paths of the argument files.
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    codes = [code for code, course_numbers in contents]
+    arguments = {'every_course': [', '.join(course_numbers) for code, course_numbers in contents],
+                 'every_course_reversed': [', '.join(reversed(course_numbers)) for code, course_numbers in contents],
+                 'one_course': [course_numbers[0] for code, course_numbers in contents]}
+    paths = []
+    for name, course_lines in arguments.items():
+        path = os.path.join(directory, name + '.txt')
+        with open(path, 'w') as file:
+            file.write(','.join(codes) + '\n' + '\n'.join(course_lines) + '\n')
+        paths.append(path)
+    return paths
+
+
+def run_batch(snapshot_directory, batch_directory, output_directory, solver, batch_workers):
+    """
+    Runs batch mode of main.py on a snapshot with one solver.
+
+    :param snapshot_directory: A string that is the snapshot directory (--replay).
+    :param batch_directory: A string that is the directory of the argument files (--batch).
+    :param output_directory: A string that is the directory of the schedules (--batch-output).
+    :param solver: A string that is the name of the solver.
+    :param batch_workers: An integer that is the number of worker processes (--batch-workers).
+    :return: A CompletedProcess object with the output of the run.
+    """
+
+    return subprocess.run([sys.executable, 'main.py', '--replay', snapshot_directory, '--batch', batch_directory, '--batch-output',
+                           output_directory, '--solver', solver, '--batch-workers', str(batch_workers), '--seed', '0', '--max-schedules', '5'],
+                          cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run batch mode of main.py once with every solver on a synthetic snapshot.")
+    parser.add_argument('--solvers', default=','.join(SOLVERS), help="Comma separated solvers to check (default: every solver).")
+    parser.add_argument('--courses', type=int, default=4, help="Synthetic courses over all of the departments (default: 4).")
+    parser.add_argument('--batch-workers', type=int, default=2, help="Worker processes of batch mode (default: 2).")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the synthetic catalog (default: 0).")
+    arguments = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        catalog = generate_catalog(arguments.courses, tba_ratio=0, conflict_density=0.2, seed=arguments.seed)
+        contents = write_snapshot(os.path.join(directory, 'snapshot'), catalog)
+        paths = write_argument_files(os.path.join(directory, 'batch'), contents)
+        for solver in arguments.solvers.split(','):
+            output_directory = os.path.join(directory, 'schedules-' + solver)
+            result = run_batch(os.path.join(directory, 'snapshot'), os.path.join(directory, 'batch'), output_directory, solver,
+                               arguments.batch_workers)
+            written = [path for path in paths if os.path.isfile(os.path.join(output_directory, os.path.splitext(os.path.basename(path))[0]
+                                                                             + '_class_schedule.txt'))]
+            print(solver + ": exit code " + str(result.returncode) + ", " + str(len(written)) + " of " + str(len(paths)) + " argument files solved")
+            if result.returncode != 0 or len(written) != len(paths):
+                failures.append(solver)
+                print(result.stdout)
+    for solver in failures:
+        print("FAILED: batch mode with --solver " + solver)
+    sys.exit(1 if len(failures) > 0 else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+import argparse                                                                                        # Command line options
+import json                                                                                            # Machine-readable results
+import os                                                                                              # Results directory and the root of the project
+import platform                                                                                        # Python version of the run
+import statistics                                                                                      # Median of the runs
+import subprocess                                                                                      # Every run is a new interpreter (a cold start)
+import sys                                                                                             # Path of the interpreter
+import time                                                                                            # Timing of every run
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))                                     # Directory of main.py
+HEAVY_MODULES = ('numpy', 'openpyxl', 'bs4', 'lxml', 'selenium', 'asyncio', 'concurrent.futures')     # Only the code paths that use them may load them
+LOADED_MODULES = "import sys, main; print(','.join(m for m in " + repr(HEAVY_MODULES) + " if m in sys.modules))"
+
+
+def time_command(command, repeat):
+    """
+    Runs a command in a new interpreter several times.
+
+    :param command: A list of the arguments after the path of the interpreter, e.g. ['main.py', '--help'].
+    :param repeat: An integer that is the number of runs.
+    :return: A list of the seconds of every run.
+    """
+
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def get_import_times(module='main'):
+    """
+    Reads the report of 'python -X importtime' for a module.
+
+    :param module: A string that is the name of the module to import.
+    :return: A list of (cumulative microseconds, name of module) tuples, the slowest first.
+    """
+
+    report = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module], cwd=ROOT, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, universal_newlines=True, check=True).stderr
+    import_times = []
+    for line in report.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        import_times.append((int(cumulative), name.strip()))
+    return sorted(import_times, reverse=True)
+
+
+def get_loaded_heavy_modules():
+    """
+    Checks which of the heavy modules are loaded by 'import main'.
+
+    :return: A list of the names of the heavy modules that were loaded.
+    """
+
+    output = subprocess.run([sys.executable, '-c', LOADED_MODULES], cwd=ROOT, stdout=subprocess.PIPE, universal_newlines=True, check=True).stdout
+    return [name for name in output.strip().split(',') if name != '']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the cold start of main.py and check it against a budget.")
+    parser.add_argument('--budget', type=float, default=100, help="Largest median milliseconds of 'main.py --help' (default: 100).")
+    parser.add_argument('--repeat', type=int, default=10, help="Runs of every command (default: 10).")
+    parser.add_argument('--top', type=int, default=10, help="Slowest imports to show (default: 10).")
+    parser.add_argument('--output', default=None, help="Path of the JSON results (default: benchmarks/results/imports-<time>.json).")
+    arguments = parser.parse_args()
+
+    interpreter = statistics.median(time_command(['-c', 'pass'], arguments.repeat)) * 1000         # Start-up that no import can save
+    start_up = statistics.median(time_command(['main.py', '--help'], arguments.repeat)) * 1000
+    import_times = get_import_times()
+    loaded_heavy_modules = get_loaded_heavy_modules()
+
+    print("python -c pass: " + '%.1f' % interpreter + " ms")
+    print("main.py --help: " + '%.1f' % start_up + " ms (budget " + '%.0f' % arguments.budget + " ms)")
+    print("import main: " + '%.1f' % (import_times[0][0] / 1000) + " ms, slowest imports:")
+    for cumulative, name in import_times[1:arguments.top + 1]:
+        print("    " + '%.1f' % (cumulative / 1000) + " ms " + name)
+    failures = []
+    if start_up > arguments.budget:
+        failures.append("main.py --help took " + '%.1f' % start_up + " ms, over the budget of " + '%.0f' % arguments.budget + " ms")
+    if len(loaded_heavy_modules) > 0:
+        failures.append("import main loaded " + ", ".join(loaded_heavy_modules))
+
+    output = arguments.output
+    if output is None:
+        output = os.path.join('benchmarks', 'results', 'imports-' + time.strftime('%Y%m%d-%H%M%S') + '.json')
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump({'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(), 'parameters': vars(arguments),
+                   'interpreter_ms': interpreter, 'start_up_ms': start_up, 'import_times': import_times,
+                   'loaded_heavy_modules': loaded_heavy_modules, 'failures': failures}, file, indent=2)
+    print('Results written to ' + output)
+    for failure in failures:
+        print("OVER BUDGET: " + failure)
+    sys.exit(1 if len(failures) > 0 else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+import argparse                                                                                        # Command line options
+import glob                                                                                            # Recorded pages of a directory
+import json                                                                                            # Machine-readable results
+import os                                                                                              # Results directory
+import platform                                                                                        # Python version of the run
+import time                                                                                            # Timing of every parser
+from bs4 import BeautifulSoup                                                                          # The original parsing path
+from benchmarks.synthetic_catalog import generate_catalog, render_department_html                      # Made up pages (no Selenium)
+from scrape.class_parser import scrape_classes, scrape_classes_from_html, HTML_PARSER                  # The parsers that are timed
+
+PARSERS = {
+    'scrape_classes': lambda html: scrape_classes(BeautifulSoup(html, 'html.parser')),                 # The whole page as a tree
+    'scrape_classes_from_html': scrape_classes_from_html,                                              # Only the class rows
+}
+
+
+def get_class_fields(courses):
+    """
+    Flattens parsed courses into comparable values, to check that every parser makes the same courses.
+
+    :param courses: A list of Course objects.
+    :return: A list of (name of course, tuple of class fields) tuples.
+    """
+
+    fields = []
+    for course in courses:
+        for _class in course.get_all_classes():
+            fields.append((course.get_name_of_course(), (_class.code, _class.type_of_class, _class.section, _class.units, _class.instructor,
+                                                         _class.days, _class.start, _class.end, _class.place, _class.final, _class.capacity,
+                                                         _class.enrolled, _class.wait_list, _class.status)))
+    return fields
+
+
+def benchmark_pages(pages, repeat):
+    """
+    Times every parser on the same pages and checks that they agree.
+
+    :param pages: A list of strings that are results pages.
+    :param repeat: An integer that is the number of times to parse the pages.
+    :return: A list of dictionaries, one per parser.
+    """
+
+    results = []
+    expected = None
+    number_of_bytes = sum(len(page) for page in pages)
+    for name, parse in PARSERS.items():
+        seconds = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            courses = [parse(page) for page in pages]
+            seconds.append(time.perf_counter() - start)
+        fields = [get_class_fields(department) for department in courses]
+        if expected is None:
+            expected = fields
+        number_of_classes = sum(len(department) for department in fields)
+        results.append({'parser': name, 'pages': len(pages), 'classes': number_of_classes, 'bytes': number_of_bytes, 'seconds': seconds,
+                        'classes_per_second': number_of_classes / min(seconds), 'same_output': fields == expected})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the class search parsers on recorded or synthetic results pages.")
+    parser.add_argument('--fixtures', default=None, metavar='DIR', help="Directory of recorded *.html results pages (default: synthetic pages).")
+    parser.add_argument('--departments', type=int, default=10, help="Synthetic departments (pages) to parse (default: 10).")
+    parser.add_argument('--courses', type=int, default=400, help="Synthetic courses over all of the departments (default: 400).")
+    parser.add_argument('--sections', type=int, default=4, help="Classes per type of class of every synthetic course (default: 4).")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs of every parser (default: 3).")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the synthetic catalog (default: 0).")
+    parser.add_argument('--output', default=None, help="Path of the JSON results (default: benchmarks/results/parsers-<time>.json).")
+    arguments = parser.parse_args()
+
+    if arguments.fixtures is not None:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(arguments.fixtures, '*.html'))):
+            with open(path, encoding='utf-8') as file:
+                pages.append(file.read())
+    else:
+        catalog = generate_catalog(arguments.courses, arguments.departments, sections_per_type=arguments.sections, seed=arguments.seed)
+        pages = [render_department_html(department) for department in catalog]
+
+    results = benchmark_pages(pages, arguments.repeat)
+    for result in results:
+        result['best_seconds'] = min(result['seconds'])
+        print(result['parser'] + ': ' + '%.4f' % result['best_seconds'] + 's, ' + '%.0f' % result['classes_per_second'] + ' classes/s'
+              + ('' if result['same_output'] else ' (DIFFERENT OUTPUT)'))
+
+    output = arguments.output
+    if output is None:
+        output = os.path.join('benchmarks', 'results', 'parsers-' + time.strftime('%Y%m%d-%H%M%S') + '.json')
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump({'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(), 'html_parser': HTML_PARSER,
+                   'parameters': vars(arguments), 'results': results}, file, indent=2)
+    print('Results written to ' + output)
+
+
+if __name__ == '__main__':
+    main()
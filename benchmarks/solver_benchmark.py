@@ -0,0 +1,125 @@
+import argparse                                                                                        # Command line options
+import json                                                                                            # Machine-readable results
+import os                                                                                              # Results directory
+import platform                                                                                        # Python version of the run
+import random                                                                                          # Random pairs of classes to compare
+import time                                                                                            # Timing of every stage
+from benchmarks.synthetic_catalog import generate_catalog                                              # Made up catalogs (no Selenium)
+from classes_and_functions.class_base_exceptions import WorkingScheduleNotFound                        # A solver did not find a schedule
+from genetic_algorithm.class_schedule_solver import get_schedules, is_between, satisfied_requirements  # The functions that are timed
+from genetic_algorithm.evolution import Evolution                                                      # Fitness ranking is timed on its own
+
+SOLVER_OPTIONS = {                                                                                     # Keep every solver's run bounded
+    'ga': {},
+    'vectorized': {},
+    'backtracking': {'max_schedules': 1000},
+    'decomposed': {'max_schedules': 1000},
+    'islands': {'number_of_islands': 2},
+}
+
+
+def time_stage(function, repeat):
+    """
+    Times a function a number of times.
+
+    :param function: A function without parameters.
+    :param repeat: An integer that is the number of times to run it.
+    :return: A list of the seconds that every run took and the return value of the last run.
+    """
+
+    seconds = []
+    value = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = function()
+        seconds.append(time.perf_counter() - start)
+    return seconds, value
+
+
+def benchmark_catalog(departments, solvers, repeat, seed):
+    """
+    Times every stage of the solvers on one catalog.
+
+    :param departments: A list of departments (each department is a list of Course objects).
+    :param solvers: A list of names of solvers to time (see class_schedule_solver.SOLVERS).
+    :param repeat: An integer that is the number of times to run every stage.
+    :param seed: An integer to seed the solvers with.
+    :return: A list of dictionaries, one per stage.
+    """
+
+    results = []
+    classes = [_class for department in departments for course in department for _class in course.get_all_classes()]
+    generator = random.Random(seed)
+    pairs = [(generator.choice(classes), generator.choice(classes)) for _ in range(10000)]
+    seconds, value = time_stage(lambda: [is_between(class_a, class_b) for class_a, class_b in pairs], repeat)
+    results.append({'stage': 'is_between', 'calls': len(pairs), 'seconds': seconds})
+
+    darwin = Evolution(departments, 100)
+    population = darwin.get_starting_population()
+
+    def rank_population():
+        for schedule in population:
+            schedule.set_fitness_score(None)                                                           # Rank every schedule, not just the new ones
+        darwin.fitness_cache.scores.clear()
+        for schedule in population:
+            darwin.rank_fitness(schedule)
+    seconds, value = time_stage(rank_population, repeat)
+    results.append({'stage': 'rank_fitness', 'calls': len(population), 'seconds': seconds})
+    seconds, value = time_stage(lambda: [satisfied_requirements(schedule) for schedule in population], repeat)
+    results.append({'stage': 'satisfied_requirements', 'calls': len(population), 'seconds': seconds})
+
+    for solver in solvers:
+        options = dict(SOLVER_OPTIONS.get(solver, {}))
+        if solver not in ('backtracking', 'decomposed'):                                               # Seed the genetic algorithms so that runs can be compared
+            options['seed'] = seed
+
+        def solve():
+            try:
+                return sum(1 for schedule in get_schedules(departments, solver, **options))
+            except WorkingScheduleNotFound:
+                return 0
+        seconds, value = time_stage(solve, repeat)
+        results.append({'stage': 'get_schedules', 'solver': solver, 'schedules_found': value, 'seconds': seconds})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time how the schedule solvers scale on synthetic catalogs.")
+    parser.add_argument('--courses', default='2,4,6,8', help="Comma separated numbers of courses to benchmark (default: 2,4,6,8).")
+    parser.add_argument('--sections', type=int, default=4, help="Classes per type of class of every course (default: 4).")
+    parser.add_argument('--lab-ratio', type=float, default=0.3, help="Probability of a course having labs (default: 0.3).")
+    parser.add_argument('--discussion-ratio', type=float, default=0.6, help="Probability of a course having discussions (default: 0.6).")
+    parser.add_argument('--tba-ratio', type=float, default=0.05, help="Probability of a class having a TBA time (default: 0.05).")
+    parser.add_argument('--conflict-density', type=float, default=0.5, help="0 to 1, how much classes overlap (default: 0.5).")
+    parser.add_argument('--solvers', default='ga,vectorized,backtracking', help="Comma separated solvers to time (default: ga,vectorized,backtracking).")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs of every stage (default: 3).")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the catalogs and solvers (default: 0).")
+    parser.add_argument('--output', default=None, help="Path of the JSON results (default: benchmarks/results/solvers-<time>.json).")
+    arguments = parser.parse_args()
+
+    parameters = vars(arguments).copy()
+    runs = []
+    for number_of_courses in [int(courses) for courses in arguments.courses.split(',')]:
+        departments = generate_catalog(number_of_courses, sections_per_type=arguments.sections, lab_ratio=arguments.lab_ratio,
+                                       discussion_ratio=arguments.discussion_ratio, tba_ratio=arguments.tba_ratio,
+                                       conflict_density=arguments.conflict_density, seed=arguments.seed)
+        for result in benchmark_catalog(departments, arguments.solvers.split(','), arguments.repeat, arguments.seed):
+            result['courses'] = number_of_courses
+            result['best_seconds'] = min(result['seconds'])
+            runs.append(result)
+            stage = result['stage'] + (' (' + result['solver'] + ')' if 'solver' in result else '')
+            print(str(number_of_courses) + ' courses, ' + stage + ': ' + '%.6f' % result['best_seconds'] + 's')
+
+    output = arguments.output
+    if output is None:
+        output = os.path.join('benchmarks', 'results', 'solvers-' + time.strftime('%Y%m%d-%H%M%S') + '.json')
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump({'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(),
+                   'parameters': parameters, 'results': runs}, file, indent=2)
+    print('Results written to ' + output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+import os                                                                               # Snapshot directory
+import random                                                                           # Random (but seeded) catalogs
+from classes_and_functions.department import Course, Class                             # The data structures that are scraped
+from scrape import snapshot                                                             # Layout of a recorded snapshot
+
+MEETING_DAYS = ['MWF', 'TuTh', 'MW', 'TuTh', 'MWF', 'M', 'Tu', 'W', 'Th', 'F']            # Common UCI meeting patterns, the common ones are repeated
+FIRST_START_MINUTE = 8 * 60                                                             # The earliest classes start at 8:00 AM
+NUMBER_OF_START_TIMES = 24                                                              # Every half hour from 8:00 AM to 7:30 PM
+
+
+def generate_catalog(number_of_courses=6, number_of_departments=2, sections_per_type=4, lab_ratio=0.3, discussion_ratio=0.6,
+                     tba_ratio=0.05, conflict_density=0.5, seed=None):
+    """
+    This function makes a made up catalog in the same shape as the web-scraped one, so that the solvers can be timed without Selenium or the
+    UCI website.
+
+    :param number_of_courses: An integer that is the total number of courses (split up over the departments).
+    :param number_of_departments: An integer that is the number of departments.
+    :param sections_per_type: An integer that is the number of classes of every type of class of a course.
+    :param lab_ratio: The probability of a course having lab classes.
+    :param discussion_ratio: The probability of a course having discussion classes.
+    :param tba_ratio: The probability of a class having a TBA meeting time.
+    :param conflict_density: A number from 0 to 1, the higher it is the fewer start times the classes share (so the more they conflict).
+    :param seed: An integer to seed the random number generator with.
+    :return: A list of departments (each department is a list of Course objects).
+    """
+
+    generator = random.Random(seed)
+    number_of_start_times = max(1, int(round((1 - conflict_density) * NUMBER_OF_START_TIMES)))
+    departments = [[] for _ in range(number_of_departments)]
+    code = 10000
+    for course_number in range(number_of_courses):
+        course = Course('SYN' + str(course_number % number_of_departments) + ' ' + str(100 + course_number) + ' SYNTHETIC COURSE')
+        types_of_class = ['Lec']
+        if generator.random() < discussion_ratio:
+            types_of_class.append('Dis')
+        if generator.random() < lab_ratio:
+            types_of_class.append('Lab')
+        for type_of_class in types_of_class:
+            for section in range(sections_per_type):
+                code += 1
+                days, start, end = generate_meeting_time(generator, number_of_start_times, tba_ratio)
+                capacity = generator.randint(20, 300)
+                course.add_class(type_of_class, Class(course.get_name_of_course(), type_of_class, chr(ord('A') + section % 26), code, 4,
+                                                      'STAFF', days, start, end, 'SYN 100', '', capacity,
+                                                      generator.randint(0, capacity), 0, 'OPEN'))
+        departments[course_number % number_of_departments].append(course)
+    return departments
+
+
+def generate_meeting_time(generator, number_of_start_times, tba_ratio):
+    """
+    Makes a random meeting time in the format of 'class_parser.parse_day_and_time'.
+
+    :param generator: A random.Random object.
+    :param number_of_start_times: An integer that is the number of half hour start times to choose from.
+    :param tba_ratio: The probability of a TBA meeting time.
+    :return: The days, start time and end time (military time) strings.
+    """
+
+    if generator.random() < tba_ratio:
+        return 'TBA', 'TBA', 'TBA'
+    days = generator.choice(MEETING_DAYS)
+    start_minute = FIRST_START_MINUTE + 30 * generator.randrange(number_of_start_times)
+    end_minute = start_minute + (80 if days == 'TuTh' else 50)
+    return days, '%02d:%02d' % divmod(start_minute, 60), '%02d:%02d' % divmod(end_minute, 60)
+
+
+def render_department_html(department):
+    """
+    Renders a department of a catalog as a results page in the layout of the UCI class search (WebSoc), so that the parser can be timed without
+    the UCI website. 'class_parser.scrape_classes' makes the same courses back out of the page.
+
+    :param department: A list of Course objects.
+    :return: A string that is the html of the results page.
+    """
+
+    rows = []
+    for course in department:
+        rows.append('<tr class="blue-bar"><th>Code</th><th>Type</th><th>Sec</th><th>Units</th><th>Instructor</th><th>Time</th><th>Place</th>'
+                    '<th>Final</th><th>Max</th><th>Enr</th><th>WL</th><th>Req</th><th>Nor</th><th>Rstr</th><th>Textbooks</th><th>Web</th>'
+                    '<th>Status</th></tr>')
+        rows.append('<tr valign="top" bgcolor="#fff0ff"><td class="CourseTitle" colspan="0" nowrap="nowrap">&nbsp; '
+                    + course.get_name_of_course().replace('&', '&amp;') + ' <span>(Prerequisites)</span></td></tr>')
+        for _class in course.get_lecture_classes() + course.get_discussion_classes() + course.get_lab_classes():
+            cells = [str(_class.code), _class.type_of_class, _class.section, str(_class.units), _class.instructor,
+                     render_meeting_time(_class.days, _class.start, _class.end), _class.place, _class.final, str(_class.capacity),
+                     str(_class.enrolled), str(_class.wait_list), '0', 'n/a', 'A', '<a href="#">Bookstore</a>', '&nbsp;', _class.status]
+            rows.append('<tr valign="top" bgcolor="#FFFFCC">' + ''.join('<td>' + cell + '</td>' for cell in cells) + '</tr>')
+    return ('<html><head><title>Schedule of Classes</title></head><body><form action="/perl/WebSoc" method="post"><input type="hidden" '
+            'name="YearTerm" value="2019-92"></form><div class="course-list"><table cellpadding="1" cellspacing="0">'
+            + '\n'.join(rows) + '</table></div></body></html>')
+
+
+def write_snapshot(directory, departments, term='Synthetic Term'):
+    """
+    Writes a catalog as a snapshot directory in the layout of 'snapshot.RecordingBackend', so that main.py can run on it with --replay (e.g. in
+    batch_check.py) or it can be served by websoc_stand_in.py. Every department is one results page with all of its courses, the department
+    codes are the first words of the names of the courses (e.g. "SYN0") and the course numbers the second words (e.g. "100").
+
+    :param directory: A string that is the path of the snapshot directory, it is made if it does not exist.
+    :param departments: A list of departments (each department is a list of Course objects), see generate_catalog.
+    :param term: A string that is the name of the term.
+    :return: A list of (department code, list of course numbers) tuples, one per department.
+    """
+
+    os.makedirs(os.path.join(directory, snapshot.PAGES_DIRECTORY), exist_ok=True)
+    department_options = {}
+    index = {}
+    contents = []
+    for department in departments:
+        if len(department) == 0:
+            continue
+        code = department[0].get_name_of_course().split()[0]
+        course_numbers = [course.get_name_of_course().split()[1] for course in department]
+        department_options[code] = 'SYNTHETIC DEPARTMENT ' + code
+        file_name = snapshot.get_file_name(code, ', '.join(course_numbers), index.values())
+        index[snapshot.get_page_key(code, ', '.join(course_numbers))] = file_name
+        with open(os.path.join(directory, snapshot.PAGES_DIRECTORY, file_name), 'w', encoding='utf-8') as file:
+            file.write(render_department_html(department))
+        contents.append((code, course_numbers))
+    snapshot.write_json(os.path.join(directory, snapshot.METADATA_FILE), {'term': term, 'department_options': department_options})
+    snapshot.write_json(os.path.join(directory, snapshot.INDEX_FILE), index)
+    return contents
+
+
+def render_meeting_time(days, start, end):
+    """
+    Renders a meeting time the way the UCI class search shows it, e.g. "TuTh   2:00- 3:20p" (see class_parser.parse_day_and_time).
+
+    :param days: A string that is the meeting days.
+    :param start: A string that is the start time (military time), or 'TBA'.
+    :param end: A string that is the end time (military time), or 'TBA'.
+    :return: A string that is the meeting time.
+    """
+
+    if start == 'TBA':
+        return 'TBA'
+    start_hour, start_minute = start.split(':')
+    end_hour, end_minute = end.split(':')
+    afternoon = 'p' if int(end_hour) >= 12 else ''
+    start_hour = (int(start_hour) - 1) % 12 + 1
+    end_hour = (int(end_hour) - 1) % 12 + 1
+    return '%s   %d:%s-%2d:%s%s' % (days, start_hour, start_minute, end_hour, end_minute, afternoon)
@@ -0,0 +1,168 @@
+import argparse                                                                                        # Command line options
+import html                                                                                            # Escape the options of the search form
+import http.server                                                                                     # Answer the search form over HTTP
+import os                                                                                              # Path of the synthetic snapshot
+import socketserver                                                                                    # One thread per request (Python 3.6 has no ThreadingHTTPServer)
+import sys                                                                                             # Exit code of the check
+import tempfile                                                                                        # Synthetic snapshot when none is given
+import threading                                                                                       # Serve while the check runs
+from urllib.parse import parse_qs                                                                      # Read the posted search form
+from classes_and_functions.class_base_exceptions import SnapshotNotFound                               # A page was not recorded
+from scrape.snapshot import ReplayBackend, CLASS_CODES_QUERY                                           # The recorded pages
+
+
+class StandInServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    """
+    A local HTTP server that stands in for WebSoc, it answers the search form with the pages of a snapshot (see snapshot.RecordingBackend), so
+    that the http backend can be run with --websoc-url without the UCI website.
+
+    Attributes:
+        replay (ReplayBackend): The recorded term, department options and results pages.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, snapshot_directory):
+        """
+        A constructor for a 'StandInServer' object, the server listens right away but only answers once serve_forever is called.
+
+        :param address: A (host, port) tuple, e.g. ('127.0.0.1', 8080), port 0 picks a free port.
+        :param snapshot_directory: A string that is the path of the snapshot directory.
+        :raises SnapshotNotFound: If the directory is not a snapshot.
+        """
+
+        self.replay = ReplayBackend(snapshot_directory)
+        super().__init__(address, StandInRequestHandler)
+
+    def get_search_form(self):
+        """
+        Renders the search page with the recorded term and department options, in the form that websoc_client.HttpBackend reads.
+
+        :return: A string that is the html of the search page.
+        """
+
+        departments = ''.join('<option value="' + html.escape(code) + '">' + html.escape(code + ' . . . . ' + name) + '</option>'
+                              for code, name in sorted(self.replay.get_department_options().items()))
+        return ('<html><body><form action="" method="post"><select name="YearTerm"><option value="STAND-IN" selected="selected">'
+                + html.escape(self.replay.get_term()) + '</option></select><select name="Dept"><option value=" ALL">Include All Departments'
+                '</option>' + departments + '</select></form></body></html>')
+
+    def get_results_page(self, form):
+        """
+        Finds the recorded results page of a posted search form.
+
+        :param form: A dictionary of the fields of the form (see HttpBackend.post_search_form).
+        :return: A string that is the html of the results page.
+        :raises SnapshotNotFound: If the page was not recorded.
+        """
+
+        if form.get('CourseCodes', '').strip() != '':
+            return self.replay.fetch_class_codes_html(form['CourseCodes'])
+        return self.replay.fetch_department_html(form.get('Dept', ''), form.get('CourseNum', ''))
+
+
+class StandInRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Answers the requests of a StandInServer (one object per request), GET is the search page and POST a search.
+    """
+
+    protocol_version = 'HTTP/1.1'                                                                      # Keep-alive, like WebSoc
+
+    def do_GET(self):
+        self.send_html(200, self.server.get_search_form())
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8')
+        form = {name: values[0] for name, values in parse_qs(body, keep_blank_values=True).items()}
+        try:
+            self.send_html(200, self.server.get_results_page(form))
+        except SnapshotNotFound as reason:
+            self.send_html(404, '<html><body>' + html.escape(str(reason)) + '</body></html>')
+
+    def send_html(self, status, page):
+        """
+        Sends an answer.
+
+        :param status: An integer that is the HTTP status code.
+        :param page: A string that is the html of the page.
+        :return: Nothing
+        """
+
+        body = page.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):                                                             # Quiet, a run sends a request per department
+        pass
+
+
+def check(server):
+    """
+    Runs the http backend against a running stand-in server and compares everything it scrapes with the snapshot.
+
+    :param server: A StandInServer object that is serving.
+    :return: A list of strings that describe the differences, empty if the backend scraped the snapshot exactly.
+    """
+
+    from scrape.websoc_client import HttpBackend                                                       # Late import, serving does not need the client
+    replay = server.replay
+    backend = HttpBackend('http://127.0.0.1:' + str(server.server_address[1]) + '/perl/WebSoc/')
+    failures = [] if len(replay.index) > 0 else ["the snapshot has no recorded pages"]
+    try:
+        if backend.get_term() != replay.get_term():
+            failures.append("term " + repr(backend.get_term()) + " is not " + repr(replay.get_term()))
+        if sorted(backend.get_department_options()) != sorted(replay.get_department_options()):
+            failures.append("the department options are not the recorded ones")
+        for key, file_name in sorted(replay.index.items()):
+            department, course_numbers = key.split('|', 1)
+            if department == CLASS_CODES_QUERY:
+                page = backend.fetch_class_codes_html(course_numbers)
+            else:
+                page = backend.fetch_department_html(department, course_numbers)
+            if page != replay.read_page(file_name):
+                failures.append("the page of " + key + " is not the recorded one")
+    finally:
+        backend.close()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a recorded snapshot (--record DIR) as a stand-in for WebSoc, for --backend http --websoc-url.")
+    parser.add_argument('snapshot', nargs='?', default=None, help="Snapshot directory (default: a synthetic snapshot).")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to listen on (default: 127.0.0.1).")
+    parser.add_argument('--port', type=int, default=8080, help="Port to listen on, 0 picks a free port (default: 8080).")
+    parser.add_argument('--check', action='store_true',
+                        help="Instead of serving until Ctrl+C, scrape every recorded page with the http backend and compare it with the snapshot.")
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_directory = arguments.snapshot
+        if snapshot_directory is None:
+            from benchmarks.synthetic_catalog import generate_catalog, write_snapshot                  # Late import, a recorded snapshot needs no catalog
+            snapshot_directory = os.path.join(directory, 'snapshot')
+            write_snapshot(snapshot_directory, generate_catalog(seed=0))
+        server = StandInServer((arguments.host, 0 if arguments.check else arguments.port), snapshot_directory)
+        url = 'http://' + arguments.host + ':' + str(server.server_address[1]) + '/perl/WebSoc/'
+        if arguments.check:
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            failures = check(server)
+            server.shutdown()
+            server.server_close()
+            print(str(len(server.replay.index)) + " recorded pages scraped from " + url)
+            for failure in failures:
+                print("FAILED: " + failure)
+            sys.exit(1 if len(failures) > 0 else 0)
+        print("Serving " + snapshot_directory + " on " + url + ", e.g. python main.py --backend http --websoc-url " + url)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:                                                                      # Ctrl+C stops the server
+            pass
+        finally:
+            server.server_close()
+
+
+if __name__ == '__main__':
+    main()
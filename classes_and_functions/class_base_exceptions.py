@@ -16,3 +16,8 @@ class InvalidCourse(ParseError):
 class WorkingScheduleNotFound(Exception):
     """Working schedule was unable to be made, due to number of classes or availability."""
     pass
+
+
+class SnapshotNotFound(Exception):
+    """A page that was asked for is not in the recorded snapshot."""
+    pass
@@ -0,0 +1,56 @@
+from array import array                                                                        # Typed arrays, one machine value per class
+
+
+class ClassTable:
+    """
+    The ClassTable class holds the meeting times of a list of classes as a struct of typed arrays, every class is a row (index) in every column.
+    It is a helper for finding time conflictions (see conflict_graph.get_conflict_graph and vectorized_evolution.get_conflict_matrix): it is
+    made from the classes a solver is given and dropped once their conflictions are known, the catalog itself stays a list of Class objects.
+
+    Attributes:
+        classes (list): The Class objects, in the order of the rows.
+        day_masks (array): The bitmasks of the meeting days (see department.DAY_BITS), 0 if the meeting time is TBA.
+        start_minutes (array): The start times in minutes after midnight (-1 if TBA).
+        end_minutes (array): The end times in minutes after midnight (-1 if TBA).
+    """
+
+    __slots__ = ('classes', 'day_masks', 'start_minutes', 'end_minutes')
+
+    def __init__(self, class_list):
+        """
+        A constructor for a 'ClassTable' object.
+
+        :param class_list: A list of Class objects, they become the rows of the table in the same order.
+        """
+
+        self.classes = list(class_list)
+        self.day_masks = array('B', [_class.day_mask for _class in self.classes])
+        self.start_minutes = array('h', [_class.start_minute for _class in self.classes])
+        self.end_minutes = array('h', [_class.end_minute for _class in self.classes])
+
+    def get_conflicting_pairs(self):
+        """
+        Finds every pair of rows with overlapping meeting times (see Class.conflicts_with). The rows are swept in order of their start times, so
+        a class is only compared with the classes that start before it ends, instead of with every other class.
+
+        :return: A list of (row, row) tuples, every conflicting pair once.
+        """
+
+        day_masks, start_minutes, end_minutes = self.day_masks, self.start_minutes, self.end_minutes
+        rows = sorted((row for row in range(len(self.classes)) if day_masks[row] != 0), key=start_minutes.__getitem__)   # TBA classes never conflict
+        pairs = []
+        for position, row in enumerate(rows):
+            day_mask, start_minute, end_minute = day_masks[row], start_minutes[row], end_minutes[row]
+            for other_position in range(position + 1, len(rows)):
+                other_row = rows[other_position]
+                if start_minutes[other_row] > end_minute:                                      # Every later row starts after this class ended
+                    break
+                if day_mask & day_masks[other_row] and start_minute <= end_minutes[other_row]:
+                    pairs.append((row, other_row))
+        return pairs
+
+    def __getitem__(self, row):
+        return self.classes[row]
+
+    def __len__(self):
+        return len(self.classes)
@@ -1,6 +1,10 @@
 import bisect           # A way to easily keep custom objects sorted
 import re               # Use of regular expressions
 
+DAYS_PATTERN = re.compile('[A-Z][^A-Z]*')                                                   # Splits "TuTh" into ['Tu', 'Th']
+DAY_BITS = {'M': 1, 'Tu': 2, 'W': 4, 'Th': 8, 'F': 16, 'Sa': 32, 'Su': 64}                  # One bit per day of the week
+FULL_STATUSES = ('FULL', 'WAITL')                                                           # Statuses (upper case) of classes without a free seat
+
 
 class Course:
     """
@@ -42,12 +46,13 @@ class Course:
 
     def get_lecture_classes(self):
         """
-        A get function to return a copy of the list containing lecture classes.
+        A get function to return the list containing lecture classes. This is the list of the course itself, not a copy, so callers must not
+        change it (classes are only added with add_class).
 
-        :return: A copy of the list of discussion classes.
+        :return: The list of lecture classes (do not change it).
         """
 
-        return self.lecture_classes.copy()
+        return self.lecture_classes
 
     def get_number_of_lecture_classes(self):
         """
@@ -60,12 +65,13 @@ class Course:
 
     def get_discussion_classes(self):
         """
-        A get function to return a copy of the list containing discussion classes.
+        A get function to return the list containing discussion classes. This is the list of the course itself, not a copy, so callers must not
+        change it (classes are only added with add_class).
 
-        :return: A copy of the list of discussion classes.
+        :return: The list of discussion classes (do not change it).
         """
 
-        return self.discussion_classes.copy()
+        return self.discussion_classes
 
     def get_number_of_discussion_classes(self):
         """
@@ -78,12 +84,13 @@ class Course:
 
     def get_lab_classes(self):
         """
-        A get function to return a copy of the list containing lab classes.
+        A get function to return the list containing lab classes. This is the list of the course itself, not a copy, so callers must not
+        change it (classes are only added with add_class).
 
-        :return: A copy of the list of discussion classes.
+        :return: The list of lab classes (do not change it).
         """
 
-        return self.lab_classes.copy()
+        return self.lab_classes
 
     def get_number_of_lab_classes(self):
         """
@@ -110,14 +117,7 @@ class Course:
         :return: A list of classes.
         """
 
-        combined_classes = []
-        for _class in self.lab_classes:
-            combined_classes.append(_class)
-        for _class in self.discussion_classes:
-            combined_classes.append(_class)
-        for _class in self.lecture_classes:
-            combined_classes.append(_class)
-        return combined_classes
+        return self.lab_classes + self.discussion_classes + self.lecture_classes
 
     def has_discussion(self):
         """
@@ -179,15 +179,15 @@ class Course:
         """
         A function to return the type of class with the least amount of choices (i.e. prioritized in scheduling precedence).
 
-        :return: A list of the classes with the least amount of choices, as well as it's type.
+        :return: A list of the classes with the least amount of choices (the list of the course itself, do not change it), as well as it's type.
         """
 
         if self.number_of_choices == self.number_of_choices_for_lab:
-            return self.lab_classes.copy(), 'Lab'
+            return self.lab_classes, 'Lab'
         elif self.number_of_choices == self.number_of_choices_for_discussion:
-            return self.discussion_classes.copy(), 'Dis'
+            return self.discussion_classes, 'Dis'
         else:
-            return self.lecture_classes.copy(), 'Lec'
+            return self.lecture_classes, 'Lec'
 
     def get_number_of_required_classes(self):
         """
@@ -229,8 +229,17 @@ class Class:
          class as nearly full.
         normal_time_start (string): A string representing the starting time in standard time.
         noormal_time_end (string): A string representing the ending time in standard time.
+        days_as_list (list): A list of strings of the meeting days, split up once when the class is made (e.g. ['Tu', 'Th']).
+        day_mask (integer): A bitmask of the meeting days (see DAY_BITS), 0 if the meeting days are TBA.
+        start_minute (integer): The start time as minutes after midnight, -1 if the meeting time is TBA.
+        end_minute (integer): The end time as minutes after midnight, -1 if the meeting time is TBA.
+        is_tba (boolean): True if the meeting time of the class has not been published yet.
     """
 
+    __slots__ = ('name_of_course', 'type_of_class', 'section', 'code', 'units', 'instructor', 'days', 'start', 'end',      # No per-instance dictionary, a whole
+                 'place', 'final', 'capacity', 'enrolled', 'wait_list', 'status', 'normal_time_start', 'normal_time_end',     # term of classes takes a lot less memory
+                 'percent_full', 'days_as_list', 'day_mask', 'start_minute', 'end_minute', 'is_tba')
+
     def __init__(self, name_of_course,
                  type_of_class, section, code,
                  units, instructor, days, start, end,
@@ -251,18 +260,44 @@ class Class:
         self.end = end
         self.place = place
         self.final = final
+        self.normal_time_start = None
+        self.normal_time_end = None
+        self.days_as_list, self.day_mask, self.start_minute, self.end_minute = encode_meeting_time(days, start, end)
+        self.is_tba = self.day_mask == 0
+        self.update_availability(capacity, enrolled, wait_list, status)
+
+    def update_availability(self, capacity, enrolled, wait_list, status):
+        """
+        Sets the columns of the class that change during enrollment (the meeting time never changes).
+
+        :param capacity: An integer that is the maximum number of enrolled students.
+        :param enrolled: An integer that is the current number of enrolled students.
+        :param wait_list: An integer that is the number of people on the wait list.
+        :param status: A string that is the status of the class, e.g. 'OPEN' or 'FULL'.
+        :return: Nothing
+        """
+
         self.capacity = capacity
         self.enrolled = enrolled
         self.wait_list = wait_list
         self.status = status
-        self.normal_time_start = None
-        self.normal_time_end = None
         try:
             self.percent_full = float(enrolled) / capacity
         except ZeroDivisionError:
             print("Class " + str(self.code) + " (" + self.name_of_course + ")" + " is unavailable.")
             self.percent_full = 1
 
+    def is_full(self):
+        """
+        Checks if a seat in the class can not be taken right now, i.e. the status is 'FULL' or 'Waitl' or every seat is taken.
+
+        :return: True if the class is full.
+        """
+
+        if isinstance(self.status, str) and self.status.upper() in FULL_STATUSES:
+            return True
+        return isinstance(self.enrolled, int) and isinstance(self.capacity, int) and self.enrolled >= self.capacity
+
     def get_name_of_course(self):
         """
         A function that returns the name of the course.
@@ -309,33 +344,8 @@ class Class:
         if self.start == 'TBA':
             self.normal_time_start = self.normal_time_end = 'TBA'
         else:
-            normal_time = None
-            pm = False
-            temp_time = self.start.split(':')
-            temp_time[0] = int(temp_time[0])
-            if temp_time[0] > 12:
-                pm = True
-                temp_time[0] -= 12
-            normal_time = str(temp_time[0]) + ':' + temp_time[1]
-            if pm or temp_time[0] == 12:
-                normal_time += ' PM'
-            else:
-                normal_time += ' AM'
-            self.normal_time_start = normal_time
-
-            normal_time = None
-            pm = False
-            temp_time = self.end.split(':')
-            temp_time[0] = int(temp_time[0])
-            if temp_time[0] > 12:
-                pm = True
-                temp_time[0] -= 12
-            normal_time = str(temp_time[0]) + ':' + temp_time[1]
-            if pm or temp_time[0] == 12:
-                normal_time += ' PM'
-            else:
-                normal_time += ' AM'
-            self.normal_time_end = normal_time
+            self.normal_time_start = to_normal_time(self.start)
+            self.normal_time_end = to_normal_time(self.end)
 
     def get_days_as_list(self):
         """
@@ -344,7 +354,17 @@ class Class:
         :return: A list of days that are split up by uppercase letters.
         """
 
-        return re.findall('[A-Z][^A-Z]*', self.days)
+        return self.days_as_list.copy()
+
+    def conflicts_with(self, other):
+        """
+        Checks if the meeting time of this class overlaps the meeting time of another class, classes with TBA meeting times never conflict.
+
+        :param other: Another Class object.
+        :return: True if the classes meet on a common day at overlapping times, else False.
+        """
+
+        return (self.day_mask & other.day_mask) != 0 and self.start_minute <= other.end_minute and other.start_minute <= self.end_minute
 
     def __lt__(self, other):
         """
@@ -375,3 +395,57 @@ class Class:
                 "Wait list: " + self.wait_list + "\n"\
                 "Status: " + self.status + "\n"\
                 "Percent full: " + str(self.percent_full) + "\n"
+
+
+def encode_meeting_time(days, start, end):
+    """
+    Encodes the meeting time of a class into integers so that time conflictions can be checked without any string work.
+    e.g. days = "TuTh", start = "09:30", end = "10:50" is encoded as (['Tu', 'Th'], 10, 570, 650).
+
+    :param days: A string of the meeting days (e.g. "MWF" or "TBA").
+    :param start: A string of the start time in military time (HH:MM) or "TBA".
+    :param end: A string of the end time in military time (HH:MM) or "TBA".
+    :return: The days as a list, a bitmask of the days, and the start and end times in minutes after midnight.
+    """
+
+    days_as_list = DAYS_PATTERN.findall(days) if days is not None else []
+    if start == 'TBA' or end == 'TBA' or start is None or end is None:                     # Nothing can be concluded from TBA times, they never conflict
+        return days_as_list, 0, -1, -1
+    day_mask = 0
+    for day in days_as_list:
+        day_mask |= DAY_BITS.get(day, 0)
+    return days_as_list, day_mask, to_minutes(start), to_minutes(end)
+
+
+def to_minutes(military_time):
+    """
+    Converts a military time string into the number of minutes after midnight.
+
+    :param military_time: A string in the format HH:MM.
+    :return: An integer that is the number of minutes after midnight.
+    """
+
+    hours, minutes = military_time.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def to_normal_time(military_time):
+    """
+    Converts a military time string into standard time, e.g. "13:30" is "1:30 PM".
+
+    :param military_time: A string in the format HH:MM.
+    :return: A string in the format H:MM AM/PM.
+    """
+
+    hours, minutes = military_time.split(':')
+    hours = int(hours)
+    pm = False
+    if hours > 12:
+        pm = True
+        hours -= 12
+    normal_time = str(hours) + ':' + minutes
+    if pm or hours == 12:
+        normal_time += ' PM'
+    else:
+        normal_time += ' AM'
+    return normal_time
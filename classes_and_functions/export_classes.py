@@ -1,6 +1,3 @@
-from openpyxl import load_workbook  # Output schedules to an Excel sheet
-
-
 def change_time_to_normal(class_list):
     """
     A function to change all the time to standard time as opposed to military time.
@@ -12,15 +9,16 @@ def change_time_to_normal(class_list):
         _class.update_time_to_normal_format()
 
 
-def export_text(term, working_schedule):
+def export_text(term, working_schedule, path='class_schedule.txt'):
     """
     This function will export classes to a text file so that users can read it.
 
     :param term: The term of which the classes were scraped from.
     :param working_schedule: Working schedules that have non-conflicting classes.
-    :return: Nothing
+    :param path: A string that is the path of the text file, e.g. one file per student in batch mode.
+    :return: The number of schedules that were written.
     """
-    file = open('class_schedule.txt', 'w')
+    file = open(path, 'w')
     counter = 1
     file.write(term + '\n')
     for schedule in working_schedule:
@@ -38,6 +36,29 @@ def export_text(term, working_schedule):
         counter += 1
         file.write('\n')
     file.close()
+    return counter - 1
+
+
+def export_json(term, working_schedule):
+    """
+    This function turns schedules into values that can be written as JSON (e.g. the answer of the schedule service).
+
+    :param term: The term of which the classes were scraped from.
+    :param working_schedule: Working schedules that have non-conflicting classes.
+    :return: A dictionary with the term and a list of schedules, every schedule is a list of dictionaries (one per class).
+    """
+
+    schedules = []
+    for schedule in working_schedule:
+        classes = []
+        for _class in schedule.get_class_list():
+            classes.append({'code': _class.code, 'course': _class.name_of_course.strip(), 'type': _class.type_of_class,
+                            'section': _class.section, 'units': _class.units, 'instructor': _class.instructor, 'days': _class.days,
+                            'start': _class.start, 'end': _class.end, 'place': _class.place, 'final': _class.final,
+                            'capacity': _class.capacity, 'enrolled': _class.enrolled, 'wait_list': _class.wait_list,
+                            'status': _class.status})
+        schedules.append(classes)
+    return {'term': term, 'schedules': schedules}
 
 
 def export_excel(term, working_schedule):
@@ -48,6 +69,7 @@ def export_excel(term, working_schedule):
     :return: Nothing
     """
 
+    from openpyxl import load_workbook  # Late import, only Excel output needs openpyxl
     workbook_for_classes = load_workbook('../Schedule_Template.xlsx')
     # workbook_for_finals = load_workbook('Schedule_Template.xlsx')
     class_list_sheet_for_classes = workbook_for_classes['Class List']
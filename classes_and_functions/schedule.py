@@ -30,15 +30,23 @@ class Schedule:
 
         return self.class_list.copy()
 
+    def get_signature(self):
+        """
+        A function to get the signature of the schedule, two schedules with the same classes (in any order) have the same signature.
+
+        :return: A tuple of the sorted class codes in the schedule.
+        """
+
+        return tuple(sorted(_class.code for _class in self.class_list))
+
     def reset_marks(self):
         """
-        Resets the marked_list, a boolean list, to be all False.
+        Resets the marked_list, a boolean list, to be all False (one mark per class).
 
         :return: Nothing
         """
 
-        for mark in self.marked_list:
-            mark = False
+        self.marked_list = [False] * len(self.class_list)
 
     def get_marked_list(self):
         """
@@ -73,12 +81,12 @@ class Schedule:
         """
         A function to get the indices of classes that are marked.
 
-        :return: A list of integers that correspond to class-list indices of marked classes.
+        :return: A list of integers that correspond to class-list indices of marked classes (empty if nothing is marked).
         """
 
-        if len(self.marked_list) > 0:
+        index_list = []
+        if self.marked_list is not None:
             index = 0
-            index_list = []
             for mark in self.marked_list:
                 if mark is True:
                     index_list.append(index)
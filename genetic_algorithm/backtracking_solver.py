@@ -0,0 +1,99 @@
+from classes_and_functions.class_base_exceptions import WorkingScheduleNotFound         # Exception for finding working schedules
+from classes_and_functions import schedule as sch                                       # Schedule functions
+from genetic_algorithm.conflict_graph import get_slots, get_conflict_graph              # Slots and time conflictions of the classes
+
+
+def get_schedules_using_backtracking(courses_per_department, max_schedules=None):
+    """
+    This function is an exact alternative to the genetic algorithm, it searches every combination of classes with backtracking and forward checking,
+    so it finds every working schedule (or proves that there are none).
+
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :param max_schedules: An integer to stop after that many working schedules are found, default is to find all of them.
+    :return: A list of Schedule objects that are working schedules.
+    :raises WorkingScheduleNotFound: If no combination of classes is free of time conflictions.
+    """
+
+    course_list = [course for department in courses_per_department for course in department]
+    slots = get_slots(course_list)
+    conflict_graph = get_conflict_graph([_class for course, type_of_class, classes in slots for _class in classes])
+    working_schedules = []
+    for assignment in enumerate_assignments(slots, conflict_graph):
+        working_schedules.append(sch.Schedule(list(assignment)))
+        if max_schedules is not None and len(working_schedules) >= max_schedules:
+            break
+    if len(working_schedules) == 0:
+        raise WorkingScheduleNotFound
+    return working_schedules
+
+
+def enumerate_assignments(slots, conflict_graph):
+    """
+    A generator of every combination of classes (one per slot) without time conflictions. The slot with the fewest classes left is always
+    filled first, and after every choice the classes that conflict with it are removed from the other slots (forward checking).
+
+    :param slots: A list of (Course object, type of class, list of Class objects) tuples, see conflict_graph.get_slots.
+    :param conflict_graph: A dictionary of Class objects and the sets of Class objects they conflict with, see conflict_graph.get_conflict_graph.
+    :return: Yields tuples of Class objects in the same order as the slots.
+    """
+
+    if len(slots) == 0:
+        return
+    static_order = get_static_order(slots)
+    assignment = [None] * len(slots)
+    domains = [classes for course, type_of_class, classes in slots]
+    yield from _backtrack(assignment, domains, set(range(len(slots))), static_order, conflict_graph)
+
+
+def get_static_order(slots):
+    """
+    Ranks the slots so that ties between slots with the same number of classes left are broken in favour of courses with the fewest choices,
+    and within a course, the type of class with the least choices (see Course.get_type_with_least_choices).
+
+    :param slots: A list of (Course object, type of class, list of Class objects) tuples.
+    :return: A list of integers, the rank of each slot (lower ranks are filled first).
+    """
+
+    keys = []
+    for index, (course, type_of_class, classes) in enumerate(slots):
+        least_choices_type = course.get_type_with_least_choices()[1]
+        keys.append((course.number_of_choices, type_of_class != least_choices_type, len(classes), index))
+    order = sorted(range(len(slots)), key=lambda index: keys[index])
+    static_order = [0] * len(slots)
+    for rank, index in enumerate(order):
+        static_order[index] = rank
+    return static_order
+
+
+def _backtrack(assignment, domains, unassigned, static_order, conflict_graph):
+    """
+    The recursive step of 'enumerate_assignments'.
+
+    :param assignment: A list of the chosen Class objects (None for slots that are not filled yet).
+    :param domains: A list of lists of the Class objects that can still fill each slot.
+    :param unassigned: A set of the indices of slots that are not filled yet.
+    :param static_order: A list of integers to break ties between slots (see get_static_order).
+    :param conflict_graph: A dictionary of Class objects and the sets of Class objects they conflict with.
+    :return: Yields tuples of Class objects in the same order as the slots.
+    """
+
+    if len(unassigned) == 0:
+        yield tuple(assignment)
+        return
+    slot = min(unassigned, key=lambda index: (len(domains[index]), static_order[index]))            # Fewest choices left first
+    unassigned.remove(slot)
+    for chosen_class in domains[slot]:
+        conflicts = conflict_graph[chosen_class]
+        pruned_domains = domains.copy()
+        wiped_out = False
+        for other_slot in unassigned:                                                                # Forward checking, remove the classes that conflict with the choice
+            pruned_domains[other_slot] = [_class for _class in domains[other_slot] if _class not in conflicts]
+            if len(pruned_domains[other_slot]) == 0:
+                wiped_out = True
+                break
+        if wiped_out:
+            continue
+        assignment[slot] = chosen_class
+        yield from _backtrack(assignment, pruned_domains, unassigned, static_order, conflict_graph)
+    assignment[slot] = None
+    unassigned.add(slot)
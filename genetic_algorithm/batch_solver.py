@@ -0,0 +1,115 @@
+import concurrent.futures                                                               # Solve the argument files in worker processes
+import os                                                                               # Output files of the argument files
+from collections import OrderedDict                                                     # Keeps the requests in the order of the batch
+from classes_and_functions.class_base_exceptions import WorkingScheduleNotFound         # Exception for finding working schedules
+from classes_and_functions.export_classes import export_text                            # Exporting functionality
+from genetic_algorithm.class_schedule_solver import get_schedules                       # Genetic Algorithm and other solvers
+from genetic_algorithm.result_cache import EXACT_SOLVERS, ResultCache, get_codes, get_fingerprint, get_key, rebuild_schedules  # Cached requests
+
+DEFAULT_OUTPUT_DIRECTORY = 'batch_schedules'                                            # Directory of the schedules of every argument file
+
+
+def solve_batch(term, batch, output_directory=DEFAULT_OUTPUT_DIRECTORY, batch_workers=None, solver='ga', reduce_symmetry=True, max_schedules=None,
+                result_cache=None, **options):
+    """
+    Finds working schedules for every argument file of a batch (see class_scraper.get_batch_classes) and exports them to one text file per
+    argument file, e.g. "batch_schedules/student_1_class_schedule.txt". The argument files are solved at the same time in worker processes,
+    and argument files that ask for the same courses are only solved once (see ResultCache).
+
+    :param term: A string that is the term of the scraped classes.
+    :param batch: A list of (path, departments, error) tuples, see class_scraper.get_batch_classes.
+    :param output_directory: A string that is the directory to write the text files to, it is made if it does not exist.
+    :param batch_workers: An integer that is the number of worker processes, 1 solves everything in this process, default is the number of
+     cores (not 'workers', that is an option of the decomposed solver).
+    :param solver: A string that is the name of the solver to use, see class_schedule_solver.SOLVERS.
+    :param reduce_symmetry: A boolean, False to let the solver search over every class.
+    :param max_schedules: An integer to find at most that many working schedules per argument file, default is to find all of them.
+    :param result_cache: A ResultCache object with the schedules of earlier requests, default is a new ResultCache().
+    :param options: Keyword arguments that are passed on to the selected solver (they have to be picklable).
+    :return: A list with a (path, output path, number of schedules, error) tuple per argument file, in the order of the batch. The output
+     path is None and the error is a string if the argument file could not be solved.
+    """
+
+    os.makedirs(output_directory, exist_ok=True)
+    result_cache = ResultCache() if result_cache is None else result_cache
+    outcomes = [None] * len(batch)
+    jobs = []
+    unsolved = OrderedDict()                                                            # The departments of every key that is not cached
+    used_output_paths = set()
+    for index, (path, departments, error) in enumerate(batch):
+        if error is not None:
+            outcomes[index] = (path, None, 0, error)
+        else:
+            output_path = get_output_path(path, output_directory, used_output_paths)
+            used_output_paths.add(output_path)
+            key = get_key(term, departments, solver, reduce_symmetry, options)
+            jobs.append((index, key, departments, output_path))
+            if key not in unsolved and result_cache.get(key, get_fingerprint(departments), max_schedules) is None:
+                unsolved[key] = departments
+
+    if batch_workers == 1 or len(unsolved) <= 1:
+        results = [solve_request(departments, solver, reduce_symmetry, max_schedules, options) for departments in unsolved.values()]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=batch_workers) as executor:
+            futures = [executor.submit(solve_request, departments, solver, reduce_symmetry, max_schedules, options)
+                       for departments in unsolved.values()]
+            results = [future.result() for future in futures]
+    solved = dict(zip(unsolved.keys(), results))                                        # Not every result is cached (errors, a full cache)
+    for (key, departments), (codes_of_schedules, error) in zip(unsolved.items(), results):
+        if error is None or solver in EXACT_SOLVERS:                                    # Another run of a random search may still succeed
+            complete = max_schedules is None or len(codes_of_schedules) < max_schedules
+            result_cache.put(key, get_fingerprint(departments), codes_of_schedules, complete, error)
+
+    for index, key, departments, output_path in jobs:                                   # Every request is solved or cached now
+        try:
+            if key in solved:
+                codes_of_schedules, error = solved[key]
+                if error is not None:
+                    raise WorkingScheduleNotFound(error)
+                working_schedules = rebuild_schedules(departments, codes_of_schedules)
+            else:
+                working_schedules = result_cache.get_schedules(term, departments, max_schedules, solver, reduce_symmetry, **options)
+            outcomes[index] = (batch[index][0], output_path, export_text(term, working_schedules, output_path), None)
+        except WorkingScheduleNotFound as reason:
+            outcomes[index] = (batch[index][0], None, 0, "Unable to create schedule. " + str(reason))
+    return outcomes
+
+
+def solve_request(courses_per_department, solver, reduce_symmetry, max_schedules, options):
+    """
+    The work of one request (run in a worker process), finds its working schedules. Only the class codes are sent back, they are much
+    smaller than the Class objects.
+
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :param solver: A string that is the name of the solver to use.
+    :param reduce_symmetry: A boolean, False to let the solver search over every class.
+    :param max_schedules: An integer to find at most that many working schedules, None to find all of them.
+    :param options: A dictionary of keyword arguments that are passed on to the solver.
+    :return: A list of working schedules (each one a tuple of class codes) and None, or an empty list and a string that tells why no schedule
+     was found.
+    """
+
+    try:
+        working_schedules = get_schedules(courses_per_department, solver, reduce_symmetry, max_schedules=max_schedules, **options)
+        return [get_codes(schedule) for schedule in working_schedules], None
+    except WorkingScheduleNotFound as reason:
+        return [], str(reason)
+
+
+def get_output_path(path, output_directory, used_output_paths):
+    """
+    Names the text file of an argument file after it, e.g. "requests/student_1.txt" is "batch_schedules/student_1_class_schedule.txt".
+
+    :param path: A string that is the path of the argument file.
+    :param output_directory: A string that is the directory of the text files.
+    :param used_output_paths: A set of the paths that are already used (argument files of different directories can have the same name).
+    :return: A string that is the path of the text file.
+    """
+
+    stem = os.path.join(output_directory, os.path.splitext(os.path.basename(path))[0] + '_class_schedule')
+    output_path = stem + '.txt'
+    number = 1
+    while output_path in used_output_paths:
+        number += 1
+        output_path = stem + '-' + str(number) + '.txt'
+    return output_path
@@ -1,40 +1,235 @@
-from genetic_algorithm.evolution import Evolution                                       # A Class to manage Evolution of Schedules
+from genetic_algorithm.instrumentation import get_generation_record                     # Information of every generation for observers
+from genetic_algorithm.conflict_graph import presolve                                   # Proves impossible requests before any solver runs
+from genetic_algorithm.restart_policy import RestartPolicy                              # When to restart or give up on a stagnated population
+from genetic_algorithm.symmetry import reduce_courses, expand_schedules                 # Solve over classes with distinct meeting times only
 from classes_and_functions.class_base_exceptions import WorkingScheduleNotFound         # Exception for finding working schedules
+import itertools                                                                        # To cut off the expanded schedules
 import random                                                                           # To randomly test population
+import time                                                                             # Time budget of the genetic algorithm
 
+SOLVERS = ('ga', 'vectorized', 'backtracking', 'islands', 'decomposed')                               # Names of the solvers that can be selected
 
-def get_schedules_using_ga(courses_per_department):
+
+def get_schedules(courses_per_department, solver='ga', reduce_symmetry=True, **options):
+    """
+    This function finds working schedules with the selected solver. Classes of a course that meet at the same time are interchangeable, so by
+    default the solver only sees one of them and the schedules it finds are expanded back to every real class afterwards.
+
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :param solver: A string that is the name of the solver to use, one of SOLVERS.
+    :param reduce_symmetry: A boolean, False to let the solver search over every class.
+    :param options: Keyword arguments that are passed on to the selected solver, and 'max_schedules' to keep at most that many working
+     schedules (every solver takes it, the solvers that can stop early are told about it).
+    :return: An iterable of Schedule objects that are working schedules (made as it is read if reduce_symmetry is True or max_schedules is
+     given).
+    :raises WorkingScheduleNotFound: If the solver was unable to find a working schedule.
+    """
+
+    presolve(courses_per_department)                                                    # Fail fast, before a solver spends its whole budget
+    max_schedules = options.pop('max_schedules', None)
+    if not reduce_symmetry:
+        working_schedules = run_solver(courses_per_department, solver, max_schedules, **options)
+    else:
+        reduced_departments, members = reduce_courses(courses_per_department)
+        working_schedules = expand_schedules(run_solver(reduced_departments, solver, max_schedules, **options), members)
+    if max_schedules is not None:
+        return itertools.islice(working_schedules, max_schedules)
+    return working_schedules
+
+
+def run_solver(courses_per_department, solver, max_schedules=None, **options):
+    """
+    Runs the selected solver.
+
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :param solver: A string that is the name of the solver to use, one of SOLVERS.
+    :param max_schedules: An integer that is passed on to the solvers that can stop after that many working schedules (the ga solver then
+     streams its schedules, see iterate_schedules_using_ga), the other solvers ignore it (get_schedules cuts their schedules off).
+    :param options: Keyword arguments that are passed on to the solver.
+    :return: A list (an iterable for the decomposed solver and the streaming ga solver) of Schedule objects that are working schedules.
+    :raises WorkingScheduleNotFound: If the solver was unable to find a working schedule.
+    """
+
+    if solver == 'backtracking':
+        from genetic_algorithm.backtracking_solver import get_schedules_using_backtracking   # Late imports, a run only loads the solver that it uses
+        return get_schedules_using_backtracking(courses_per_department, max_schedules, **options)
+    elif solver == 'vectorized':
+        return get_schedules_using_vectorized_ga(courses_per_department, **options)
+    elif solver == 'islands':
+        from genetic_algorithm.island_model import get_schedules_using_islands
+        return get_schedules_using_islands(courses_per_department, max_schedules=max_schedules, **options)
+    elif solver == 'decomposed':
+        from genetic_algorithm.decomposed_solver import get_schedules_using_decomposition
+        return get_schedules_using_decomposition(courses_per_department, max_schedules, **options)
+    elif max_schedules is not None:                                                     # Stream the schedules, the evolution stops once it found enough
+        working_schedules = iterate_schedules_using_ga(courses_per_department, max_schedules, **options)
+        first_schedule = next(working_schedules)                                        # Raises WorkingScheduleNotFound now, not while exporting
+        return itertools.chain([first_schedule], working_schedules)
+    else:
+        return get_schedules_using_ga(courses_per_department, **options)
+
+
+def get_schedules_using_ga(courses_per_department, seed=None, observers=None):
     """
     This function uses the genetic algorithm to over time create optimized schedules (non-conflicting schedules).
 
-    :return: A list containing Class objects that together make a working_schedule.
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :param seed: An integer to seed the random number generator with, so that runs can be reproduced.
+    :param observers: A list of functions that are called with the record of every generation (see instrumentation).
+    :return: A list of Schedule objects that are working schedules, found in the first generation that had any (no duplicates).
+    """
+
+    restart_policy = RestartPolicy()
+    for generation_number, working_schedules in evolve(courses_per_department, restart_policy=restart_policy, seed=seed, observers=observers):
+        if len(working_schedules) > 0:
+            return remove_duplicates(working_schedules)
+    raise WorkingScheduleNotFound(restart_policy.stop_reason)                           # Possibly schedule not found because it is impossible
+
+
+def iterate_schedules_using_ga(courses_per_department, number_of_schedules=None, time_limit=None, max_generations=None, seed=None,
+                               observers=None):
+    """
+    A generator version of 'get_schedules_using_ga', working schedules are yielded as soon as they are found (every schedule only once) instead
+    of after the generation that found them.
+
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :param number_of_schedules: An integer to stop after that many working schedules, default is to run out the budget.
+    :param time_limit: A number of seconds to stop after, default is no time limit.
+    :param max_generations: An integer that is the number of generations to stop after, default is to stop when the restart policy gives up.
+    :param seed: An integer to seed the random number generator with, so that runs can be reproduced.
+    :param observers: A list of functions that are called with the record of every generation (see instrumentation).
+    :return: Yields Schedule objects that are working schedules.
+    :raises WorkingScheduleNotFound: If the budget ran out without finding a single working schedule.
+    """
+
+    found_signatures = set()
+    restart_policy = RestartPolicy()
+    for generation_number, working_schedules in evolve(courses_per_department, max_generations=max_generations, restart_policy=restart_policy,
+                                                       time_limit=time_limit, seed=seed, observers=observers):
+        for schedule in working_schedules:
+            signature = schedule.get_signature()
+            if signature not in found_signatures:
+                found_signatures.add(signature)
+                yield schedule
+                if number_of_schedules is not None and len(found_signatures) >= number_of_schedules:
+                    return
+    if len(found_signatures) == 0:
+        raise WorkingScheduleNotFound(restart_policy.stop_reason or "No working schedule was found before the search ran out of time or generations.")
+
+
+def evolve(courses_per_department, population_size=100, max_generations=None, restart_policy=None, time_limit=None, seed=None,
+           observers=None):
+    """
+    The loop of the genetic algorithm, as a generator that hands back the working schedules of every generation. The population is made again
+    at random when its best fitness stagnates, and the loop stops when the restart policy gives up.
+
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :param population_size: An integer that is the number of individuals per generation.
+    :param max_generations: An integer that is the number of generations to stop after, default is no limit.
+    :param restart_policy: A RestartPolicy object, default is a new RestartPolicy().
+    :param time_limit: A number of seconds to stop after, default is no time limit.
+    :param seed: An integer to seed the random number generator with, so that runs can be reproduced.
+    :param observers: A list of functions that are called with the record of every generation (see instrumentation).
+    :return: Yields the generation number and a list of the Schedule objects in that generation that are working schedules.
     """
 
-    population_size = 100                                                               # Hard-coded starting population
-    darwin = Evolution(courses_per_department, population_size)                         # Create an evolution object, with a specified population_size
-    found_working_schedule = False
+    from genetic_algorithm.evolution import Evolution                                   # Late imports, NumPy is only loaded by the genetic algorithm solvers
+    import numpy as np
+    if restart_policy is None:
+        restart_policy = RestartPolicy()
+    darwin = Evolution(courses_per_department, population_size,                         # Create an evolution object, with a specified population_size
+                       random_generator=np.random.default_rng(seed))
+    for observer in observers or []:
+        darwin.add_observer(observer)
+    instrumented = len(darwin.observers) > 0                                            # Only time the steps if somebody is listening
+    timings = {'fitness': 0.0, 'selection': 0.0, 'crossover': 0.0}
     current_population = darwin.get_starting_population()
     generation_number = 0
-    working_schedules = []
+    start_time = time.perf_counter()
 
-    while not found_working_schedule:
+    while max_generations is None or generation_number < max_generations:
+        step_start = time.perf_counter() if instrumented else 0.0
+        working_schedules = []
         for schedule in current_population:
             if satisfied_requirements(schedule):
-                found_working_schedule = True
                 working_schedules.append(schedule)
             darwin.rank_fitness(schedule)                                               # Rank individuals in the population
-
-        # avg = print_generation_information(current_population, generation_number)     # This is a debugging feature
+        if instrumented:
+            timings['fitness'] = time.perf_counter() - step_start
+            darwin.notify(get_generation_record(generation_number, current_population, len(working_schedules), darwin.fitness_cache, timings))
+        yield generation_number, working_schedules
+
+        decision = restart_policy.update(max(schedule.fitness_score for schedule in current_population))
+        if decision == RestartPolicy.STOP:                                              # Stagnated after every restart, possibly impossible
+            return
+        step_start = time.perf_counter() if instrumented else 0.0
         selected_parents = darwin.select_parents(current_population)                    # Select most fit parents (best schedules)
+        if instrumented:
+            timings['selection'] = time.perf_counter() - step_start
+            step_start = time.perf_counter()
         next_population = darwin.get_next_generation(selected_parents)                  # "Cross-mutate" the "genes (classes)" for a better population of schedules
+        if instrumented:
+            timings['crossover'] = time.perf_counter() - step_start                     # Reported with the generation that the crossover made
         current_population = next_population
         generation_number += 1
 
-        if generation_number == 100:                                                    # If it hasn't found a working schedule in 100 generations, the population was bottle-necked
+        if decision == RestartPolicy.RESTART:                                           # The population was bottle-necked, start again
             current_population = darwin.get_starting_population()
-        if generation_number == 200:                                                    # Possibly schedule not found because it is impossible
-            raise WorkingScheduleNotFound
-    return working_schedules
+        if time_limit is not None and time.perf_counter() - start_time > time_limit:
+            return
+
+
+def remove_duplicates(schedules):
+    """
+    A function to remove schedules that have the same classes as an earlier schedule in the list.
+
+    :param schedules: A list of Schedule objects.
+    :return: A list of Schedule objects without duplicates, in the same order.
+    """
+
+    found_signatures = set()
+    unique_schedules = []
+    for schedule in schedules:
+        signature = schedule.get_signature()
+        if signature not in found_signatures:
+            found_signatures.add(signature)
+            unique_schedules.append(schedule)
+    return unique_schedules
+
+
+def get_schedules_using_vectorized_ga(courses_per_department, population_size=20000, seed=None, restart_policy=None):
+    """
+    This function runs the same genetic algorithm as 'get_schedules_using_ga', but on the VectorizedEvolution engine so that every
+    generation is scored, selected and crossed over as NumPy operations. This allows population sizes in the tens of thousands.
+
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :param population_size: An integer that is the number of individuals per generation.
+    :param seed: An integer to seed the random number generator with, so that runs can be reproduced.
+    :param restart_policy: A RestartPolicy object, default is a new RestartPolicy().
+    :return: A list of Schedule objects that are working schedules (no duplicates).
+    """
+
+    from genetic_algorithm.vectorized_evolution import VectorizedEvolution              # Late imports, NumPy is only loaded by the genetic algorithm solvers
+    import numpy as np
+    if restart_policy is None:
+        restart_policy = RestartPolicy()
+    darwin = VectorizedEvolution(courses_per_department, population_size, random_generator=np.random.default_rng(seed))
+    current_population = darwin.get_starting_population()
+
+    while True:
+        fitness_scores, satisfied = darwin.rank_fitness(current_population)                    # Rank and check every individual at once
+        if satisfied.any():
+            working_individuals = np.unique(current_population[satisfied], axis=0)
+            return [darwin.get_schedule(individual) for individual in working_individuals]
+
+        decision = restart_policy.update(float(fitness_scores.max()))
+        if decision == RestartPolicy.STOP:                                              # Possibly schedule not found because it is impossible
+            raise WorkingScheduleNotFound(restart_policy.stop_reason)
+        if decision == RestartPolicy.RESTART:                                           # The population was bottle-necked, start again
+            current_population = darwin.get_starting_population()
+        else:
+            selected_parents = darwin.select_parents(current_population, fitness_scores)
+            current_population = darwin.get_next_generation(selected_parents)
 
 
 def print_one_individual(current_population):
@@ -142,20 +337,7 @@ def is_between(class_a, class_b):
     :return: True if the meeting times overlap, False if the classes do not overlap.
     """
 
-    time_start_a, time_end_a = class_a.get_time()
-    time_start_b, time_end_b = class_b.get_time()
-    days_a = class_a.get_days_as_list()
-    days_b = class_b.get_days_as_list()
-
-    if time_start_a == 'TBA' or time_end_b == 'TBA':                                                             # If classes overlap, nothing can be concluded
-        return False
-
-    if ((time_end_a < time_start_b) and (time_start_a < time_start_b)) or not days_overlap(days_a, days_b):      # If the time does not overlap, classes are not in-between each other
-        return False                                                                                             # If the time does, check if the days do, if they do not, then
-    elif (time_end_b < time_start_a) and (time_start_b < time_start_a):                                          # the classes are not in-between each other
-        return False
-    else:
-        return True
+    return class_a.conflicts_with(class_b)                                                                      # Meeting times are encoded as integers when the Class is made
 
 
 def days_overlap(day_a, day_b):
@@ -170,4 +352,3 @@ def days_overlap(day_a, day_b):
         if day in day_b:
             return True
     return False
-
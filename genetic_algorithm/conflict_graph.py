@@ -0,0 +1,123 @@
+from classes_and_functions.class_base_exceptions import WorkingScheduleNotFound     # No working schedule can exist
+from classes_and_functions.class_table import ClassTable                            # Meeting times of the classes as typed arrays
+
+
+def get_slots(course_list):
+    """
+    This function lays out the 'genes' of a schedule, one slot for every (course, type of class) that has to be enrolled in.
+    The slots are in the same order that the genetic algorithm builds individuals in (lecture, discussion then lab for every course).
+
+    :param course_list: A list of Course objects.
+    :return: A list of tuples in the form (Course object, type of class, list of Class objects that can fill the slot).
+    """
+
+    slots = []
+    for course in course_list:
+        for type_of_class, classes in (('Lec', course.get_lecture_classes()),
+                                       ('Dis', course.get_discussion_classes()),
+                                       ('Lab', course.get_lab_classes())):
+            if len(classes) > 0:
+                slots.append((course, type_of_class, classes))
+    return slots
+
+
+def get_conflict_graph(class_list):
+    """
+    This function precomputes which classes have overlapping meeting times, so that solvers never have to compare meeting times again.
+    The meeting times are read out of a ClassTable of the classes (see ClassTable.get_conflicting_pairs).
+
+    :param class_list: A list of Class objects.
+    :return: A dictionary of Class objects (keys) and sets of the Class objects that they conflict with (values).
+    """
+
+    table = ClassTable(class_list)
+    conflict_graph = {_class: set() for _class in table.classes}
+    for row, other_row in table.get_conflicting_pairs():
+        conflict_graph[table[row]].add(table[other_row])
+        conflict_graph[table[other_row]].add(table[row])
+    return conflict_graph
+
+
+def make_arc_consistent(slots, conflict_graph):
+    """
+    Removes every class that does not fit with any class of some other slot (arc consistency, AC-3). If a slot loses all of its classes, no
+    working schedule can exist, and that is known before any solver runs.
+
+    :param slots: A list of (Course object, type of class, list of Class objects) tuples, see get_slots.
+    :param conflict_graph: A dictionary of Class objects and the sets of Class objects they conflict with, see get_conflict_graph.
+    :return: A list of lists of the Class objects that are left for every slot.
+    :raises WorkingScheduleNotFound: If a slot has no classes left, with a message that says which courses can not be taken together.
+    """
+
+    domains = [list(classes) for course, type_of_class, classes in slots]
+    pending = [(i, j) for i in range(len(slots)) for j in range(len(slots)) if i != j]
+    queued = set(pending)
+    while len(pending) > 0:
+        i, j = pending.pop()
+        queued.discard((i, j))
+        other_domain = set(domains[j])
+        revised = [_class for _class in domains[i] if len(other_domain - conflict_graph[_class]) > 0]  # Keep classes that fit with some class of slot j
+        if len(revised) == len(domains[i]):
+            continue
+        domains[i] = revised
+        if len(revised) == 0:
+            raise WorkingScheduleNotFound("No " + describe_slot(slots[i]) + " fits with any " + describe_slot(slots[j]) + ".")
+        for k in range(len(slots)):                                                         # Slots that depended on the removed classes are checked again
+            if k != i and k != j and (k, i) not in queued:
+                pending.append((k, i))
+                queued.add((k, i))
+    return domains
+
+
+def describe_slot(slot):
+    """
+    Makes a readable description of a slot for messages.
+
+    :param slot: A (Course object, type of class, list of Class objects) tuple.
+    :return: A string, e.g. "Lec of I&C SCI 51 INTRO COMPUTER ORG".
+    """
+
+    course, type_of_class, classes = slot
+    return type_of_class + " of " + course.get_name_of_course().strip()
+
+
+def presolve(courses_per_department):
+    """
+    A quick check, before any solver runs, that the requested courses can be taken together at all.
+
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :return: Nothing
+    :raises WorkingScheduleNotFound: If it is impossible to take all of the courses without time conflictions.
+    """
+
+    slots = get_slots([course for department in courses_per_department for course in department])
+    make_arc_consistent(slots, get_conflict_graph([_class for course, type_of_class, classes in slots for _class in classes]))
+
+
+def get_components(slots, conflict_graph):
+    """
+    Splits the slots into independent groups. Two slots are connected if a class of one can conflict with a class of the other, slots in
+    different groups never interact, so every group can be solved on its own.
+
+    :param slots: A list of (Course object, type of class, list of Class objects) tuples, see get_slots.
+    :param conflict_graph: A dictionary of Class objects and the sets of Class objects they conflict with, see get_conflict_graph.
+    :return: A list of groups (lists of indices of slots, in increasing order), in the order of their first slot.
+    """
+
+    slot_of_class = {_class: index for index, (course, type_of_class, classes) in enumerate(slots) for _class in classes}
+    component_of_slot = [None] * len(slots)
+    components = []
+    for first_slot in range(len(slots)):
+        if component_of_slot[first_slot] is not None:
+            continue
+        component = [first_slot]
+        component_of_slot[first_slot] = len(components)
+        for slot in component:                                                           # Breadth first search, the list grows while it is read
+            for _class in slots[slot][2]:
+                for other_class in conflict_graph[_class]:
+                    other_slot = slot_of_class.get(other_class)
+                    if other_slot is not None and component_of_slot[other_slot] is None:
+                        component_of_slot[other_slot] = len(components)
+                        component.append(other_slot)
+        components.append(sorted(component))
+    return components
@@ -0,0 +1,85 @@
+import concurrent.futures                                                               # Solve independent groups of slots in worker processes
+import itertools                                                                        # Lazy Cartesian product of the solutions of every group
+from classes_and_functions.class_base_exceptions import WorkingScheduleNotFound         # Exception for finding working schedules
+from classes_and_functions import schedule as sch                                       # Schedule functions
+from genetic_algorithm.conflict_graph import get_slots, get_conflict_graph, get_components  # Slots, time conflictions and independent groups
+from genetic_algorithm.backtracking_solver import enumerate_assignments                 # The exact search of every group
+
+
+def get_schedules_using_decomposition(courses_per_department, max_schedules=None, workers=1):
+    """
+    This function is an exact solver like 'get_schedules_using_backtracking', but it first splits the slots into groups that can never conflict
+    with each other (e.g. an evening course and morning courses). Every group is searched on its own and the working schedules are the
+    Cartesian product of the solutions of the groups, so the cost of the search depends on the largest group instead of the whole request.
+
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :param max_schedules: An integer to stop after that many working schedules, default is every working schedule.
+    :param workers: An integer that is the number of worker processes to search the groups with, 1 searches them in this process.
+    :return: An iterable of Schedule objects that are working schedules, made as it is read.
+    :raises WorkingScheduleNotFound: If a group has no combination of classes without time conflictions.
+    """
+
+    slots = get_slots([course for department in courses_per_department for course in department])
+    if len(slots) == 0:
+        raise WorkingScheduleNotFound
+    conflict_graph = get_conflict_graph([_class for course, type_of_class, classes in slots for _class in classes])
+    components = get_components(slots, conflict_graph)
+    component_slots = [[slots[index] for index in component] for component in components]
+
+    if workers == 1 or len(components) == 1:
+        solutions = [solve_component(group) for group in component_slots]
+    else:                                                                               # Classes are sent back as codes, every process has its own Class objects
+        classes_by_code = {_class.code: _class for course, type_of_class, classes in slots for _class in classes}
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            coded_solutions = list(executor.map(solve_component_to_codes, component_slots))
+        solutions = [[tuple(classes_by_code[code] for code in codes) for codes in coded_solution] for coded_solution in coded_solutions]
+
+    for group, solution in zip(component_slots, solutions):
+        if len(solution) == 0:
+            raise WorkingScheduleNotFound("No working combination of " + ", ".join(sorted(set(
+                course.get_name_of_course().strip() for course, type_of_class, classes in group))) + ".")
+    working_schedules = combine_solutions(components, solutions, len(slots))
+    if max_schedules is not None:
+        return itertools.islice(working_schedules, max_schedules)
+    return working_schedules
+
+
+def solve_component(slots):
+    """
+    Finds every working combination of classes of one group of slots.
+
+    :param slots: A list of (Course object, type of class, list of Class objects) tuples.
+    :return: A list of tuples of Class objects in the same order as the slots.
+    """
+
+    conflict_graph = get_conflict_graph([_class for course, type_of_class, classes in slots for _class in classes])
+    return list(enumerate_assignments(slots, conflict_graph))
+
+
+def solve_component_to_codes(slots):
+    """
+    The work of one worker process, 'solve_component' with the classes sent back as class codes.
+
+    :param slots: A list of (Course object, type of class, list of Class objects) tuples.
+    :return: A list of tuples of class codes in the same order as the slots.
+    """
+
+    return [tuple(_class.code for _class in assignment) for assignment in solve_component(slots)]
+
+
+def combine_solutions(components, solutions, number_of_slots):
+    """
+    Lazily combines one solution of every group into whole schedules.
+
+    :param components: A list of groups (lists of indices of slots), see conflict_graph.get_components.
+    :param solutions: A list with the list of solutions (tuples of Class objects) of every group.
+    :param number_of_slots: An integer that is the number of slots of a whole schedule.
+    :return: Yields Schedule objects with the classes in slot order.
+    """
+
+    for combination in itertools.product(*solutions):
+        class_list = [None] * number_of_slots
+        for component, assignment in zip(components, combination):
+            for index, _class in zip(component, assignment):
+                class_list[index] = _class
+        yield sch.Schedule(class_list)
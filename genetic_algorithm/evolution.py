@@ -1,6 +1,8 @@
 import numpy as np                                              # For more statistical functions
 from operator import attrgetter as atg                          # A way to sort custom objects
 from classes_and_functions import schedule as sch               # Schedule functions
+from genetic_algorithm.fitness_cache import FitnessCache        # Cache of already known fitness scores
+from genetic_algorithm.conflict_graph import get_slots, get_conflict_graph  # Layout of the genes and time conflictions of the classes
 
 
 class Evolution:
@@ -14,17 +16,28 @@ class Evolution:
         class_list (list): A list holding all of the different classes.
         dict_for_class_to_course (dictionary): This links different Class objects to Course objects efficiently [dictionary of Classes objects (keys) and Course objects (values)].
         number_of_classes_required_total (integer): A number that specifies how many classes a schedule needs to have all enrollment requirements fulfilled.
+        slots (list): The fixed layout of the genes of every schedule, a list of (Course object, type of class, list of Class objects) tuples.
+        fitness_cache (FitnessCache): A cache of the fitness scores of schedules that were already ranked.
+        random_generator (numpy Generator): The random number generator of every random choice, seed it to make runs reproducible.
+        slot_sizes (numpy array): The number of classes that can fill each slot.
+        observers (list): Functions that are called with the record of every generation (see instrumentation.get_generation_record).
+        conflict_graph (dictionary): The classes that every class conflicts with, see conflict_graph.get_conflict_graph.
     """
 
-    def __init__(self, courses_per_department, population_size=500):
+    def __init__(self, courses_per_department, population_size=500, fitness_cache_size=10000, random_generator=None):
         """
         A constructor for an 'Evolution' class object. The constructor creates and saves general information needed to 'evolve' a population efficiently.
 
         :param courses_per_department: A list of Course objects that were web-scraped.
         :param population_size: An integer that can be changed, but is default to be a population size of 500 individuals.
+        :param fitness_cache_size: An integer that is the number of fitness scores to cache, 0 turns off caching.
+        :param random_generator: A numpy Generator (e.g. numpy.random.default_rng(seed)), default is a new unseeded Generator.
         """
 
         self.population_size = population_size
+        self.random_generator = random_generator if random_generator is not None else np.random.default_rng()
+        self.fitness_cache = FitnessCache(fitness_cache_size)
+        self.observers = []
         self.course_list = []
         self.class_list = []
         self.dict_for_class_to_course = {}
@@ -36,6 +49,9 @@ class Evolution:
                 for _class in course.get_all_classes():
                     self.class_list.append(_class)                                                              # Save the different classes open for that course
                     self.dict_for_class_to_course[_class] = course                                              # Link the class to a course
+        self.slots = get_slots(self.course_list)                                                                # Gene i of every schedule is always a class of slot i
+        self.slot_sizes = np.array([len(classes) for course, type_of_class, classes in self.slots], dtype=np.int64)
+        self.conflict_graph = get_conflict_graph(self.class_list)                                               # Conflictions are looked up, never computed again
 
     def get_starting_population(self):
         """
@@ -44,24 +60,53 @@ class Evolution:
         :return: A list of 'Schedule' objects that contain classes but no fitness score or marked list.
         """
 
-        population = []
-        for x in range(self.population_size):                                                                   # Do this N times where N = desired size of population
-            individual = []
-            for course in self.course_list:
-                lecture_list = course.get_lecture_classes()
-                discussion_list = course.get_discussion_classes()
-                lab_list = course.get_lab_classes()
-                if len(lecture_list) > 0:                                                                       # Randomly select a lecture class from the course to add to the schedule
-                    index = np.random.randint(0, len(lecture_list))
-                    individual.append(lecture_list[index])
-                if len(discussion_list) > 0:                                                                    # Randomly select a discussion class from the course to add to the schedule
-                    index = np.random.randint(0, len(discussion_list))
-                    individual.append(discussion_list[index])
-                if len(lab_list) > 0:                                                                           # Randomly select a lab class from the course to add to the schedule
-                    index = np.random.randint(0, len(lab_list))
-                    individual.append(lab_list[index])
-            population.append(sch.Schedule(individual))                                                         # Append 'Schedule' objects to the population
-        return population                                                                                       # Return the starting population that was generated randomly
+        return [sch.Schedule(individual) for individual in self.get_random_individuals(self.population_size)]   # Return the starting population that was generated randomly
+
+    def get_random_individuals(self, number_of_individuals):
+        """
+        This is a function to randomly select one class for every slot (a lecture, and a discussion and/or lab if the course has them)
+        of several individuals, all of the random indices are drawn at once.
+
+        :param number_of_individuals: An integer that is the number of individuals to make.
+        :return: A list of lists of Class objects in the layout of 'self.slots'.
+        """
+
+        indices = self.random_generator.integers(0, self.slot_sizes, size=(number_of_individuals, len(self.slots))).tolist()
+        individuals = []
+        for row in indices:
+            individuals.append([classes[index] for (course, type_of_class, classes), index in zip(self.slots, row)])
+        return individuals
+
+    def add_observer(self, observer):
+        """
+        Adds an observer that will be called with the record of every generation.
+
+        :param observer: A function that takes one parameter, a dictionary (e.g. instrumentation.MemoryCollector()).
+        :return: Nothing
+        """
+
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        """
+        Removes an observer that was added with 'add_observer'.
+
+        :param observer: The observer to remove.
+        :return: Nothing
+        """
+
+        self.observers.remove(observer)
+
+    def notify(self, record):
+        """
+        Hands the record of a generation to every observer.
+
+        :param record: A dictionary of the information of one generation.
+        :return: Nothing
+        """
+
+        for observer in self.observers:
+            observer(record)
 
     def rank_fitness(self, schedule):
         """
@@ -72,10 +117,17 @@ class Evolution:
         :return: Nothing
         """
 
+        if schedule.fitness_score is not None:                                                                  # Parents carried over from the last generation are already ranked
+            return
+        signature = schedule.get_signature()
+        cached_fitness_score = self.fitness_cache.get(signature)
+        if cached_fitness_score is not None:                                                                    # Children that were already made before are not ranked again
+            schedule.set_fitness_score(cached_fitness_score)
+            return
+
         from genetic_algorithm.class_schedule_solver import is_between                                          # Function to check if classes conflict - late import to prevent circular importing
         class_list = schedule.get_class_list()
         fitness_score = 0.0
-        already_checked = {}
         for _class in class_list:
             for _class_again in class_list:
                 if _class is _class_again:
@@ -86,9 +138,62 @@ class Evolution:
                     fitness_score += 1
         fitness_score = float(fitness_score)/self.number_of_classes_required_total
         schedule.set_fitness_score(fitness_score)
+        self.fitness_cache.put(signature, fitness_score)
+
+    def mark_conflicts(self, schedule):
+        """
+        Marks the classes of a schedule that conflict with another class of the schedule (see Schedule.marked_list).
+
+        :param schedule: A Schedule object in the layout of 'self.slots'.
+        :return: Nothing
+        """
+
+        class_list = schedule.class_list
+        schedule.reset_marks()
+        for index, _class in enumerate(class_list):
+            conflicts = self.conflict_graph[_class]
+            for other_class in class_list:
+                if other_class in conflicts:
+                    schedule.marked_list[index] = True
+                    break
 
-    @staticmethod
-    def select_parents(population, retain_rate=0.4, randomly_retain=0.03):
+    def repair(self, schedule, order_keys=None, tie_breaks=None):
+        """
+        A min-conflicts mutation, every class that is in a time confliction is replaced (one slot at a time, in random order) by the class of the
+        same slot that conflicts with the fewest of the other classes of the schedule. Ties are broken randomly. The random numbers are drawn
+        for the whole generation at once by 'get_next_generation', they are only drawn here if they are not given.
+
+        :param schedule: A Schedule object in the layout of 'self.slots', it is changed in place.
+        :param order_keys: A list of one random float in [0, 1) per slot, the marked slots are repaired in order of their keys.
+        :param tie_breaks: A list of one random float in [0, 1) per slot, picks one of the classes of a slot that tie for the fewest conflicts.
+        :return: Nothing
+        """
+
+        self.mark_conflicts(schedule)
+        marked_indices = schedule.get_indices_of_marked()
+        if len(marked_indices) == 0:
+            return
+        if order_keys is None or tie_breaks is None:
+            order_keys, tie_breaks = self.random_generator.random((2, len(self.slots))).tolist()
+        class_list = schedule.class_list
+        for index in sorted(marked_indices, key=order_keys.__getitem__):
+            least_conflicts = None
+            candidates = []
+            for candidate in self.slots[index][2]:
+                conflicts = self.conflict_graph[candidate]
+                number_of_conflicts = 0
+                for other_index, other_class in enumerate(class_list):
+                    if other_index != index and other_class in conflicts:
+                        number_of_conflicts += 1
+                if least_conflicts is None or number_of_conflicts < least_conflicts:
+                    least_conflicts = number_of_conflicts
+                    candidates = [candidate]
+                elif number_of_conflicts == least_conflicts:
+                    candidates.append(candidate)
+            class_list[index] = candidates[int(tie_breaks[index] * len(candidates))]
+        schedule.reset_marks()
+
+    def select_parents(self, population, retain_rate=0.4, randomly_retain=0.03):
         """
         This function selects parents (most fit schedules) out of the current population of 'Schedule' objects that have fitness scores.
 
@@ -102,68 +207,55 @@ class Evolution:
         retain_length = retain_rate * len(sorted_population_by_fitness)                                     # Only save (default) the top 40% of the population
         fittest = sorted_population_by_fitness[:int(retain_length)]                                         # Slice the list and organize by fittest and unfittest individuals
         unfit_parents = sorted_population_by_fitness[int(retain_length):]
+        lucky_draws = self.random_generator.random(len(unfit_parents)) < randomly_retain
         lucky_parents = []
-        for unfit_schedule in unfit_parents:
-            if randomly_retain > np.random.rand():                                                          # Sometimes, add an unfit individual to the population to stop bottlenecking
+        for unfit_schedule, lucky in zip(unfit_parents, lucky_draws):
+            if lucky:                                                                                       # Sometimes, add an unfit individual to the population to stop bottlenecking
                 lucky_parents.append(unfit_schedule)
         parents = fittest + lucky_parents
         return parents                                                                                      # Return the selected parents that were chosen based on fitness scores
 
-    def get_next_generation(self, selected_parents, randomly_retain=0.1):
+    def get_next_generation(self, selected_parents, randomly_retain=0.1, crossover_points=None):
         """
-        This function selects, cross-breeds and combines classes from fit parents to make a new generation of schedules.
+        This function selects, cross-breeds and combines classes from fit parents to make a new generation of schedules. A mutated child
+        keeps its crossed over genes, only its conflicting classes are replaced (see 'repair').
 
         :param selected_parents: A list of schedules that represent fit parents found in the population.
-        :param randomly_retain: A probability of mutation.
+        :param randomly_retain: A probability of a child not being mutated.
+        :param crossover_points: An integer k for k-point crossover, default is uniform crossover (every gene from a random parent).
         :return: A list of schedule objects that represent the next generation.
         """
 
+        number_of_slots = len(self.slots)
+        number_of_parents = len(selected_parents)
+        target_size = self.population_size - number_of_parents
+        if number_of_parents == 0 or target_size <= 0:
+            return selected_parents
+        rng = self.random_generator                                                                         # Every random choice of the generation is drawn at once
+        fathers = rng.integers(0, number_of_parents, target_size)                                           # Randomly select a mother and father
+        if number_of_parents > 1:
+            mothers = (fathers + rng.integers(1, number_of_parents, target_size)) % number_of_parents       # Make sure that the mother is never the father
+        else:
+            mothers = fathers
+        mutated = rng.random(target_size) > randomly_retain                                                 # Based on random probability, repair the new schedule
+        repair_order_keys, repair_tie_breaks = rng.random((2, target_size, number_of_slots))                # The random order and tie breaks of every repair
+        if crossover_points is None or number_of_slots < 2:                                                 # Uniform crossover
+            from_father = rng.random((target_size, number_of_slots)) < 0.5
+        else:                                                                                               # K-point crossover, genes switch parent after every point
+            number_of_points = min(crossover_points, number_of_slots - 1)
+            points = np.argsort(rng.random((target_size, number_of_slots - 1)), axis=1)[:, :number_of_points] + 1
+            segments = (points[:, :, np.newaxis] <= np.arange(number_of_slots)).sum(axis=1)
+            from_father = segments % 2 == 0
+
         children = []
-        target_size = self.population_size - len(selected_parents)
-        if len(selected_parents) > 0:
-            while len(children) < target_size:                                                              # Run until there are enough children in the next generation
-                father = np.random.choice(selected_parents)                                                 # Randomly select a mother and father
-                mother = np.random.choice(selected_parents)
-                if father != mother:
-                    child = []                                                                              # A child's "genes" are a list of classes
-                    i = 0
-                    while i < self.number_of_classes_required_total:                                        # Ensure that a child will have the correct number of classes
-                        for course in self.course_list:
-                            lab_classes = []
-                            discussion_classes = []
-                            lecture_classes = []
-                            combined = father.get_class_list() + mother.get_class_list()
-                            for _class in combined:                                                         # Organize the parents genes into sections of lab classes, discussion classes, and lecture classes
-                                if self.dict_for_class_to_course[_class] == course:
-                                    if _class.get_type() == 'Lab':
-                                        lab_classes.append(_class)
-                                    elif _class.get_type() == 'Dis':
-                                        discussion_classes.append(_class)
-                                    else:
-                                        lecture_classes.append(_class)
-                            child.append(lecture_classes[np.random.randint(0, len(lecture_classes))])       # Randomly select a lecture from the list of lecture classes (from mother and father)
-                            i += 1                                                                          # Do the same for lab classes and discussion classes if applicable
-                            if course.has_lab():
-                                child.append(lab_classes[np.random.randint(0, len(lab_classes))])
-                                i += 1
-                            if course.has_discussion():
-                                child.append(discussion_classes[np.random.randint(0, len(discussion_classes))])
-                                i += 1
-                        if np.random.rand() > randomly_retain:                                              # Based on random probability, add a new schedule to the population
-                            child = []                                                                      # Make the new schedule randomly
-                            for course in self.course_list:
-                                lecture_list = course.get_lecture_classes()
-                                discussion_list = course.get_discussion_classes()
-                                lab_list = course.get_lab_classes()
-                                if len(lecture_list) > 0:
-                                    index = np.random.randint(0, len(lecture_list))
-                                    child.append(lecture_list[index])
-                                if len(discussion_list) > 0:
-                                    index = np.random.randint(0, len(discussion_list))
-                                    child.append(discussion_list[index])
-                                if len(lab_list) > 0:
-                                    index = np.random.randint(0, len(lab_list))
-                                    child.append(lab_list[index])
-                    children.append(sch.Schedule(child))                                                   # Make the class list into a Schedule object
+        for father_index, mother_index, mutate, genes_from_father, order_keys, tie_breaks in zip(
+                fathers.tolist(), mothers.tolist(), mutated.tolist(), from_father.tolist(), repair_order_keys.tolist(), repair_tie_breaks.tolist()):
+            father_genes = selected_parents[father_index].class_list                                        # Both parents have the layout of 'self.slots', so genes are
+            mother_genes = selected_parents[mother_index].class_list                                        # picked slot by slot
+            child = [father_gene if pick else mother_gene for father_gene, mother_gene, pick in zip(father_genes, mother_genes, genes_from_father)]
+            child = sch.Schedule(child)                                                                     # Make the class list into a Schedule object
+            if mutate:
+                self.repair(child, order_keys, tie_breaks)
+            children.append(child)
         next_population = children + selected_parents
         return next_population
@@ -0,0 +1,61 @@
+from collections import OrderedDict                             # Keeps keys in order of use
+
+
+class FitnessCache:
+    """
+    The FitnessCache class is a bounded, least recently used cache of fitness scores. Schedules are keyed by their signature (their sorted
+    class codes), so that a schedule that was already scored is never scored again.
+
+    Attributes:
+        maximum_size (integer): The maximum number of fitness scores to keep, the least recently used score is dropped first.
+        scores (OrderedDict): The cached fitness scores (values) of schedule signatures (keys).
+        hits (integer): The number of times a fitness score was found in the cache.
+        misses (integer): The number of times a fitness score was not found in the cache.
+    """
+
+    def __init__(self, maximum_size=10000):
+        """
+        A constructor for a 'FitnessCache' object.
+
+        :param maximum_size: An integer that is the maximum number of fitness scores to keep, 0 turns off caching.
+        """
+
+        self.maximum_size = maximum_size
+        self.scores = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, signature):
+        """
+        A get-function for a cached fitness score.
+
+        :param signature: A tuple of sorted class codes (see Schedule.get_signature).
+        :return: The fitness score of the signature, or None if it is not cached.
+        """
+
+        fitness_score = self.scores.get(signature)
+        if fitness_score is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.scores.move_to_end(signature)
+        return fitness_score
+
+    def put(self, signature, fitness_score):
+        """
+        Caches a fitness score, dropping the least recently used score if the cache is full.
+
+        :param signature: A tuple of sorted class codes (see Schedule.get_signature).
+        :param fitness_score: A floating point value that is the fitness score of the signature.
+        :return: Nothing
+        """
+
+        if self.maximum_size <= 0:
+            return
+        self.scores[signature] = fitness_score
+        self.scores.move_to_end(signature)
+        if len(self.scores) > self.maximum_size:
+            self.scores.popitem(last=False)
+
+    def __len__(self):
+        return len(self.scores)
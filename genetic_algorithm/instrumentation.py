@@ -0,0 +1,106 @@
+import json                                                     # Records are written as JSON
+
+
+class JsonLinesSink:
+    """
+    An observer of the genetic algorithm that writes every generation record as one line of JSON.
+
+    Attributes:
+        file (file): The open file that records are written to.
+    """
+
+    def __init__(self, path):
+        """
+        A constructor for a 'JsonLinesSink' object.
+
+        :param path: A string that is the path of the file to append records to.
+        """
+
+        self.file = open(path, 'a')
+
+    def __call__(self, record):
+        """
+        Writes a generation record.
+
+        :param record: A dictionary of the information of one generation (see get_generation_record).
+        :return: Nothing
+        """
+
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+
+    def close(self):
+        """
+        Closes the file.
+
+        :return: Nothing
+        """
+
+        self.file.close()
+
+
+class MemoryCollector:
+    """
+    An observer of the genetic algorithm that keeps every generation record in memory.
+
+    Attributes:
+        records (list): The generation records (dictionaries) in order.
+    """
+
+    def __init__(self):
+        """
+        A constructor for a 'MemoryCollector' object.
+        """
+
+        self.records = []
+
+    def __call__(self, record):
+        """
+        Keeps a generation record.
+
+        :param record: A dictionary of the information of one generation (see get_generation_record).
+        :return: Nothing
+        """
+
+        self.records.append(record)
+
+
+def get_generation_record(generation_number, population, number_of_working_schedules, fitness_cache, timings):
+    """
+    Makes the record of one generation that is handed to observers.
+
+    :param generation_number: The n'th generation (an integer).
+    :param population: The list of ranked Schedule objects of the generation.
+    :param number_of_working_schedules: An integer that is the number of schedules without time conflictions.
+    :param fitness_cache: The FitnessCache of the Evolution object.
+    :param timings: A dictionary of the seconds spent in 'fitness', 'selection' and 'crossover' for the generation.
+    :return: A dictionary of the information of the generation.
+    """
+
+    fitness_scores = [schedule.fitness_score for schedule in population]
+    return {
+        'generation': generation_number,
+        'population_size': len(population),
+        'fitness_seconds': timings['fitness'],
+        'selection_seconds': timings['selection'],
+        'crossover_seconds': timings['crossover'],
+        'best_fitness': max(fitness_scores) if fitness_scores else None,
+        'mean_fitness': float(sum(fitness_scores)) / len(fitness_scores) if fitness_scores else None,
+        'diversity': get_diversity(population),
+        'cache_hits': fitness_cache.hits,
+        'cache_misses': fitness_cache.misses,
+        'working_schedules': number_of_working_schedules,
+    }
+
+
+def get_diversity(population):
+    """
+    Measures how different the schedules of a population are.
+
+    :param population: A list of Schedule objects.
+    :return: A float that is the fraction of schedules that are unique (1.0 means no two schedules have the same classes).
+    """
+
+    if len(population) == 0:
+        return 0.0
+    return float(len(set(schedule.get_signature() for schedule in population))) / len(population)
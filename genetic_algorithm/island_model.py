@@ -0,0 +1,173 @@
+import multiprocessing                                                                  # Run every island in its own process
+import os                                                                               # Number of cores of the machine
+import pickle                                                                           # Check that an error of an island can be sent back
+import queue                                                                            # Empty exception of the migration queues
+import traceback                                                                        # Send the traceback of a failed island back
+import numpy as np                                                                      # Seed every island differently
+from operator import attrgetter as atg                                                  # A way to sort custom objects
+from genetic_algorithm.evolution import Evolution                                       # A Class to manage Evolution of Schedules
+from genetic_algorithm.restart_policy import RestartPolicy                              # When an island restarts or gives up
+from classes_and_functions.class_base_exceptions import WorkingScheduleNotFound         # Exception for finding working schedules
+from classes_and_functions import schedule as sch                                       # Schedule functions
+
+RESULT_POLL_SECONDS = 1                                                                 # How often the islands are checked for a crash while waiting for results
+
+
+class IslandFailure:
+    """The error of an island, sent back to the main process in place of working schedules."""
+
+    def __init__(self, error, formatted_traceback):
+        self.error = error
+        self.formatted_traceback = formatted_traceback
+
+
+class RemoteTraceback(Exception):
+    """The traceback of an error raised in an island, set as the cause of the error when it is raised again."""
+
+    def __str__(self):
+        return '\n"""\n' + self.args[0] + '"""'
+
+
+def get_schedules_using_islands(courses_per_department, number_of_islands=None, migration_interval=10, migration_size=5,
+                                population_size=100, max_generations=None, max_schedules=None, seed=None):
+    """
+    This function runs the genetic algorithm as an island model, several independent Evolution populations run in worker processes and every
+    'migration_interval' generations each island sends copies of its best schedules to the next island (in a ring). Working schedules are
+    streamed back to this process as soon as an island finds them.
+
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :param number_of_islands: An integer that is the number of islands (processes), default is the number of cores.
+    :param migration_interval: An integer that is the number of generations between migrations.
+    :param migration_size: An integer that is the number of schedules each island sends per migration.
+    :param population_size: An integer that is the population size of every island.
+    :param max_generations: An integer, an island gives up after this many generations, default is when its restart policy gives up.
+    :param max_schedules: An integer to stop every island once that many working schedules were found, default is to let every island finish.
+    :param seed: An integer to seed the random number generators of the islands with (every island gets its own stream).
+    :return: A list of Schedule objects that are working schedules (no duplicates).
+    :raises WorkingScheduleNotFound: If none of the islands found a working schedule.
+    :raises ValueError: If there are no islands, the migration interval is less than 1 or the migration size is negative.
+    :raises RuntimeError: If an island process exited without finishing (e.g. it was killed), an error raised in an island is raised again as is.
+    """
+
+    if number_of_islands is None:
+        number_of_islands = os.cpu_count() or 1
+    if number_of_islands < 1 or migration_interval < 1 or migration_size < 0:                # Checked here, an island process would only die
+        raise ValueError("The islands solver needs at least 1 island, a migration interval of at least 1 and a migration size of at least 0.")
+    classes_by_code = {_class.code: _class for department in courses_per_department
+                       for course in department for _class in course.get_all_classes()}
+    inboxes = [multiprocessing.Queue() for _ in range(number_of_islands)]
+    results = multiprocessing.Queue()
+    stop_event = multiprocessing.Event()
+    seeds = np.random.SeedSequence(seed).spawn(number_of_islands)                       # Independent random streams, so that islands never evolve the same way
+    islands = []
+    for island_number in range(number_of_islands):
+        island = multiprocessing.Process(target=run_island, args=(
+            courses_per_department, population_size, max_generations, migration_interval, migration_size,
+            inboxes[island_number], inboxes[(island_number + 1) % number_of_islands], results, stop_event, seeds[island_number]))
+        island.start()
+        islands.append(island)
+
+    working_schedules = {}
+    failure = None
+    finished_islands = 0
+    islands_are_running = True
+    while finished_islands < number_of_islands:                                         # Keep reading until every island is done, so that no island blocks on a full queue
+        try:
+            message = results.get(timeout=RESULT_POLL_SECONDS if islands_are_running else RESULT_POLL_SECONDS / 10)
+        except queue.Empty:
+            if not islands_are_running:                                                 # Every island exited and nothing is left to read
+                break
+            if any(island.exitcode not in (None, 0) for island in islands):             # An island was killed before it could send its sentinel
+                stop_event.set()
+            islands_are_running = any(island.is_alive() for island in islands)
+            continue
+        if message is None:
+            finished_islands += 1
+        elif isinstance(message, IslandFailure):
+            failure = failure or message
+            stop_event.set()
+        elif tuple(sorted(message)) not in working_schedules:                           # Same key as Schedule.get_signature
+            working_schedules[tuple(sorted(message))] = sch.Schedule([classes_by_code[code] for code in message])
+            if max_schedules is not None and len(working_schedules) >= max_schedules:
+                stop_event.set()
+    for island in islands:
+        island.join()
+
+    if failure is not None:
+        raise failure.error from RemoteTraceback(failure.formatted_traceback)
+    if finished_islands < number_of_islands:
+        raise RuntimeError(str(number_of_islands - finished_islands) + " of the " + str(number_of_islands) + " islands exited without finishing (exit codes "
+                           + ", ".join(str(island.exitcode) for island in islands) + ").")
+    if len(working_schedules) == 0:
+        raise WorkingScheduleNotFound("None of the " + str(number_of_islands) + " islands found a working schedule.")
+    return list(working_schedules.values())[:max_schedules]
+
+
+def run_island(courses_per_department, population_size, max_generations, migration_interval, migration_size,
+               inbox, neighbour_inbox, results, stop_event, seed):
+    """
+    The work of one island (run in a worker process). Schedules are passed between processes as tuples of class codes, so that every process
+    keeps using its own Class objects.
+
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :param population_size: An integer that is the population size of the island.
+    :param max_generations: An integer, the island gives up after this many generations (None for no limit).
+    :param migration_interval: An integer that is the number of generations between migrations.
+    :param migration_size: An integer that is the number of schedules sent per migration.
+    :param inbox: A Queue that migrants to this island arrive in.
+    :param neighbour_inbox: The Queue of the next island in the ring.
+    :param results: A Queue that working schedules are sent to, an IslandFailure if the island raised and None when the island is done (always).
+    :param stop_event: An Event that is set when the island should stop early.
+    :param seed: A numpy SeedSequence for the random number generator of the island.
+    :return: Nothing
+    """
+
+    try:
+        from genetic_algorithm.class_schedule_solver import satisfied_requirements       # Late import to prevent circular importing
+        neighbour_inbox.cancel_join_thread()                                            # Migrants that are never read should not keep this process alive
+        darwin = Evolution(courses_per_department, population_size, random_generator=np.random.default_rng(seed))
+        classes_by_code = {_class.code: _class for _class in darwin.class_list}
+        restart_policy = RestartPolicy()
+        current_population = darwin.get_starting_population()
+        generation_number = 0
+        found_working_schedule = False
+
+        while not found_working_schedule and (max_generations is None or generation_number < max_generations) and not stop_event.is_set():
+            for schedule in current_population:
+                if satisfied_requirements(schedule):
+                    found_working_schedule = True
+                    results.put(tuple(_class.code for _class in schedule.class_list))
+                darwin.rank_fitness(schedule)
+            generation_number += 1
+
+            if generation_number % migration_interval == 0:
+                current_population.sort(key=atg('fitness_score'), reverse=True)
+                neighbour_inbox.put([tuple(_class.code for _class in schedule.class_list) for schedule in current_population[:migration_size]])
+                migrants = []
+                try:
+                    while True:
+                        migrants += inbox.get_nowait()
+                except queue.Empty:
+                    pass
+                migrants = migrants[:len(current_population)]
+                for index, codes in enumerate(migrants):                                # Migrants replace the least fit schedules of the island
+                    migrant = sch.Schedule([classes_by_code[code] for code in codes])
+                    darwin.rank_fitness(migrant)
+                    current_population[len(current_population) - 1 - index] = migrant
+
+            decision = restart_policy.update(max(schedule.fitness_score for schedule in current_population))
+            if decision == RestartPolicy.STOP:
+                break
+            elif decision == RestartPolicy.RESTART:                                     # Migrants keep arriving, so a restarted island is not alone
+                current_population = darwin.get_starting_population()
+            else:
+                selected_parents = darwin.select_parents(current_population)
+                current_population = darwin.get_next_generation(selected_parents)
+    except Exception as error:                                                          # Sent back so that the main process raises it, instead of waiting forever
+        try:
+            pickle.dumps(error)
+        except Exception:
+            error = RuntimeError(repr(error))
+        results.put(IslandFailure(error, traceback.format_exc()))
+    finally:
+        results.put(None)
@@ -0,0 +1,75 @@
+class RestartPolicy:
+    """
+    The RestartPolicy class decides when a genetic algorithm has stagnated. When the best fitness of the population has not improved for
+    'patience' generations the population is restarted, and every restart gives the next population more patience. After 'max_restarts'
+    restarts without finding a working schedule the search gives up, and it never runs more than 'max_generations' generations in total.
+
+    Attributes:
+        patience (float): The number of generations without improvement before the next restart.
+        growth (float): The factor that the patience grows by after every restart.
+        max_restarts (integer): The number of restarts before giving up.
+        max_generations (integer): The number of generations (over every restart) before giving up, None for no limit.
+        generations (integer): The number of generations so far.
+        restarts (integer): The number of restarts so far.
+        best_fitness (float): The best fitness score since the last restart.
+        stagnant_generations (integer): The number of generations since the best fitness score improved.
+        settings (tuple): The (patience, growth, max_restarts, max_generations) the policy was made with.
+        stop_reason (string): Why the search gave up, None while it has not.
+    """
+
+    CONTINUE = 'continue'
+    RESTART = 'restart'
+    STOP = 'stop'
+
+    def __init__(self, patience=20, growth=2.0, max_restarts=3, max_generations=200):
+        """
+        A constructor for a 'RestartPolicy' object.
+
+        :param patience: An integer that is the number of generations without improvement before the first restart.
+        :param growth: A number that the patience is multiplied by after every restart.
+        :param max_restarts: An integer that is the number of restarts before giving up.
+        :param max_generations: An integer that is the number of generations (over every restart) before giving up, None for no limit.
+        """
+
+        self.patience = float(patience)
+        self.growth = growth
+        self.max_restarts = max_restarts
+        self.max_generations = max_generations
+        self.generations = 0
+        self.restarts = 0
+        self.best_fitness = None
+        self.stagnant_generations = 0
+        self.settings = (patience, growth, max_restarts, max_generations)
+        self.stop_reason = None
+
+    def update(self, best_fitness):
+        """
+        Tells the policy the best fitness score of a generation.
+
+        :param best_fitness: A float that is the best fitness score of the generation.
+        :return: RestartPolicy.CONTINUE, RestartPolicy.RESTART or RestartPolicy.STOP.
+        """
+
+        self.generations += 1
+        if self.max_generations is not None and self.generations >= self.max_generations:      # Never worse than a fixed budget
+            self.stop_reason = "No working schedule was found in " + str(self.generations) + " generations."
+            return RestartPolicy.STOP
+        if self.best_fitness is None or best_fitness > self.best_fitness:
+            self.best_fitness = best_fitness
+            self.stagnant_generations = 0
+            return RestartPolicy.CONTINUE
+        self.stagnant_generations += 1
+        if self.stagnant_generations < self.patience:
+            return RestartPolicy.CONTINUE
+        if self.restarts >= self.max_restarts:
+            self.stop_reason = ("No working schedule was found, the search stagnated after " + str(self.restarts) + " restarts ("
+                                + str(self.generations) + " generations).")
+            return RestartPolicy.STOP
+        self.restarts += 1
+        self.patience *= self.growth
+        self.best_fitness = None
+        self.stagnant_generations = 0
+        return RestartPolicy.RESTART
+
+    def __repr__(self):
+        return "RestartPolicy" + repr(self.settings)                                   # The same settings give the same result cache key
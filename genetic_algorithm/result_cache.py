@@ -0,0 +1,168 @@
+import threading                                                                        # The schedule service solves requests on several threads
+from collections import OrderedDict                                                     # Keeps keys in order of use
+from classes_and_functions.class_base_exceptions import WorkingScheduleNotFound         # Exception for finding working schedules
+from classes_and_functions import schedule as sch                                       # Schedule functions
+from genetic_algorithm.class_schedule_solver import get_schedules                       # Genetic Algorithm and other solvers
+
+EXACT_SOLVERS = ('backtracking', 'decomposed')                                          # Their "no working schedule" is final, the others are random searches
+UNKEYED_OPTIONS = ('observers', 'workers')                                              # Solver options that do not change the schedules that are found
+
+
+class ResultCache:
+    """
+    The ResultCache class is a bounded, least recently used cache of the working schedules found for a set of courses, so that the same
+    courses are not solved again. Requests are keyed by their term, their sorted course names, the solver and its options. Every entry also keeps a
+    fingerprint of the meeting times and statuses of the classes that were searched, and the entry is solved again as soon as one of them
+    changes (e.g. a class filled up after a refresh). The schedules are stored as tuples of class codes and are made again from the current
+    Class objects, so their seats are always the latest ones. That no working schedule was found is only cached for the exact solvers
+    (EXACT_SOLVERS), another run of a random search may still find one.
+
+    Attributes:
+        maximum_size (integer): The maximum number of requests to keep, the least recently used request is dropped first.
+        entries (OrderedDict): The (fingerprint, schedules as tuples of class codes, complete, error) tuples (values) of keys (keys).
+        hits (integer): The number of times the schedules of a request were found in the cache.
+        misses (integer): The number of times a request had to be solved.
+        lock (Lock): Guards 'entries' while requests of different threads read and write it.
+    """
+
+    def __init__(self, maximum_size=256):
+        """
+        A constructor for a 'ResultCache' object.
+
+        :param maximum_size: An integer that is the maximum number of requests to keep, 0 turns off caching.
+        """
+
+        self.maximum_size = maximum_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get_schedules(self, term, courses_per_department, max_schedules=None, solver='ga', reduce_symmetry=True, **options):
+        """
+        Finds working schedules like class_schedule_solver.get_schedules, but only solves courses that are not cached (or whose classes changed).
+
+        :param term: A string that is the term of the classes.
+        :param courses_per_department: A list of departments (each department is a list of Course objects).
+        :param max_schedules: An integer to find at most that many working schedules, default is to find all of them.
+        :param solver: A string that is the name of the solver to use, see class_schedule_solver.SOLVERS.
+        :param reduce_symmetry: A boolean, False to let the solver search over every class.
+        :param options: Keyword arguments that are passed on to the selected solver.
+        :return: A list of Schedule objects that are working schedules.
+        :raises WorkingScheduleNotFound: If no working schedule was found (also when that was cached for an exact solver).
+        """
+
+        key = get_key(term, courses_per_department, solver, reduce_symmetry, options)
+        fingerprint = get_fingerprint(courses_per_department)
+        entry = self.get(key, fingerprint, max_schedules)
+        if entry is None:
+            try:
+                schedules = list(get_schedules(courses_per_department, solver, reduce_symmetry, max_schedules=max_schedules, **options))
+            except WorkingScheduleNotFound as reason:
+                if solver in EXACT_SOLVERS:
+                    self.put(key, fingerprint, [], True, str(reason))
+                raise
+            complete = max_schedules is None or len(schedules) < max_schedules
+            self.put(key, fingerprint, [get_codes(schedule) for schedule in schedules], complete)
+            return schedules
+        fingerprint, codes_of_schedules, complete, error = entry
+        if error is not None:
+            raise WorkingScheduleNotFound(error)
+        return rebuild_schedules(courses_per_department, codes_of_schedules[:max_schedules])
+
+    def get(self, key, fingerprint, max_schedules=None):
+        """
+        A get-function for a cached request.
+
+        :param key: A tuple that is the key of the request (see get_key).
+        :param fingerprint: A tuple that is the fingerprint of the classes of the request (see get_fingerprint).
+        :param max_schedules: An integer that is the number of working schedules that are needed, default is all of them.
+        :return: The (fingerprint, schedules as tuples of class codes, complete, error) tuple of the request, or None if it is not cached, if its
+         classes changed or if it holds fewer schedules than needed.
+        """
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] != fingerprint or not (entry[2] or max_schedules is not None and len(entry[1]) >= max_schedules):
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, fingerprint, codes_of_schedules, complete, error=None):
+        """
+        Caches the working schedules of a request, dropping the least recently used request if the cache is full.
+
+        :param key: A tuple that is the key of the request (see get_key).
+        :param fingerprint: A tuple that is the fingerprint of the classes of the request (see get_fingerprint).
+        :param codes_of_schedules: A list of working schedules, each one a tuple of class codes in the order of the schedule.
+        :param complete: A boolean, True if these are all of the working schedules the solver found (not cut off).
+        :param error: A string that tells why no working schedule was found, or None.
+        :return: Nothing
+        """
+
+        if self.maximum_size <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (fingerprint, codes_of_schedules, complete, error)
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.maximum_size:
+                self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def get_key(term, courses_per_department, solver, reduce_symmetry, options=None):
+    """
+    The key of a request, the same courses have the same key no matter the order they were entered in.
+
+    :param term: A string that is the term of the classes.
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :param solver: A string that is the name of the solver.
+    :param reduce_symmetry: A boolean, False if the solver searches over every class.
+    :param options: A dictionary of keyword arguments that are passed on to the solver (e.g. seed or population_size), default is none.
+    :return: A tuple of the term, the sorted course names, the solver, reduce_symmetry and the sorted (name, repr of value) tuples of the
+     options, except UNKEYED_OPTIONS.
+    """
+
+    course_names = tuple(sorted(course.get_name_of_course().strip() for department in courses_per_department for course in department))
+    solver_options = tuple(sorted((name, repr(value)) for name, value in (options or {}).items() if name not in UNKEYED_OPTIONS))
+    return term, course_names, solver, reduce_symmetry, solver_options
+
+
+def get_fingerprint(courses_per_department):
+    """
+    The fingerprint of the classes of a request, it changes when a class is added or dropped, or when its meeting time or status changes.
+
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :return: A tuple of sorted (code, days, start, end, status) tuples, one per class.
+    """
+
+    return tuple(sorted((_class.code, _class.days, _class.start, _class.end, str(_class.status))
+                        for department in courses_per_department for course in department for _class in course.get_all_classes()))
+
+
+def get_codes(schedule):
+    """
+    The class codes of a schedule, in the order of the schedule.
+
+    :param schedule: A Schedule object.
+    :return: A tuple of class codes.
+    """
+
+    return tuple(_class.code for _class in schedule.get_class_list())
+
+
+def rebuild_schedules(courses_per_department, codes_of_schedules):
+    """
+    Makes Schedule objects again from cached class codes, with the current Class objects of the courses.
+
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :param codes_of_schedules: A list of working schedules, each one a tuple of class codes.
+    :return: A list of Schedule objects.
+    """
+
+    classes = {_class.code: _class for department in courses_per_department for course in department for _class in course.get_all_classes()}
+    return [sch.Schedule([classes[code] for code in codes]) for codes in codes_of_schedules]
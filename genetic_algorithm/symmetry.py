@@ -0,0 +1,75 @@
+import itertools                                                                        # Lazy Cartesian products of equivalent classes
+from classes_and_functions.department import Course                                     # Courses of the representative classes
+from classes_and_functions import schedule as sch                                       # Schedule functions
+
+
+def get_meeting_pattern(_class):
+    """
+    The part of a class that matters for time conflictions, classes with the same meeting pattern are interchangeable in a schedule.
+
+    :param _class: A Class object.
+    :return: A tuple of the day mask, start minute and end minute of the class.
+    """
+
+    return _class.day_mask, _class.start_minute, _class.end_minute
+
+
+def reduce_courses(courses_per_department):
+    """
+    Collapses the classes of every (course, type of class) that meet at the same time (e.g. several STAFF discussions of one lecture) into one
+    representative class, so that solvers only search over meeting patterns.
+
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :return: A list of departments of Course objects that only hold representative classes, and a dictionary of every representative class
+     and the list of classes (itself included) that it stands for.
+    """
+
+    reduced_departments = []
+    members = {}
+    for department in courses_per_department:
+        reduced_department = []
+        for course in department:
+            reduced_course = Course(course.get_name_of_course())
+            for type_of_class, classes in (('Lec', course.get_lecture_classes()),
+                                           ('Dis', course.get_discussion_classes()),
+                                           ('Lab', course.get_lab_classes())):
+                representatives = {}
+                for _class in classes:
+                    pattern = get_meeting_pattern(_class)
+                    if pattern in representatives:
+                        members[representatives[pattern]].append(_class)
+                    else:
+                        representatives[pattern] = _class
+                        members[_class] = [_class]
+                        reduced_course.add_class(type_of_class, _class)
+            reduced_department.append(reduced_course)
+        reduced_departments.append(reduced_department)
+    return reduced_departments, members
+
+
+def get_reduction_factor(members):
+    """
+    Tells how much smaller the search got, i.e. the number of classes for every representative class.
+
+    :param members: A dictionary of representative classes and the classes they stand for, see reduce_courses.
+    :return: A float, 1.0 if no classes were collapsed.
+    """
+
+    if len(members) == 0:
+        return 1.0
+    return sum(len(classes) for classes in members.values()) / float(len(members))
+
+
+def expand_schedules(schedules, members):
+    """
+    Turns schedules of representative classes back into schedules of the real classes. The expansion is lazy, every schedule of representatives
+    stands for the Cartesian product of the classes of its representatives, and they are only made when they are read.
+
+    :param schedules: An iterable of Schedule objects made out of representative classes.
+    :param members: A dictionary of representative classes and the classes they stand for, see reduce_courses.
+    :return: Yields Schedule objects of the real classes.
+    """
+
+    for schedule in schedules:
+        for class_list in itertools.product(*[members.get(_class, [_class]) for _class in schedule.get_class_list()]):
+            yield sch.Schedule(list(class_list))
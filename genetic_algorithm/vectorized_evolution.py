@@ -0,0 +1,160 @@
+import numpy as np                                              # Batched operations over a whole generation
+from classes_and_functions import schedule as sch               # Schedule functions
+from classes_and_functions.class_table import ClassTable        # Meeting times of the classes as typed arrays
+from genetic_algorithm.conflict_graph import get_slots          # Layout of the genes of a schedule
+
+
+class VectorizedEvolution:
+    """
+    The VectorizedEvolution class is an alternate engine to the Evolution class. Instead of a list of Schedule objects, a population is an integer
+    matrix (individuals x slots) where every cell is the index of the class chosen for that slot, so that every step of the genetic algorithm
+    runs as one NumPy operation over the whole generation.
+
+    Attributes:
+        population_size (integer): This is the population size per generation.
+        course_list (list): A list holding all of the different courses.
+        slots (list): A list of (Course object, type of class, list of Class objects) tuples, one for every class a schedule needs.
+        class_list (list): A list holding all of the different classes, ordered slot by slot.
+        slot_sizes (numpy array): The number of classes that can fill each slot.
+        slot_offsets (numpy array): The index in 'class_list' of the first class of each slot.
+        conflict_matrix (numpy array): A boolean matrix where [i, j] is True if class i and class j have overlapping meeting times.
+        number_of_classes_required_total (integer): A number that specifies how many classes a schedule needs to have all enrollment requirements fulfilled.
+        random_generator (numpy Generator): The random number generator of every random choice, seed it to make runs reproducible.
+    """
+
+    def __init__(self, courses_per_department, population_size=20000, random_generator=None):
+        """
+        A constructor for a 'VectorizedEvolution' class object. The constructor lays out the slots and precomputes the conflicts between every pair of classes.
+
+        :param courses_per_department: A list of Course objects that were web-scraped.
+        :param population_size: An integer that is the number of individuals per generation, default to be 20000 individuals.
+        :param random_generator: A numpy Generator (e.g. numpy.random.default_rng(seed)), default is a new unseeded Generator.
+        """
+
+        self.population_size = population_size
+        self.random_generator = random_generator if random_generator is not None else np.random.default_rng()
+        self.course_list = []
+        self.number_of_classes_required_total = 0
+        for department in courses_per_department:
+            for course in department:
+                self.course_list.append(course)
+                self.number_of_classes_required_total += course.get_number_of_required_classes()
+        self.slots = get_slots(self.course_list)
+        self.class_list = []
+        for course, type_of_class, classes in self.slots:
+            self.class_list += classes
+        self.slot_sizes = np.array([len(classes) for course, type_of_class, classes in self.slots], dtype=np.int64)
+        self.slot_offsets = np.concatenate(([0], np.cumsum(self.slot_sizes)[:-1])).astype(np.int64)
+        self.conflict_matrix = get_conflict_matrix(self.class_list)
+
+    def get_starting_population(self, number_of_individuals=None):
+        """
+        This is a function to randomly create a population, every slot of every individual is filled with a random class of that slot.
+
+        :param number_of_individuals: The number of individuals to make, default to be 'self.population_size'.
+        :return: An integer matrix (individuals x slots) of class indices.
+        """
+
+        if number_of_individuals is None:
+            number_of_individuals = self.population_size
+        return self.random_generator.integers(0, self.slot_sizes, size=(number_of_individuals, len(self.slots)))
+
+    def count_conflicts(self, population):
+        """
+        Counts the number of time conflicting pairs of classes in every individual of the population.
+
+        :param population: An integer matrix (individuals x slots) of class indices.
+        :return: An integer array with the number of ordered pairs of conflicting classes per individual.
+        """
+
+        genes = population + self.slot_offsets                                                                  # Indices into 'class_list'
+        conflicts = self.conflict_matrix[genes[:, :, np.newaxis], genes[:, np.newaxis, :]]
+        return conflicts.sum(axis=(1, 2))
+
+    def rank_fitness(self, population):
+        """
+        Scores every individual the same way as Evolution.rank_fitness, every ordered pair of classes is +1 if they do not conflict, -1 if they do.
+
+        :param population: An integer matrix (individuals x slots) of class indices.
+        :return: A float array of fitness scores and a boolean array that is True for individuals without time conflictions.
+        """
+
+        number_of_slots = len(self.slots)
+        number_of_conflicts = self.count_conflicts(population)
+        fitness_scores = (number_of_slots * (number_of_slots - 1) - 2 * number_of_conflicts) / float(self.number_of_classes_required_total)
+        return fitness_scores, number_of_conflicts == 0
+
+    def select_parents(self, population, fitness_scores, retain_rate=0.4, randomly_retain=0.03):
+        """
+        This function selects parents (most fit individuals) and some unfit individuals out of the current population.
+
+        :param population: An integer matrix (individuals x slots) of class indices.
+        :param fitness_scores: A float array of the fitness scores of the population.
+        :param retain_rate: The percentage of top-tier individuals to keep.
+        :param randomly_retain: The probability of low-tier individuals to keep.
+        :return: An integer matrix of the selected parents.
+        """
+
+        sorted_by_fitness = np.argsort(-fitness_scores, kind='stable')                                         # Highest->lowest fitness scores
+        retain_length = int(retain_rate * len(sorted_by_fitness))
+        fittest = sorted_by_fitness[:retain_length]
+        unfit = sorted_by_fitness[retain_length:]
+        lucky = unfit[self.random_generator.random(len(unfit)) < randomly_retain]                              # Sometimes keep an unfit individual to stop bottlenecking
+        return population[np.concatenate((fittest, lucky))]
+
+    def get_next_generation(self, selected_parents, randomly_retain=0.1):
+        """
+        This function makes the next generation with uniform crossover between random pairs of parents, mutation makes an all new random child.
+
+        :param selected_parents: An integer matrix of the selected parents.
+        :param randomly_retain: A probability of mutation.
+        :return: An integer matrix that is the next generation.
+        """
+
+        number_of_parents = len(selected_parents)
+        target_size = self.population_size - number_of_parents
+        if number_of_parents == 0 or target_size <= 0:
+            return selected_parents
+        rng = self.random_generator
+        fathers = rng.integers(0, number_of_parents, target_size)
+        if number_of_parents > 1:                                                                               # Make sure that a mother is never the father
+            mothers = (fathers + rng.integers(1, number_of_parents, target_size)) % number_of_parents
+        else:
+            mothers = fathers
+        from_father = rng.random((target_size, len(self.slots))) < 0.5
+        children = np.where(from_father, selected_parents[fathers], selected_parents[mothers])
+        mutated = rng.random(target_size) > randomly_retain                                                     # Based on random probability, make a new random child
+        children[mutated] = self.get_starting_population(int(mutated.sum()))
+        return np.concatenate((children, selected_parents))
+
+    def get_schedule(self, individual):
+        """
+        Turns one row of a population back into a Schedule object.
+
+        :param individual: An integer array of class indices, one per slot.
+        :return: A Schedule object holding the chosen Class objects.
+        """
+
+        genes = individual + self.slot_offsets
+        return sch.Schedule([self.class_list[gene] for gene in genes])
+
+
+def get_conflict_matrix(class_list):
+    """
+    Precomputes the time conflictions between every pair of classes, the meeting times are read straight out of the typed arrays of a ClassTable.
+
+    :param class_list: A list of Class objects, or a ClassTable.
+    :return: A boolean matrix where [i, j] is True if class i and class j conflict (a class never conflicts with itself).
+    """
+
+    table = class_list if isinstance(class_list, ClassTable) else ClassTable(class_list)
+    if len(table) == 0:                                                                 # numpy.frombuffer does not take an empty buffer
+        return np.zeros((0, 0), dtype=bool)
+    day_masks = np.frombuffer(table.day_masks, dtype=np.uint8).astype(np.int64)
+    start_minutes = np.frombuffer(table.start_minutes, dtype=np.int16).astype(np.int64)
+    end_minutes = np.frombuffer(table.end_minutes, dtype=np.int16).astype(np.int64)
+    conflict_matrix = ((day_masks[:, np.newaxis] & day_masks[np.newaxis, :]) != 0) \
+        & (start_minutes[:, np.newaxis] <= end_minutes[np.newaxis, :]) \
+        & (start_minutes[np.newaxis, :] <= end_minutes[:, np.newaxis])
+    np.fill_diagonal(conflict_matrix, False)
+    return conflict_matrix
@@ -0,0 +1,120 @@
+from classes_and_functions.class_base_exceptions import WorkingScheduleNotFound         # Exception for finding working schedules
+from classes_and_functions.department import Course                                     # Courses of the open classes
+from classes_and_functions import schedule as sch                                       # Schedule functions
+from genetic_algorithm.conflict_graph import get_slots, get_conflict_graph              # Slots and time conflictions of the classes
+from genetic_algorithm.backtracking_solver import enumerate_assignments                 # The exact search of the changed courses
+from genetic_algorithm.class_schedule_solver import get_schedules                       # Solve everything when nothing can be kept
+
+
+def get_open_courses(courses_per_department):
+    """
+    Leaves out the classes that are full, the courses that are made hold the same Class objects (so updates of their seats are seen).
+
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :return: A list of departments of Course objects that only hold classes that are not full.
+    :raises WorkingScheduleNotFound: If every class of some type of a course is full.
+    """
+
+    open_departments = []
+    for department in courses_per_department:
+        open_department = []
+        for course in department:
+            open_course = Course(course.get_name_of_course())
+            for type_of_class, classes in (('Lec', course.get_lecture_classes()),
+                                           ('Dis', course.get_discussion_classes()),
+                                           ('Lab', course.get_lab_classes())):
+                open_classes = [_class for _class in classes if not _class.is_full()]
+                if len(classes) > 0 and len(open_classes) == 0:
+                    raise WorkingScheduleNotFound("Every " + type_of_class + " of " + course.get_name_of_course().strip() + " is full.")
+                for _class in open_classes:
+                    open_course.add_class(type_of_class, _class)
+            open_department.append(open_course)
+        open_departments.append(open_department)
+    return open_departments
+
+
+def solve_open_classes(courses_per_department, max_schedules=None, solver='ga', reduce_symmetry=True, **options):
+    """
+    Finds working schedules from scratch, with the classes that are not full.
+
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :param max_schedules: An integer to keep at most that many working schedules, default is to keep all of them.
+    :param solver: A string that is the name of the solver to use, see class_schedule_solver.SOLVERS.
+    :param reduce_symmetry: A boolean, False to let the solver search over every class.
+    :param options: Keyword arguments that are passed on to the selected solver.
+    :return: A list of Schedule objects that are working schedules.
+    :raises WorkingScheduleNotFound: If no working schedule was found.
+    """
+
+    return list(get_schedules(get_open_courses(courses_per_department), solver, reduce_symmetry, max_schedules=max_schedules, **options))
+
+
+def resolve_schedules(courses_per_department, previous_schedules, changed_courses, max_schedules=None, solver='ga', reduce_symmetry=True,
+                      **options):
+    """
+    Finds working schedules again after some classes became full or opened up, by only searching the courses that changed. The classes of the
+    other courses are taken from the previous schedules (their seats and meeting times did not change, so they still fit together), and only
+    the open classes of the changed courses are searched with backtracking around them. If none of the previous schedules can be kept, every
+    course is solved again from scratch.
+
+    :param courses_per_department: A list of departments (each department is a list of Course objects) with the refreshed seats.
+    :param previous_schedules: A list of Schedule objects that were working schedules before the refresh.
+    :param changed_courses: A set of the names of the courses that have a class that became full or opened up.
+    :param max_schedules: An integer to keep at most that many working schedules, default is to keep all of them.
+    :param solver: A string that is the name of the solver to use if everything is solved again.
+    :param reduce_symmetry: A boolean, False to let the solver search over every class if everything is solved again.
+    :param options: Keyword arguments that are passed on to the selected solver.
+    :return: A list of Schedule objects that are working schedules.
+    :raises WorkingScheduleNotFound: If no working schedule was found.
+    """
+
+    open_departments = get_open_courses(courses_per_department)
+    open_courses = [course for department in open_departments for course in department]
+    slot_order = {(course.get_name_of_course(), type_of_class): index                   # Keep the classes in the usual order of a schedule
+                  for index, (course, type_of_class, classes) in enumerate(get_slots(open_courses))}
+    changed_slots = get_slots([course for course in open_courses if course.get_name_of_course() in changed_courses])
+    conflict_graph = get_conflict_graph([_class for course, type_of_class, classes in changed_slots for _class in classes])
+
+    working_schedules = []
+    found_signatures = set()
+    for kept_classes in get_kept_classes(previous_schedules, changed_courses):
+        slots = []
+        for course, type_of_class, classes in changed_slots:                           # Only the classes that fit around the kept classes
+            classes = [_class for _class in classes if not any(_class.conflicts_with(kept_class) for kept_class in kept_classes)]
+            if len(classes) == 0:
+                break
+            slots.append((course, type_of_class, classes))
+        if len(slots) < len(changed_slots):
+            continue
+        assignments = enumerate_assignments(slots, conflict_graph) if len(slots) > 0 else [()]
+        for assignment in assignments:
+            class_list = sorted(kept_classes + list(assignment), key=lambda _class: slot_order[(_class.name_of_course, _class.type_of_class)])
+            schedule = sch.Schedule(class_list)
+            if schedule.get_signature() in found_signatures:
+                continue
+            found_signatures.add(schedule.get_signature())
+            working_schedules.append(schedule)
+            if max_schedules is not None and len(working_schedules) >= max_schedules:
+                return working_schedules
+    if len(working_schedules) == 0:
+        return solve_open_classes(courses_per_department, max_schedules, solver, reduce_symmetry, **options)
+    return working_schedules
+
+
+def get_kept_classes(previous_schedules, changed_courses):
+    """
+    Takes the classes of the courses that did not change out of the previous schedules, every combination only once.
+
+    :param previous_schedules: A list of Schedule objects.
+    :param changed_courses: A set of the names of the courses that changed.
+    :return: Yields lists of Class objects that are not full.
+    """
+
+    found_signatures = set()
+    for schedule in previous_schedules:
+        kept_classes = [_class for _class in schedule.get_class_list() if _class.name_of_course not in changed_courses]
+        signature = tuple(sorted(_class.code for _class in kept_classes))
+        if signature in found_signatures or any(_class.is_full() for _class in kept_classes):
+            continue
+        found_signatures.add(signature)
+        yield kept_classes
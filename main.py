@@ -1,13 +1,166 @@
+import argparse                                                                                     # Command line options
 from scrape import class_scraper                                                                    # Scrape function
-from genetic_algorithm.class_schedule_solver import get_schedules_using_ga                          # Genetic Algorithm
+from scrape.catalog_cache import CatalogCache, DEFAULT_PATH                                         # Scraped courses of earlier runs
+from genetic_algorithm.class_schedule_solver import get_schedules, SOLVERS                          # Genetic Algorithm and other solvers
 from classes_and_functions.class_base_exceptions import WorkingScheduleNotFound                     # Exceptions for the script
 from classes_and_functions.export_classes import export_text                                        # Exporting functionality
 
-term, departments = class_scraper.get_classes()                                                     # Scrape the classes
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate class schedules for UCI classes.")
+    parser.add_argument('--backend', choices=class_scraper.BACKENDS, default='selenium',
+                        help="How the UCI class search is scraped, a Chrome WebDriver or plain HTTP requests (default: selenium).")
+    parser.add_argument('--websoc-url', default=None,
+                        help="URL of the WebSoc search page, e.g. a local server that serves recorded pages (the cache is not used).")
+    parser.add_argument('--record', default=None, metavar='DIR',
+                        help="Save the scraped term, department options and results pages to DIR, to replay the run later.")
+    parser.add_argument('--replay', default=None, metavar='DIR',
+                        help="Scrape from the pages recorded in DIR instead of the UCI class search (no browser or network).")
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help="Departments fetched at the same time with the http backend (default: 4).")
+    parser.add_argument('--cache', default=DEFAULT_PATH, metavar='PATH',
+                        help="SQLite file of the scraped courses of earlier runs (default: " + DEFAULT_PATH + ").")
+    parser.add_argument('--no-cache', action='store_true', help="Always scrape, without reading or writing the cache.")
+    parser.add_argument('--cache-ttl', type=float, default=3600,
+                        help="Seconds that cached courses stay fresh (default: 3600).")
+    parser.add_argument('--refresh', action='store_true', help="Scrape every department again and update the cache.")
+    parser.add_argument('--invalidate', action='append', default=[], metavar='DEPT',
+                        help="Remove a department from the cache before scraping, can be given several times.")
+    parser.add_argument('--solver', choices=SOLVERS, default='ga',
+                        help="The solver used to find working schedules (default: ga).")
+    parser.add_argument('--islands', type=int, default=None,
+                        help="Number of islands (processes) for the islands solver (default: number of cores).")
+    parser.add_argument('--migration-interval', type=int, default=10,
+                        help="Generations between migrations for the islands solver (default: 10).")
+    parser.add_argument('--migration-size', type=int, default=5,
+                        help="Schedules sent per migration for the islands solver (default: 5).")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes that search independent groups of courses for the decomposed solver (default: 1).")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Seed for the random number generator of the genetic algorithm solvers, to reproduce a run.")
+    parser.add_argument('--max-schedules', type=int, default=None, metavar='N',
+                        help="Keep at most N working schedules, the ga solver then stops as soon as it found them and the first ones are "
+                             "written right away (default: every schedule that was found).")
+    parser.add_argument('--no-symmetry-reduction', action='store_true',
+                        help="Let the solver search over every class, instead of one class per meeting time of a course.")
+    parser.add_argument('--watch', type=float, default=None, metavar='SECONDS',
+                        help="Keep refreshing the seats of the classes every SECONDS, and search the courses whose classes fill up or open up again "
+                             "(full classes are left out of the schedules).")
+    parser.add_argument('--batch', default=None, metavar='PATH',
+                        help="Solve every argument file of a directory (*.txt) or listed in a manifest file, every department is only scraped once.")
+    parser.add_argument('--batch-output', default='batch_schedules', metavar='DIR',
+                        help="Directory of the schedules of every argument file in batch mode (default: batch_schedules).")
+    parser.add_argument('--batch-workers', type=int, default=None,
+                        help="Worker processes that solve argument files at the same time in batch mode (default: number of cores).")
+    parser.add_argument('--serve', type=int, default=None, metavar='PORT',
+                        help="Run a local service on PORT that answers schedule requests (POST /schedules) from courses kept in memory.")
+    parser.add_argument('--refresh-interval', type=float, default=300, metavar='SECONDS',
+                        help="Seconds between refreshes of the courses kept in memory by the service (default: 300).")
+    parser.add_argument('--log-generations', default=None, metavar='PATH',
+                        help="Append a JSON line per generation of the ga solver (timings, fitness, diversity, cache hits) to PATH, only with --solver ga.")
+    arguments = parser.parse_args()
+    if arguments.batch is not None and (arguments.watch is not None or arguments.log_generations is not None):
+        parser.error("--batch can not be used with --watch or --log-generations.")
+    if arguments.serve is not None and (arguments.batch is not None or arguments.watch is not None or arguments.log_generations is not None):
+        parser.error("--serve can not be used with --batch, --watch or --log-generations.")
+    if arguments.log_generations is not None and arguments.solver != 'ga':
+        parser.error("--log-generations can only be used with --solver ga.")
+    if (arguments.islands is not None and arguments.islands < 1) or arguments.migration_interval < 1 or arguments.migration_size < 0:
+        parser.error("--islands and --migration-interval have to be at least 1, --migration-size at least 0.")
+    if arguments.workers < 1:
+        parser.error("--workers has to be at least 1.")
+    if arguments.concurrency < 1:
+        parser.error("--concurrency has to be at least 1.")
+    if arguments.batch_workers is not None and arguments.batch_workers < 1:
+        parser.error("--batch-workers has to be at least 1.")
+    if arguments.max_schedules is not None and (arguments.max_schedules < 1 or arguments.serve is not None):
+        parser.error("--max-schedules has to be at least 1 and can not be used with --serve (a request sends its own max_schedules).")
+    solver_options = {}
+    if arguments.solver not in ('backtracking', 'decomposed'):                                      # The exact solvers are not random
+        solver_options['seed'] = arguments.seed
+    generation_log = None
+    if arguments.log_generations is not None:
+        from genetic_algorithm.instrumentation import JsonLinesSink                                 # Late imports, options that are not used are not loaded
+        generation_log = JsonLinesSink(arguments.log_generations)
+        solver_options['observers'] = [generation_log]
+    if arguments.solver == 'decomposed':
+        solver_options['workers'] = arguments.workers
+    if arguments.solver == 'islands':
+        solver_options.update({'number_of_islands': arguments.islands,
+                               'migration_interval': arguments.migration_interval,
+                               'migration_size': arguments.migration_size})
 
-try:
-    working_schedules = get_schedules_using_ga(departments)                                         # Try to find working schedules
-    export_text(term, working_schedules)                                                            # Output the working schedules
+    cache = None
+    if (not arguments.no_cache and arguments.record is None and arguments.replay is None            # Recorded runs always parse every page
+            and arguments.websoc_url is None                                                        # Another server (e.g. a stand-in) is not the UCI catalog
+            and arguments.serve is None                                                             # The service keeps its courses in memory instead
+            and arguments.watch is None):                                                           # Watch mode also scrapes the full classes
+        cache = CatalogCache(arguments.cache, arguments.cache_ttl)
+        for department in arguments.invalidate:
+            cache.invalidate(department)
+    backend = class_scraper.get_backend(arguments.backend, arguments.websoc_url, arguments.record, arguments.replay,
+                                        include_full=arguments.watch is not None)                   # Full classes are left out by is_full, so they can open up
+    if arguments.serve is not None:
+        from schedule_service import serve                                                          # Late import, only the service answers over HTTP
+        serve(backend, arguments.serve, refresh_interval=arguments.refresh_interval, concurrency=arguments.concurrency,
+              solver=arguments.solver, reduce_symmetry=not arguments.no_symmetry_reduction, **solver_options)
+    elif arguments.batch is not None:
+        from genetic_algorithm.batch_solver import solve_batch                                      # Late import, only batch mode solves in worker processes
+        term, batch = class_scraper.get_batch_classes(class_scraper.read_batch(arguments.batch), backend,  # Scrape every department only once
+                                                      arguments.concurrency, cache=cache, force_refresh=arguments.refresh)
+        if cache is not None:
+            cache.close()
+        for path, output_path, number_of_schedules, error in solve_batch(term, batch, output_directory=arguments.batch_output,
+                                                                         batch_workers=arguments.batch_workers, solver=arguments.solver,
+                                                                         reduce_symmetry=not arguments.no_symmetry_reduction,
+                                                                         max_schedules=arguments.max_schedules, **solver_options):
+            if error is None:
+                print(path + ": " + str(number_of_schedules) + " schedules written to " + output_path)
+            else:
+                print(path + ": " + error)
+    else:
+        term, departments = class_scraper.get_classes(backend=backend, concurrency=arguments.concurrency,  # Scrape the classes
+                                                      cache=cache, force_refresh=arguments.refresh)
+        if cache is not None:
+            cache.close()
 
-except WorkingScheduleNotFound:                                                                     # Using the GA, a schedule was not able to be found.
-    print("Unable to create schedule.")
+        working_schedules = []
+        try:
+            if arguments.watch is None:
+                working_schedules = get_schedules(departments, arguments.solver,                    # Try to find working schedules
+                                                  reduce_symmetry=not arguments.no_symmetry_reduction,
+                                                  max_schedules=arguments.max_schedules, **solver_options)
+            else:
+                from genetic_algorithm.warm_start import solve_open_classes, resolve_schedules      # Late import, only watch mode leaves out full classes
+                working_schedules = solve_open_classes(departments, arguments.max_schedules, arguments.solver, not arguments.no_symmetry_reduction,
+                                                       **solver_options)
+            export_text(term, working_schedules)                                                    # Output the working schedules (written as they are found)
+
+        except WorkingScheduleNotFound as reason:                                                   # Using the selected solver, a schedule was not able to be found.
+            print("Unable to create schedule. " + str(reason))
+
+        if arguments.watch is not None:
+            from scrape.availability import watch_availability, get_class_codes                     # Late import, asyncio is only loaded to refresh the seats
+            backend = class_scraper.get_backend(arguments.backend, arguments.websoc_url, arguments.record, arguments.replay)
+            try:
+                for changed_classes in watch_availability(backend, departments, arguments.watch, arguments.concurrency,
+                                                          get_codes=lambda: get_class_codes(departments, working_schedules)):  # Only the shown schedules and full classes
+                    if len(changed_classes) == 0:                                                   # Nothing filled up or opened up, the schedules still work
+                        continue
+                    for _class in changed_classes:
+                        print(str(_class.code) + ", " + _class.name_of_course.strip() + "-" + _class.type_of_class
+                              + (" is full." if _class.is_full() else " opened up."))
+                    try:
+                        working_schedules = resolve_schedules(departments, working_schedules,       # Only search the courses that changed again
+                                                              set(_class.name_of_course for _class in changed_classes), arguments.max_schedules,
+                                                              arguments.solver, not arguments.no_symmetry_reduction, **solver_options)
+                        export_text(term, working_schedules)
+                    except WorkingScheduleNotFound as reason:
+                        working_schedules = []
+                        print("Unable to create schedule. " + str(reason))
+            except KeyboardInterrupt:                                                               # Ctrl+C stops watching
+                pass
+            finally:
+                backend.close()
+
+    if generation_log is not None:
+        generation_log.close()
@@ -0,0 +1,181 @@
+import http.server                                                                                  # Answer requests over HTTP
+import json                                                                                         # Requests and answers are JSON
+import socketserver                                                                                 # One thread per request (Python 3.6 has no ThreadingHTTPServer)
+import time                                                                                         # Time taken by a request
+import traceback                                                                                    # Log requests that failed unexpectedly
+from classes_and_functions.class_base_exceptions import ParseError, WorkingScheduleNotFound, SnapshotNotFound   # Exceptions for the requests
+from classes_and_functions.export_classes import export_json                                        # Schedules as JSON values
+from genetic_algorithm.result_cache import ResultCache                                              # Schedules of earlier requests
+from scrape.warm_catalog import WarmCatalog                                                         # Parsed courses kept in memory
+
+DEFAULT_MAX_SCHEDULES = 100                                                                         # Schedules per answer, unless the request asks for another number
+
+
+class ScheduleServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    """
+    A local HTTP server that finds working schedules. The parsed courses stay in memory (see WarmCatalog), so a request only scrapes the
+    courses that no earlier request asked for, and so do the found schedules (see ResultCache), so the same courses are only solved again
+    after the meeting time or status of one of their classes changed.
+
+    POST /schedules with {"departments": ["I&C SCI", "STATS"], "courses": ["51, 139W", "67"], "max_schedules": 10} answers
+    {"term": ..., "schedules": [[{class}, ...], ...], "milliseconds": ...}, and GET /health answers the state of the catalog.
+
+    Attributes:
+        catalog (WarmCatalog): The parsed courses.
+        result_cache (ResultCache): The schedules of earlier requests.
+        solver (string): The name of the solver to use, see class_schedule_solver.SOLVERS.
+        reduce_symmetry (boolean): False to let the solver search over every class.
+        solver_options (dictionary): Keyword arguments that are passed on to the solver.
+    """
+
+    daemon_threads = True                                                                           # Requests that are still running do not block a shutdown
+
+    def __init__(self, address, catalog, solver='ga', reduce_symmetry=True, solver_options=None, result_cache=None):
+        """
+        A constructor for a 'ScheduleServer' object, the server listens right away but only answers once serve_forever is called.
+
+        :param address: A (host, port) tuple, e.g. ('127.0.0.1', 8000).
+        :param catalog: A WarmCatalog object.
+        :param solver: A string that is the name of the solver to use.
+        :param reduce_symmetry: A boolean, False to let the solver search over every class.
+        :param solver_options: A dictionary of keyword arguments that are passed on to the solver.
+        :param result_cache: A ResultCache object, default is a new ResultCache().
+        """
+
+        super().__init__(address, ScheduleRequestHandler)
+        self.catalog = catalog
+        self.solver = solver
+        self.reduce_symmetry = reduce_symmetry
+        self.solver_options = solver_options or {}
+        self.result_cache = ResultCache() if result_cache is None else result_cache
+
+    def find_schedules(self, query):
+        """
+        Finds working schedules for a request.
+
+        :param query: A dictionary with the lists 'departments' and 'courses' (in the same form as an argument file) and optionally
+         'max_schedules'.
+        :return: A dictionary with the term, the schedules (see export_classes.export_json) and the milliseconds it took.
+        :raises ValueError: If the request is not in the right form.
+        :raises ParseError: If a department or a course number is not valid.
+        :raises SnapshotNotFound: If the catalog replays a snapshot and the courses were not recorded.
+        :raises WorkingScheduleNotFound: If no working schedule was found.
+        """
+
+        start = time.perf_counter()
+        departments = query.get('departments') if isinstance(query, dict) else None
+        courses = query.get('courses') if isinstance(query, dict) else None
+        if not isinstance(departments, list) or not isinstance(courses, list) or len(departments) == 0:
+            raise ValueError("The request needs the lists \"departments\" and \"courses\", e.g. "
+                             "{\"departments\": [\"I&C SCI\", \"STATS\"], \"courses\": [\"51, 139W\", \"67\"]}.")
+        max_schedules = query.get('max_schedules', DEFAULT_MAX_SCHEDULES)
+        if not isinstance(max_schedules, int) or isinstance(max_schedules, bool) or max_schedules < 1:     # JSON true is an int in Python
+            raise ValueError("\"max_schedules\" has to be a whole number of at least 1, e.g. 10.")
+        courses_per_department = self.catalog.get_courses([str(department) for department in departments], [str(numbers) for numbers in courses])
+        working_schedules = self.result_cache.get_schedules(self.catalog.term, courses_per_department, max_schedules, self.solver,
+                                                            self.reduce_symmetry, **self.solver_options)
+        answer = export_json(self.catalog.term, working_schedules)
+        answer['milliseconds'] = (time.perf_counter() - start) * 1000
+        return answer
+
+    def get_status(self):
+        """
+        The state of the catalog.
+
+        :return: A dictionary with the term, the course numbers in memory of every department, the version, the time of the last refresh
+         and the hits and misses of the result cache.
+        """
+
+        return {'term': self.catalog.term, 'version': self.catalog.version, 'refreshed': self.catalog.refreshed,
+                'courses': {department: sorted(numbers) for department, numbers in self.catalog.courses.items()},
+                'result_cache': {'requests': len(self.result_cache), 'hits': self.result_cache.hits, 'misses': self.result_cache.misses}}
+
+
+class ScheduleRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Answers the requests of a ScheduleServer (one object per request).
+    """
+
+    protocol_version = 'HTTP/1.1'                                                                   # Keep the connection of the front-end alive
+
+    def do_GET(self):
+        """
+        GET /health answers the state of the catalog.
+
+        :return: Nothing
+        """
+
+        if self.path != '/health':
+            self.send_json(404, {'error': "Unknown path " + self.path + ", use POST /schedules or GET /health."})
+            return
+        self.send_json(200, self.server.get_status())
+
+    def do_POST(self):
+        """
+        POST /schedules answers working schedules for the departments and courses in the body.
+
+        :return: Nothing
+        """
+
+        if self.path != '/schedules':
+            self.send_json(404, {'error': "Unknown path " + self.path + ", use POST /schedules or GET /health."})
+            return
+        try:
+            query = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8'))
+            self.send_json(200, self.server.find_schedules(query))
+        except (ValueError, ParseError) as reason:                                                  # Includes JSON that can not be decoded
+            self.send_json(400, {'error': str(reason)})
+        except WorkingScheduleNotFound as reason:
+            self.send_json(422, {'error': "Unable to create schedule. " + str(reason)})
+        except SnapshotNotFound as reason:
+            self.send_json(404, {'error': str(reason)})
+        except ConnectionError as reason:
+            self.send_json(502, {'error': "Unable to scrape the courses. " + str(reason)})
+        except Exception as reason:                                                                 # Always answer, the front-end would wait on the connection
+            self.log_error("Unable to answer the request: %r", reason)
+            traceback.print_exc()
+            self.send_json(500, {'error': "Unable to answer the request. " + type(reason).__name__ + ": " + str(reason)})
+
+    def send_json(self, status, value):
+        """
+        Sends an answer.
+
+        :param status: An integer that is the HTTP status code.
+        :param value: A value that can be written as JSON.
+        :return: Nothing
+        """
+
+        body = json.dumps(value).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(backend, port, host='127.0.0.1', refresh_interval=300, concurrency=4, solver='ga', reduce_symmetry=True, **solver_options):
+    """
+    Runs the schedule service until it is stopped with Ctrl+C.
+
+    :param backend: A scraping backend (see class_scraper.get_backend), it is closed when the service stops.
+    :param port: An integer that is the port to listen on.
+    :param host: A string that is the address to listen on, default is only this machine.
+    :param refresh_interval: A number of seconds between refreshes of the courses in memory.
+    :param concurrency: An integer that is the largest number of departments fetched at the same time.
+    :param solver: A string that is the name of the solver to use, see class_schedule_solver.SOLVERS.
+    :param reduce_symmetry: A boolean, False to let the solver search over every class.
+    :param solver_options: Keyword arguments that are passed on to the solver.
+    :return: Nothing
+    """
+
+    catalog = WarmCatalog(backend, concurrency)
+    server = ScheduleServer((host, port), catalog, solver, reduce_symmetry, solver_options)
+    catalog.start_refreshing(refresh_interval)
+    print("Serving schedules for the " + catalog.term + " on http://" + host + ":" + str(server.server_address[1]) + "/schedules")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:                                                                       # Ctrl+C stops the service
+        pass
+    finally:
+        server.server_close()
+        catalog.close()
@@ -0,0 +1,105 @@
+import time                                                                    # Wait between refreshes
+from classes_and_functions.class_base_exceptions import InvalidCourse          # None of the class codes of a search were found
+from scrape.fetch_pipeline import fetch_departments                            # Fetch and parse the pages concurrently
+
+CODES_PER_QUERY = 10                                                           # Class codes per search, WebSoc only takes a few codes at once
+
+
+def get_class_codes(courses_per_department, working_schedules=None):
+    """
+    Collects the codes of the classes to refresh. With working schedules, only the classes that can change them are refreshed: the classes of
+    the schedules (they can fill up) and the full classes (they can open up). An open class that is in no schedule does not change the
+    schedules when it fills up.
+
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :param working_schedules: A list of the Schedule objects that are shown right now, default is to refresh every class.
+    :return: A sorted list of integers that are class codes.
+    """
+
+    classes = [_class for department in courses_per_department for course in department for _class in course.get_all_classes()]
+    if working_schedules is None:
+        return sorted(set(_class.code for _class in classes))
+    class_codes = set(_class.code for _class in classes if _class.is_full())
+    for schedule in working_schedules:
+        class_codes.update(_class.code for _class in schedule.get_class_list())
+    return sorted(class_codes)
+
+
+def fetch_availability(backend, class_codes, concurrency=4, timeout=30, retries=3):
+    """
+    Fetches the columns that change during enrollment for a list of classes. The classes are searched by their codes, a few codes per search,
+    so only the rows of those classes are downloaded and parsed.
+
+    :param backend: A scraping backend with a 'fetch_class_codes_html' function (see class_scraper.get_backend).
+    :param class_codes: A list of integers that are class codes.
+    :param concurrency: An integer that is the largest number of searches in flight.
+    :param timeout: A number of seconds to wait for one search.
+    :param retries: An integer that is the number of times a failed search is sent again.
+    :return: A dictionary of class codes (keys) and (capacity, enrolled, wait list, status) tuples (values), classes that were not found
+     (e.g. cancelled classes) are left out.
+    :raises ConnectionError: If a search still failed after every retry.
+    """
+
+    queries = [(','.join(str(code) for code in class_codes[i:i + CODES_PER_QUERY]),) for i in range(0, len(class_codes), CODES_PER_QUERY)]
+    availability = {}
+    for courses in fetch_departments(backend, queries, concurrency, timeout, retries, fetch=backend.fetch_class_codes_html):
+        if isinstance(courses, InvalidCourse):                                 # None of the codes of this search were found
+            continue
+        if isinstance(courses, Exception):
+            raise courses
+        for course in courses:
+            for _class in course.get_all_classes():
+                availability[_class.code] = (_class.capacity, _class.enrolled, _class.wait_list, _class.status)
+    return availability
+
+
+def update_availability(courses_per_department, availability):
+    """
+    Updates the scraped classes in place with freshly fetched columns, and finds the classes that became full or opened up.
+
+    :param courses_per_department: A list of departments (each department is a list of Course objects).
+    :param availability: A dictionary of class codes and (capacity, enrolled, wait list, status) tuples, see fetch_availability.
+    :return: A list of the Class objects that became full or opened up (classes that were not fetched keep their columns).
+    """
+
+    changed_classes = []
+    for department in courses_per_department:
+        for course in department:
+            for _class in course.get_all_classes():
+                if _class.code not in availability:
+                    continue
+                was_full = _class.is_full()
+                _class.update_availability(*availability[_class.code])
+                if _class.is_full() != was_full:
+                    changed_classes.append(_class)
+    return changed_classes
+
+
+def watch_availability(backend, courses_per_department, interval=60, concurrency=4, timeout=30, retries=3, max_refreshes=None, get_codes=None):
+    """
+    Refreshes the seats of the scraped classes every 'interval' seconds. A refresh that fails is reported and skipped, the next one is tried
+    as usual.
+
+    :param backend: A scraping backend with a 'fetch_class_codes_html' function, it is not closed.
+    :param courses_per_department: A list of departments (each department is a list of Course objects), they are updated in place.
+    :param interval: A number of seconds to wait before every refresh.
+    :param concurrency: An integer that is the largest number of searches in flight.
+    :param timeout: A number of seconds to wait for one search.
+    :param retries: An integer that is the number of times a failed search is sent again.
+    :param max_refreshes: An integer to stop after that many refreshes, default is to never stop.
+    :param get_codes: A function that returns the class codes to refresh (called before every refresh, see get_class_codes), default is
+     every class.
+    :return: Yields a list of the Class objects that became full or opened up after every refresh (empty if nothing changed).
+    """
+
+    refreshes = 0
+    while max_refreshes is None or refreshes < max_refreshes:
+        time.sleep(interval)
+        refreshes += 1
+        try:
+            class_codes = get_class_codes(courses_per_department) if get_codes is None else get_codes()
+            availability = fetch_availability(backend, class_codes, concurrency, timeout, retries)
+        except ConnectionError as reason:
+            print("Unable to refresh the seats of the classes. " + str(reason))
+            continue
+        yield update_availability(courses_per_department, availability)
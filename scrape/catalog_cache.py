@@ -0,0 +1,137 @@
+import pickle                                          # Courses are stored as they were parsed
+import sqlite3                                         # One local file, safe to share between runs
+import time                                            # Age of the cached entries
+import zlib                                            # Keep the cached courses small
+
+DEFAULT_PATH = 'catalog_cache.sqlite3'                 # Cache file in the directory that main.py is run from
+
+
+class CatalogCache:
+    """
+    The CatalogCache class keeps the parsed courses of every (term, department, course numbers) query in an SQLite file, so that runs with the
+    same courses do not scrape the UCI class search again. The term and the department options are cached as well, so a warm run does not
+    need the network at all.
+
+    Attributes:
+        path (string): The path of the SQLite file.
+        ttl (float): The number of seconds that an entry stays fresh, None to never expire.
+        connection (Connection): The connection to the SQLite file.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, ttl=3600):
+        """
+        A constructor for a 'CatalogCache' object, the file and its tables are made if they do not exist yet.
+
+        :param path: A string that is the path of the SQLite file (':memory:' for a cache that is not saved).
+        :param ttl: A number of seconds that an entry stays fresh, None to never expire.
+        """
+
+        self.path = path
+        self.ttl = ttl
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS departments (term TEXT, department TEXT, course_numbers TEXT, "
+                                "fetched REAL, data BLOB, PRIMARY KEY (term, department, course_numbers))")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, fetched REAL, data BLOB)")
+        self.connection.commit()
+
+    def is_fresh(self, fetched):
+        """
+        Checks if an entry is still fresh.
+
+        :param fetched: A float that is the time (seconds since the epoch) that the entry was stored.
+        :return: True if the entry has not expired.
+        """
+
+        return self.ttl is None or time.time() - fetched < self.ttl
+
+    def get_courses(self, term, department, course_numbers):
+        """
+        Looks up the courses of a query.
+
+        :param term: A string that is the term, e.g. "2019 Fall Quarter".
+        :param department: A string that is the department code, e.g. "I&C SCI".
+        :param course_numbers: A string of course numbers as typed in the search form, e.g. "51, 139W".
+        :return: A list of Course objects, or None if the query is not cached or has expired.
+        """
+
+        row = self.connection.execute("SELECT fetched, data FROM departments WHERE term = ? AND department = ? AND course_numbers = ?",
+                                      (term, department, normalize_course_numbers(course_numbers))).fetchone()
+        if row is None or not self.is_fresh(row[0]):
+            return None
+        return pickle.loads(zlib.decompress(row[1]))
+
+    def put_courses(self, term, department, course_numbers, courses):
+        """
+        Stores the courses of a query.
+
+        :param term: A string that is the term.
+        :param department: A string that is the department code.
+        :param course_numbers: A string of course numbers as typed in the search form.
+        :param courses: A list of Course objects.
+        :return: Nothing
+        """
+
+        self.connection.execute("INSERT OR REPLACE INTO departments VALUES (?, ?, ?, ?, ?)",
+                                (term, department, normalize_course_numbers(course_numbers), time.time(),
+                                 zlib.compress(pickle.dumps(courses, pickle.HIGHEST_PROTOCOL))))
+        self.connection.commit()
+
+    def get_metadata(self, key):
+        """
+        Looks up a value that is not about one department (e.g. 'term' or 'department_options').
+
+        :param key: A string that is the name of the value.
+        :return: The value, or None if it is not cached or has expired.
+        """
+
+        row = self.connection.execute("SELECT fetched, data FROM metadata WHERE key = ?", (key,)).fetchone()
+        if row is None or not self.is_fresh(row[0]):
+            return None
+        return pickle.loads(row[1])
+
+    def put_metadata(self, key, value):
+        """
+        Stores a value that is not about one department.
+
+        :param key: A string that is the name of the value.
+        :param value: Any value that can be pickled.
+        :return: Nothing
+        """
+
+        self.connection.execute("INSERT OR REPLACE INTO metadata VALUES (?, ?, ?)", (key, time.time(), pickle.dumps(value, pickle.HIGHEST_PROTOCOL)))
+        self.connection.commit()
+
+    def invalidate(self, department=None):
+        """
+        Removes cached entries, so that they are scraped again.
+
+        :param department: A string that is the department code to remove, default is to remove everything (including the metadata).
+        :return: Nothing
+        """
+
+        if department is None:
+            self.connection.execute("DELETE FROM departments")
+            self.connection.execute("DELETE FROM metadata")
+        else:
+            self.connection.execute("DELETE FROM departments WHERE department = ?", (department,))
+        self.connection.commit()
+
+    def close(self):
+        """
+        Closes the SQLite file.
+
+        :return: Nothing
+        """
+
+        self.connection.close()
+
+
+def normalize_course_numbers(course_numbers):
+    """
+    Makes the same course numbers typed in different ways into the same key, e.g. "51, 139w" and "139W,51" are both "139W,51".
+
+    :param course_numbers: A string of course numbers as typed in the search form.
+    :return: A string of the sorted, upper case course numbers separated by commas.
+    """
+
+    return ','.join(sorted(number.strip().upper() for number in course_numbers.split(',') if number.strip() != ''))
@@ -1,6 +1,18 @@
 import re                                                                                                               # Use Regular Expressions to look for or fix specific string patterns
+from html.parser import HTMLParser                                                                                      # Read only the class rows, without building a tree
 from classes_and_functions import class_base_exceptions, department as crs                                              # Import classes and functions to be used
 
+try:
+    import lxml.html                                                                                                    # A much faster parser in C, if it is installed
+    HTML_PARSER = 'lxml'
+except ImportError:
+    lxml = None
+    HTML_PARSER = 'html.parser'
+
+WHITESPACE_PATTERN = re.compile(r'\s+')                                                                                 # Compiled once instead of for every cell
+NON_WORD_PATTERN = re.compile(r'\W')
+NO_COURSES_MESSAGE = "No courses matched your search criteria for this term."
+
 
 def scrape_classes(soup_obj):
     """
@@ -14,16 +26,105 @@ def scrape_classes(soup_obj):
     for divTag in soup_obj.find_all('div', style="color: red; font-weight: bold;"):
         if divTag.text == "\n\tNo courses matched your search criteria for this term.\n\n":
             raise class_base_exceptions.InvalidCourse
+    return scrape_rows([tdTag.text for tdTag in trTag.find_all('td')] for trTag in soup_obj.find_all('tr', valign='top'))
+
+
+def scrape_classes_from_html(html):
+    """
+    A faster version of 'scrape_classes' that starts from the html text. If lxml is installed the page is parsed by lxml alone (no BeautifulSoup
+    tree), else the text of the cells of the class rows is read while the page is tokenized (see ClassRowParser), no tree is built at all.
+    The courses are the same as the ones 'scrape_classes' makes.
+
+    :param html: A string that is the html of a results page of the UCI class search.
+    :return: A list containing all of the courses and their corresponding classes that were scraped.
+    :raises course_parse_exceptions.InvalidCourse: An exception that signals no classes were found for this term.
+    """
+
+    if NO_COURSES_MESSAGE in html:
+        raise class_base_exceptions.InvalidCourse
+    if lxml is not None:
+        document = lxml.html.document_fromstring(html)
+        return scrape_rows([tdTag.text_content() for tdTag in trTag.iter('td')] for trTag in document.iter('tr') if trTag.get('valign') == 'top')
+    row_parser = ClassRowParser()
+    row_parser.feed(html)
+    row_parser.close()
+    return scrape_rows(row_parser.rows)
+
+
+class ClassRowParser(HTMLParser):
+    """
+    Collects the text of the cells of the class rows (the rows that have the "valign='top'" attribute) while a page is tokenized, everything
+    else in the page is skipped. The text of a cell is the same as the 'text' of the cell in a BeautifulSoup tree.
+
+    Attributes:
+        rows (list): Every class row, as a list of the text of its cells.
+        cells (list): The cells of the row that is being read (lists of pieces of text), None outside of a class row.
+        cell (list): The pieces of text of the cell that is being read, None outside of a cell.
+    """
+
+    def __init__(self):
+        """
+        A constructor for a 'ClassRowParser' object.
+        """
+
+        super().__init__()
+        self.rows = []
+        self.cells = None
+        self.cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'tr':
+            self.end_row()                                                                                              # The end tag of a row can be left out
+            if ('valign', 'top') in attrs:
+                self.cells = []
+        elif tag == 'td' and self.cells is not None:
+            self.cell = []
+            self.cells.append(self.cell)
+
+    def handle_endtag(self, tag):
+        if tag == 'td':
+            self.cell = None
+        elif tag == 'tr' or tag == 'table':
+            self.end_row()
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.cell.append(data)
+
+    def end_row(self):
+        """
+        Keeps the class row that is being read, if there is one.
+
+        :return: Nothing
+        """
+
+        if self.cells is not None:
+            self.rows.append([''.join(cell) for cell in self.cells])
+        self.cells = self.cell = None
+
+    def close(self):
+        super().close()
+        self.end_row()
+
+
+def scrape_rows(rows):
+    """
+    Scrapes the rows of the class tables of a results page, the part of parsing that every parser shares.
+
+    :param rows: An iterable of rows (the rows that have the "valign='top'" attribute), every row is a list of the text of its cells.
+    :return: A list containing all of the courses and their corresponding classes that were scraped.
+    """
+
     type_of_class = section = class_code = units = instructor = days_and_time = place = final = None                    # Parameters of a "Class" object
     capacity = enrolled = wait_list = status = None
     courses = []                                                                                                        # Courses in the department i.e. ICS 6B or ICS 31
     current_course = None
     counter = 0
-    for trTag in soup_obj.find_all('tr', valign='top'):                                                                 # On the UCI class search page, records containing class data
-        for tdTag in trTag.find_all('td'):                                                                              # have the "valign='top'" attribute to it, so to scrape from
-            if len(tdTag.text) > 0:
-                piece_of_info = tdTag.text.lstrip().rstrip()
-                piece_of_info = re.sub(r'\s+', ' ', piece_of_info)
+    for cells in rows:                                                                                                  # On the UCI class search page, records containing class data
+        for text in cells:                                                                                              # have the "valign='top'" attribute to it, so to scrape from
+            if len(text) > 0:
+                piece_of_info = text.lstrip().rstrip()
+                piece_of_info = WHITESPACE_PATTERN.sub(' ', piece_of_info)
                 if (len(piece_of_info) != 5) and (counter == 0):                                                        # Check to see if this is a class code or course title
                     if current_course is not None:                                                                      # If the current_course is not None then that means it contains a course
                         courses.append(current_course)
@@ -91,7 +192,7 @@ def parse_day_and_time(days_and_time):
         fixed_days_and_time = ['TBA', 'TBA', 'TBA']
         return fixed_days_and_time
 
-    split_up_days_and_time = re.split('\W', days_and_time)                                                              # Use regular expressions to split the string and filter it
+    split_up_days_and_time = NON_WORD_PATTERN.split(days_and_time)                                                      # Use regular expressions to split the string and filter it
     almost_fixed_days_and_time = list(filter(None, split_up_days_and_time))                                             # Further filtering to remove "blank" strings, after this process it will be almost in the ideal
                                                                                                                         # list except that the hours and minutes are split up
     # Pad AM integers that are less than 10 with a "0" and add 12 hours to PM hours
@@ -1,41 +1,46 @@
-from selenium.webdriver.support.ui import Select        # Easy way to select options from menus on a website
-from bs4 import BeautifulSoup                           # Allows data to be extracted from websites
-from scrape import web_navigation                       # Provides user-defined functions to navigate the selenium webdriver
+import glob                                            # Argument files of a batch directory
+import os                                              # Paths of the argument files
 from classes_and_functions.class_base_exceptions import InvalidCourse         # Exceptions while parsing
 from classes_and_functions.class_base_exceptions import InvalidDepartment     # Exceptions while parsing
-from scrape.class_parser import scrape_classes          # Functions to scrape classes from UCI departments
 
+BACKENDS = ('selenium', 'http')                         # Names of the scraping backends that can be selected
 
-def get_classes(path_to_arguments=''):
+
+def get_backend(name='selenium', base_url=None, record=None, replay=None, include_full=False):
     """
-    A function that web-scrapes using BeautifulSoup and Selenium to collect data on specified classes. This function is passed a *.txt file
-    containing the classes to scrape for.
+    Makes a scraping backend, every backend has the functions get_term, get_department_options, fetch_department_html, fetch_class_codes_html
+    and close.
 
-    :param path_to_arguments: A string that is the path to the *.txt file containing information on which classes to scrape.
-    :return: The term (a string) and a list of departments (each department contains several courses and each course contains several classes)
+    :param name: A string that is the name of the backend, one of BACKENDS.
+    :param base_url: A string that is the URL of the WebSoc search page, default is the UCI class search.
+    :param record: A string that is the path of a snapshot directory to save the scraped pages to, default is not to save them.
+    :param replay: A string that is the path of a snapshot directory to read the pages from instead of scraping (name is then not used).
+    :param include_full: A boolean, True to also scrape classes that are full with a full wait list (a replay has the classes that were recorded).
+    :return: A SeleniumBackend, HttpBackend, RecordingBackend or ReplayBackend object.
     """
 
-    # Class Search URL
-    class_search_url = "https://www.reg.uci.edu/perl/WebSoc/"
+    if replay is not None:
+        from scrape.snapshot import ReplayBackend                                       # Late imports, Selenium is only needed by its own backend
+        backend = ReplayBackend(replay)
+    elif name == 'http':
+        from scrape.websoc_client import HttpBackend
+        backend = HttpBackend(include_full=include_full) if base_url is None else HttpBackend(base_url, include_full=include_full)
+    else:
+        from scrape.web_navigation import SeleniumBackend
+        backend = SeleniumBackend(include_full=include_full) if base_url is None else SeleniumBackend(base_url, include_full)
+    if record is not None:
+        from scrape.snapshot import RecordingBackend
+        backend = RecordingBackend(backend, record)
+    return backend
 
-    driver = web_navigation.open_web_driver()                                           # Create an instance of a Chrome WebDriver
-    driver.get(class_search_url)                                                        # Open the class schedule
 
-    # Scrape the term name
-    select = Select(driver.find_element_by_name("YearTerm"))
-    term = " ".join(select.first_selected_option.text.split())
+def read_arguments(path_to_arguments=''):
+    """
+    Reads which courses to scrape from a *.txt file (see help/format_of_argument_file.txt), or asks for them if the file does not exist.
 
-    # Scrape the Department options into a dictionary for later use (validation)
-    select = web_navigation.select_department_menu(driver)
-    department_options = {}
-    options = select.options
-    for option in options:
-        department_line = option.text.split('.')
-        department_name = department_line[len(department_line) - 1].rstrip().lstrip()
-        department_code = department_line[0].rstrip().lstrip()
-        if department_name != "Include All Departments":                                # Don't add the first line to the dictionary (it's useless)
-            department_options[department_code] = department_name
-    select = None
+    :param path_to_arguments: A string that is the path to the *.txt file.
+    :return: A list of department codes and a list of the course numbers (strings) of every department.
+    """
 
     departments = None      # List of departments to loop through
     courses = []            # List of courses per department
@@ -45,6 +50,7 @@ def get_classes(path_to_arguments=''):
         input_arguments = []
         for line in input_file.readlines():
             input_arguments.append(line)
+        input_file.close()
         departments = str(input_arguments[0]).strip('\n')                               # List of departments will always be the first line in the *.txt file
         departments = departments.split(",")
         for i in range(1, len(input_arguments)):                                        # Each line following contains courses per department
@@ -57,44 +63,212 @@ def get_classes(path_to_arguments=''):
             courses_input = input(
                 "Enter in the course names for " + each_department + " (in the form of \"C1,C2,etc.\", e.g. If DEPT is I&C SCI then enter in \"6B, 31\" *spaces*):\n")
             courses.append(courses_input)
+    return departments, courses
+
+
+def get_classes(path_to_arguments='', backend=None, concurrency=4, timeout=30, retries=3, cache=None, force_refresh=False):
+    """
+    A function that web-scrapes using BeautifulSoup and a scraping backend to collect data on specified classes. This function is passed a *.txt file
+    containing the classes to scrape for. The departments are fetched concurrently (if the backend allows it), but are returned in the same order.
+    With a cache, only the departments that are not cached (or have expired) are scraped.
+
+    :param path_to_arguments: A string that is the path to the *.txt file containing information on which classes to scrape.
+    :param backend: A scraping backend (see get_backend), default is a new Selenium backend. It is closed when scraping is done.
+    :param concurrency: An integer that is the largest number of departments fetched at the same time.
+    :param timeout: A number of seconds to wait for the page of one department.
+    :param retries: An integer that is the number of times a failed department is fetched again.
+    :param cache: A CatalogCache object (see catalog_cache), default is to always scrape.
+    :param force_refresh: A boolean, True to scrape everything again and replace what is in the cache.
+    :return: The term (a string) and a list of departments (each department contains several courses and each course contains several classes)
+    """
+
+    if backend is None:
+        backend = get_backend()
+    try:
+        term = get_cached_metadata(cache, force_refresh, 'term', backend.get_term)      # Scrape the term name
+        department_options = get_cached_metadata(cache, force_refresh, 'department_options',   # Scrape the Department options into a dictionary for later use (validation)
+                                                 backend.get_department_options)
+        departments, courses = read_arguments(path_to_arguments)
 
-    # Change option to only include courses if there is some space
-    capacity_menu = driver.find_element_by_name("FullCourses")
-    select = Select(capacity_menu)
-    select.select_by_value("SkipFullWaitlist")                                          # Select option to show classes that are full if there is room on the wait list
-    #select.select_by_value("FullOnly")
-    select = None
-
-    # good_html = css_soup_for_a_department.prettify()
-    # print(good_html)
-
-    all_courses = []                                                                    # Keep track of all courses while web-scraping the data
-    i = 0                                                                               # Keep track of which courses are with which department
-
-    for department in departments:
-        try:
-            if department in department_options:                                        # Validation of user-input (file or manually entered)
-                select = web_navigation.select_department_menu(driver)
-                select.select_by_value(department)
-                course_number_box = driver.find_element_by_css_selector("input[name=CourseNum]")
-                course_number_box.clear()                                               # Make sure that the text box is clear before entering new courses
-                course_number_box.send_keys(courses[i])
-                web_navigation.display_web_results(driver)
-                bad_html = driver.page_source
-                css_soup_for_a_department = BeautifulSoup(bad_html, 'html.parser')
-                all_courses.append(scrape_classes(css_soup_for_a_department))           # Call the "scrape_classes" function to scrape data on the classes then append it to the "master list"
-                driver.back()
-                i += 1                                                                  # Make sure that the correct course is with the correct department
-            else:
-                raise InvalidDepartment                                                 # Raise an exception to let user know what went wrong if department does not exist (thanks to dictionary)
-        except InvalidDepartment:
-            print(
-                "Invalid department entered: \"" + department + "\", program terminating, refer to the \"departments.txt\" and enter in the correct department code.")
-            break
-        except InvalidCourse:
-            print(
-                "Invalid course number entered or is full/unavailable for the \"" + department + "\" department, program terminating, refer to the UCI website and search for the correct course numbers and availability.")
-            break
-
-    driver.close()
+        queries = []
+        for i, department in enumerate(departments):
+            try:
+                if department in department_options:                                  # Validation of user-input (file or manually entered)
+                    queries.append((department, courses[i]))
+                else:
+                    raise InvalidDepartment                                             # Raise an exception to let user know what went wrong if department does not exist (thanks to dictionary)
+            except InvalidDepartment:
+                print(
+                    "Invalid department entered: \"" + department + "\", program terminating, refer to the \"departments.txt\" and enter in the correct department code.")
+                break
+
+        results = fetch_queries(backend, term, queries, concurrency, timeout, retries, cache, force_refresh)
+
+        all_courses = []                                                                # Keep track of all courses while web-scraping the data
+        for (department, course_numbers), courses_of_department in zip(queries, results):
+            try:
+                if isinstance(courses_of_department, Exception):                        # The page of the department could not be parsed
+                    raise courses_of_department
+                all_courses.append(courses_of_department)                               # Departments stay in the same order as they were entered
+            except InvalidCourse:
+                print(
+                    "Invalid course number entered or is full/unavailable for the \"" + department + "\" department, program terminating, refer to the UCI website and search for the correct course numbers and availability.")
+                break
+    finally:
+        backend.close()
     return term, all_courses
+
+
+def fetch_queries(backend, term, queries, concurrency=4, timeout=30, retries=3, cache=None, force_refresh=False):
+    """
+    Scrapes the courses of several departments, the departments that are in the cache are not scraped again.
+
+    :param backend: A scraping backend (see get_backend), it is not closed.
+    :param term: A string that is the term, the key of the cached courses.
+    :param queries: A list of (department code, course numbers) tuples.
+    :param concurrency: An integer that is the largest number of departments fetched at the same time.
+    :param timeout: A number of seconds to wait for the page of one department.
+    :param retries: An integer that is the number of times a failed department is fetched again.
+    :param cache: A CatalogCache object (see catalog_cache), default is to always scrape.
+    :param force_refresh: A boolean, True to scrape everything again and replace what is in the cache.
+    :return: A list with one entry per query, in the same order as the queries, either a list of Course objects or the exception raised while
+     parsing the page (e.g. InvalidCourse).
+    """
+
+    results = [None] * len(queries)
+    if cache is not None and not force_refresh:
+        results = [cache.get_courses(term, department, course_numbers) for department, course_numbers in queries]
+    missing = [index for index, result in enumerate(results) if result is None]
+    if len(missing) > 0:
+        from scrape.fetch_pipeline import fetch_departments                             # Late import, asyncio and the parsers are only loaded when something is scraped
+        fetched = fetch_departments(backend, [queries[index] for index in missing], concurrency, timeout, retries)
+        for index, courses_of_department in zip(missing, fetched):
+            results[index] = courses_of_department
+            if cache is not None and not isinstance(courses_of_department, Exception):
+                cache.put_courses(term, queries[index][0], queries[index][1], courses_of_department)
+    return results
+
+
+def read_batch(path):
+    """
+    Finds the argument files of a batch, either every *.txt file of a directory or the files listed in a manifest (one path per line, relative
+    to the manifest).
+
+    :param path: A string that is the path of a directory or of a manifest file.
+    :return: A list of strings that are the paths of the argument files.
+    """
+
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, '*.txt')))
+    with open(path) as manifest:
+        return [os.path.join(os.path.dirname(path), line.strip()) for line in manifest if line.strip() != '' and not line.startswith('#')]
+
+
+def split_course_numbers(course_numbers):
+    """
+    Splits course numbers as typed in the search form, e.g. "51, 139w" is ['51', '139W'].
+
+    :param course_numbers: A string of course numbers separated by commas.
+    :return: A list of upper case course numbers.
+    """
+
+    return [number.strip().upper() for number in course_numbers.split(',') if number.strip() != '']
+
+
+def get_course_number(course, department):
+    """
+    Reads the course number from the name of a course, e.g. "I&C SCI 139W CRITICAL WRITING" of "I&C SCI" is "139W".
+
+    :param course: A Course object.
+    :param department: A string that is the department code.
+    :return: A string that is the upper case course number, None if the name does not start with the department code.
+    """
+
+    name = course.get_name_of_course().strip()
+    if not name.upper().startswith(department.upper()) or len(name[len(department):].split()) == 0:
+        return None
+    return name[len(department):].split()[0].upper()
+
+
+def get_batch_classes(paths_to_arguments, backend=None, concurrency=4, timeout=30, retries=3, cache=None, force_refresh=False):
+    """
+    Scrapes the courses of many argument files at once. Every department is scraped only once, for the union of the course numbers that the
+    argument files ask for, and every argument file then gets its own courses out of that shared catalog.
+
+    :param paths_to_arguments: A list of strings that are the paths to the *.txt files (see help/format_of_argument_file.txt).
+    :param backend: A scraping backend (see get_backend), default is a new Selenium backend. It is closed when scraping is done.
+    :param concurrency: An integer that is the largest number of departments fetched at the same time.
+    :param timeout: A number of seconds to wait for the page of one department.
+    :param retries: An integer that is the number of times a failed department is fetched again.
+    :param cache: A CatalogCache object (see catalog_cache), default is to always scrape.
+    :param force_refresh: A boolean, True to scrape everything again and replace what is in the cache.
+    :return: The term (a string) and a list with a (path, departments, error) tuple per argument file. The departments are lists of Course
+     objects in the order of the argument file, the error is None or a string that tells why the argument file can not be solved.
+    """
+
+    if backend is None:
+        backend = get_backend()
+    try:
+        term = get_cached_metadata(cache, force_refresh, 'term', backend.get_term)
+        department_options = get_cached_metadata(cache, force_refresh, 'department_options', backend.get_department_options)
+
+        requests = []
+        wanted_course_numbers = {}                                                      # Union of the course numbers of every department
+        for path in paths_to_arguments:
+            if not os.path.isfile(path):
+                requests.append((path, None, "Argument file not found."))
+                continue
+            departments, courses = read_arguments(path)
+            wanted = [(department, split_course_numbers(courses[i]) if i < len(courses) else []) for i, department in enumerate(departments)]
+            requests.append((path, wanted, None))
+            for department, course_numbers in wanted:
+                if department in department_options:
+                    wanted_course_numbers.setdefault(department, set()).update(course_numbers)
+
+        queries = [(department, ', '.join(sorted(course_numbers))) for department, course_numbers in wanted_course_numbers.items()]
+        results = dict(zip(wanted_course_numbers, fetch_queries(backend, term, queries, concurrency, timeout, retries, cache, force_refresh)))
+    finally:
+        backend.close()
+
+    batch = []
+    for path, wanted, error in requests:
+        departments = []
+        for department, course_numbers in wanted or []:
+            if department not in department_options:
+                error = "Invalid department entered: \"" + department + "\"."
+                break
+            if isinstance(results[department], Exception):
+                error = "Invalid course number entered or is full/unavailable for the \"" + department + "\" department."
+                break
+            courses = {get_course_number(course, department): course for course in results[department]}
+            missing = [number for number in course_numbers if number not in courses]
+            if len(course_numbers) == 0:
+                error = "No course numbers entered for the \"" + department + "\" department."
+                break
+            if len(missing) > 0:
+                error = "Invalid course number entered or is full/unavailable for the \"" + department + "\" department: " + ", ".join(missing) + "."
+                break
+            departments.append([courses[number] for number in course_numbers])
+        batch.append((path, departments if error is None else None, error))
+    return term, batch
+
+
+def get_cached_metadata(cache, force_refresh, key, scrape):
+    """
+    Looks up a value in the cache, or scrapes and caches it.
+
+    :param cache: A CatalogCache object, or None to always scrape.
+    :param force_refresh: A boolean, True to scrape even if the value is cached.
+    :param key: A string that is the name of the value in the cache.
+    :param scrape: A function without parameters that scrapes the value.
+    :return: The value.
+    """
+
+    value = None
+    if cache is not None and not force_refresh:
+        value = cache.get_metadata(key)
+    if value is None:
+        value = scrape()
+        if cache is not None:
+            cache.put_metadata(key, value)
+    return value
@@ -0,0 +1,137 @@
+import asyncio                                            # Run the department queries concurrently
+import concurrent.futures                                 # Blocking fetches in threads, parsing in worker processes
+import http.client                                        # Errors of a dropped HTTP connection
+import threading                                          # Several threads can fetch at once (e.g. the schedule service)
+from concurrent.futures.process import BrokenProcessPool  # A worker process died, the pool can not be used anymore
+from scrape.class_parser import scrape_classes_from_html  # Functions to scrape classes from UCI departments
+
+PROCESS_PARSE_MINIMUM = 4                                 # Fewer pages are parsed in the fetch threads, starting processes costs more
+_parse_executors = {}                                     # Worker processes that parse pages (per number of workers), kept for every later fetch
+_parse_executors_lock = threading.Lock()
+
+
+def fetch_departments(backend, queries, concurrency=4, timeout=30, retries=3, backoff=0.5, parse_workers=None, fetch=None):
+    """
+    Fetches and parses the classes of several departments at once. At most 'concurrency' queries are sent at the same time, a query that times
+    out or fails is sent again after a growing wait, and the pages are parsed in worker processes while other queries are still in flight. The
+    worker processes are started once and kept for later calls (e.g. every refresh of watch mode), and a few pages are parsed in the fetch
+    threads instead.
+
+    :param backend: A scraping backend (see class_scraper.get_backend), backends that are not thread safe are queried one at a time.
+    :param queries: A list of (department code, course numbers) tuples.
+    :param concurrency: An integer that is the largest number of queries in flight.
+    :param timeout: A number of seconds to wait for one query.
+    :param retries: An integer that is the number of times a failed query is sent again.
+    :param backoff: A number of seconds to wait before the first retry, the wait doubles with every retry.
+    :param parse_workers: An integer that is the number of worker processes to parse pages with (if there are at least PROCESS_PARSE_MINIMUM
+     queries), default is the number of cores.
+    :param fetch: A function of the backend that fetches one page, called with the values of a query, default is backend.fetch_department_html
+     (e.g. backend.fetch_class_codes_html with queries of one string of class codes each).
+    :return: A list with one entry per query, in the same order as the queries, either a list of Course objects or the exception raised while
+     parsing the page (e.g. InvalidCourse).
+    :raises ConnectionError: If a query still failed after every retry.
+    """
+
+    if not getattr(backend, 'thread_safe', False):
+        concurrency = 1
+    if fetch is None:
+        fetch = backend.fetch_department_html
+    loop = asyncio.new_event_loop()                                                                 # Not asyncio.run, so that Python 3.6 works too
+    fetch_executor = concurrent.futures.ThreadPoolExecutor(max_workers=concurrency)                 # Threads are cheap, a hung fetch only holds one of this call
+    parse_executor = get_parse_executor(parse_workers) if len(queries) >= PROCESS_PARSE_MINIMUM else fetch_executor
+    try:
+        return loop.run_until_complete(_fetch_all(loop, fetch, queries, concurrency, timeout, retries, backoff,
+                                                  fetch_executor, parse_executor))
+    finally:
+        fetch_executor.shutdown(wait=False)
+        loop.close()
+
+
+def get_parse_executor(parse_workers=None):
+    """
+    The worker processes that parse pages, they are started the first time that they are needed and kept for every later call.
+
+    :param parse_workers: An integer that is the number of worker processes, default is the number of cores.
+    :return: A ProcessPoolExecutor object.
+    """
+
+    with _parse_executors_lock:
+        if parse_workers not in _parse_executors:
+            _parse_executors[parse_workers] = concurrent.futures.ProcessPoolExecutor(max_workers=parse_workers)
+        return _parse_executors[parse_workers]
+
+
+def discard_parse_executor(parse_executor):
+    """
+    Forgets worker processes that can not be used anymore (a worker died), the next call starts new ones.
+
+    :param parse_executor: A ProcessPoolExecutor object made by get_parse_executor.
+    :return: Nothing
+    """
+
+    with _parse_executors_lock:
+        for parse_workers, executor in list(_parse_executors.items()):
+            if executor is parse_executor:
+                del _parse_executors[parse_workers]
+    parse_executor.shutdown(wait=False)
+
+
+async def _fetch_all(loop, fetch, queries, concurrency, timeout, retries, backoff, fetch_executor, parse_executor):
+    """
+    The coroutine of 'fetch_departments', the results of 'asyncio.gather' keep the order of the queries. If a query fails for good, the other
+    queries are cancelled (fetches and parse jobs that did not start yet are dropped) and awaited before the error is raised, so that no task is
+    left pending when the loop is closed.
+
+    :return: A list with one entry per query, a list of Course objects or the exception raised while parsing the page.
+    """
+
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [loop.create_task(_fetch_and_parse(loop, semaphore, fetch, query, timeout, retries, backoff, fetch_executor, parse_executor))
+             for query in queries]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()                                                                           # Does nothing to the tasks that are done
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _fetch_and_parse(loop, semaphore, fetch, query, timeout, retries, backoff, fetch_executor, parse_executor):
+    """
+    Fetches one page (with retries) and parses it, the first value of the query (e.g. the department) names it in errors.
+
+    :return: A list of Course objects, or the exception raised while parsing the page.
+    :raises ConnectionError: If the query still failed after every retry.
+    """
+
+    attempt = 0
+    while True:
+        async with semaphore:                                                                       # The wait between retries does not hold a slot
+            try:
+                html = await asyncio.wait_for(loop.run_in_executor(fetch_executor, fetch, *query), timeout)
+                break
+            except (asyncio.TimeoutError, OSError, http.client.HTTPException) as error:           # ConnectionError is an OSError
+                if attempt >= retries:
+                    raise ConnectionError("Unable to fetch \"" + query[0] + "\" after " + str(attempt + 1) + " tries: " + repr(error))
+        await asyncio.sleep(backoff * 2 ** attempt)
+        attempt += 1
+    try:
+        try:
+            return await loop.run_in_executor(parse_executor, parse_department_html, html)
+        except BrokenProcessPool:                                                                   # Parse this page in a thread, later calls get new processes
+            discard_parse_executor(parse_executor)
+            return await loop.run_in_executor(fetch_executor, parse_department_html, html)
+    except Exception as error:                                                                      # Handed back so that the caller can stop at the right department
+        return error
+
+
+def parse_department_html(html):
+    """
+    Parses the results page of one department (run in a worker process).
+
+    :param html: A string that is the html of the results page.
+    :return: A list of Course objects.
+    :raises InvalidCourse: If no classes were found.
+    """
+
+    return scrape_classes_from_html(html)
@@ -0,0 +1,272 @@
+import json                                            # Term, department options and the index of the pages
+import os                                              # Snapshot directory
+import re                                              # Safe file names
+import threading                                       # Pages may be recorded from several threads
+from classes_and_functions.class_base_exceptions import SnapshotNotFound  # A page was not recorded
+from scrape.catalog_cache import normalize_course_numbers                 # The same course numbers typed differently are one page
+
+METADATA_FILE = 'metadata.json'                        # The term and the department options
+INDEX_FILE = 'pages.json'                              # Which file holds the page of every query
+PAGES_DIRECTORY = 'pages'                              # The recorded results pages (*.html)
+CLASS_CODES_QUERY = 'CourseCodes'                      # Stands in for the department in the keys of searches for class codes
+
+
+class RecordingBackend:
+    """
+    A scraping backend that wraps another backend and saves everything that it scrapes to a snapshot directory, so that the run can be
+    replayed later with ReplayBackend (no browser or network needed).
+
+    Attributes:
+        backend (object): The backend that really scrapes (see class_scraper.get_backend).
+        directory (string): The snapshot directory.
+        metadata (dictionary): The term and the department options that were scraped.
+        index (dictionary): The file names of the recorded pages [dictionary of "department|course numbers" keys].
+        thread_safe (boolean): The same as the wrapped backend.
+        lock (Lock): Keeps the index consistent while pages are recorded from several threads.
+    """
+
+    def __init__(self, backend, directory):
+        """
+        A constructor for a 'RecordingBackend' object, pages that are already in the directory are kept.
+
+        :param backend: The backend that really scrapes.
+        :param directory: A string that is the path of the snapshot directory, it is made if it does not exist.
+        """
+
+        self.backend = backend
+        self.directory = directory
+        self.thread_safe = getattr(backend, 'thread_safe', False)
+        self.lock = threading.Lock()
+        os.makedirs(os.path.join(directory, PAGES_DIRECTORY), exist_ok=True)
+        self.metadata = read_json(os.path.join(directory, METADATA_FILE))
+        self.index = read_json(os.path.join(directory, INDEX_FILE))
+
+    def get_term(self):
+        """
+        Scrapes and records the term.
+
+        :return: A string that is the name of the term.
+        """
+
+        self.metadata['term'] = self.backend.get_term()
+        write_json(os.path.join(self.directory, METADATA_FILE), self.metadata)
+        return self.metadata['term']
+
+    def get_department_options(self):
+        """
+        Scrapes and records the departments that can be searched.
+
+        :return: A dictionary of department codes (keys) and department names (values).
+        """
+
+        self.metadata['department_options'] = self.backend.get_department_options()
+        write_json(os.path.join(self.directory, METADATA_FILE), self.metadata)
+        return self.metadata['department_options']
+
+    def fetch_department_html(self, department, course_numbers):
+        """
+        Scrapes and records the results page of one department.
+
+        :param department: A string that is the department code.
+        :param course_numbers: A string of course numbers as typed in the search form.
+        :return: A string that is the html of the results page.
+        """
+
+        html = self.backend.fetch_department_html(department, course_numbers)
+        self.record_page(department, course_numbers, html)
+        return html
+
+    def fetch_class_codes_html(self, class_codes):
+        """
+        Scrapes and records the results page of a list of class codes.
+
+        :param class_codes: A string of class codes separated by commas.
+        :return: A string that is the html of the results page.
+        """
+
+        html = self.backend.fetch_class_codes_html(class_codes)
+        self.record_page(CLASS_CODES_QUERY, class_codes, html)
+        return html
+
+    def record_page(self, department, course_numbers, html):
+        """
+        Saves a results page and adds it to the index.
+
+        :param department: A string that is the department code (CLASS_CODES_QUERY for a search for class codes).
+        :param course_numbers: A string of course numbers (or class codes) as typed in the search form.
+        :param html: A string that is the html of the results page.
+        :return: Nothing
+        """
+
+        key = get_page_key(department, course_numbers)
+        with self.lock:
+            file_name = self.index.get(key)
+            if file_name is None:
+                file_name = get_file_name(department, course_numbers, self.index.values())
+                self.index[key] = file_name
+            with open(os.path.join(self.directory, PAGES_DIRECTORY, file_name), 'w', encoding='utf-8') as file:
+                file.write(html)
+            write_json(os.path.join(self.directory, INDEX_FILE), self.index)
+
+    def close(self):
+        """
+        Closes the wrapped backend.
+
+        :return: Nothing
+        """
+
+        self.backend.close()
+
+
+class ReplayBackend:
+    """
+    A scraping backend that serves the pages of a snapshot directory made by RecordingBackend, it never opens a browser or the network.
+
+    Attributes:
+        directory (string): The snapshot directory.
+        metadata (dictionary): The recorded term and department options.
+        index (dictionary): The file names of the recorded pages [dictionary of "department|course numbers" keys].
+        thread_safe (boolean): True, the pages are only read.
+    """
+
+    thread_safe = True
+
+    def __init__(self, directory):
+        """
+        A constructor for a 'ReplayBackend' object.
+
+        :param directory: A string that is the path of the snapshot directory.
+        :raises SnapshotNotFound: If the directory is not a snapshot.
+        """
+
+        if not os.path.isfile(os.path.join(directory, METADATA_FILE)):
+            raise SnapshotNotFound("No snapshot in \"" + directory + "\", record one with --record.")
+        self.directory = directory
+        self.metadata = read_json(os.path.join(directory, METADATA_FILE))
+        self.index = read_json(os.path.join(directory, INDEX_FILE))
+
+    def get_term(self):
+        """
+        Reads the recorded term.
+
+        :return: A string that is the recorded name of the term.
+        """
+
+        return self.metadata['term']
+
+    def get_department_options(self):
+        """
+        Reads the recorded departments that can be searched.
+
+        :return: A dictionary of the recorded department codes (keys) and department names (values).
+        """
+
+        return self.metadata['department_options']
+
+    def fetch_department_html(self, department, course_numbers):
+        """
+        Reads the recorded results page of one department.
+
+        :param department: A string that is the department code.
+        :param course_numbers: A string of course numbers as typed in the search form.
+        :return: A string that is the html of the results page.
+        :raises SnapshotNotFound: If the page was not recorded.
+        """
+
+        file_name = self.index.get(get_page_key(department, course_numbers))
+        if file_name is None:
+            raise SnapshotNotFound("\"" + department + "\" courses \"" + course_numbers + "\" were not recorded in \"" + self.directory + "\".")
+        return self.read_page(file_name)
+
+    def fetch_class_codes_html(self, class_codes):
+        """
+        Reads the recorded results page of a list of class codes.
+
+        :param class_codes: A string of class codes separated by commas.
+        :return: A string that is the html of the results page.
+        :raises SnapshotNotFound: If the page was not recorded.
+        """
+
+        file_name = self.index.get(get_page_key(CLASS_CODES_QUERY, class_codes))
+        if file_name is None:
+            raise SnapshotNotFound("Class codes \"" + class_codes + "\" were not recorded in \"" + self.directory + "\".")
+        return self.read_page(file_name)
+
+    def read_page(self, file_name):
+        """
+        Reads a recorded results page.
+
+        :param file_name: A string that is the file name of the page in the pages directory.
+        :return: A string that is the html of the results page.
+        """
+
+        with open(os.path.join(self.directory, PAGES_DIRECTORY, file_name), encoding='utf-8') as file:
+            return file.read()
+
+    def close(self):
+        """
+        Nothing to close.
+
+        :return: Nothing
+        """
+
+        pass
+
+
+def get_page_key(department, course_numbers):
+    """
+    Makes the key of a query in the index of a snapshot.
+
+    :param department: A string that is the department code.
+    :param course_numbers: A string of course numbers as typed in the search form.
+    :return: A string that is the key of the page in the index of a snapshot.
+    """
+
+    return department + '|' + normalize_course_numbers(course_numbers)
+
+
+def get_file_name(department, course_numbers, used_file_names):
+    """
+    Makes a readable file name for a page that is not already used, e.g. "I_C_SCI-139W_51.html".
+
+    :param department: A string that is the department code.
+    :param course_numbers: A string of course numbers as typed in the search form.
+    :param used_file_names: The file names that are already used.
+    :return: A string that is the file name.
+    """
+
+    stem = re.sub('[^A-Za-z0-9]+', '_', department) + '-' + re.sub('[^A-Za-z0-9]+', '_', normalize_course_numbers(course_numbers))
+    used_file_names = set(used_file_names)
+    file_name = stem + '.html'
+    number = 1
+    while file_name in used_file_names:
+        number += 1
+        file_name = stem + '-' + str(number) + '.html'
+    return file_name
+
+
+def read_json(path):
+    """
+    Reads a JSON file of a snapshot.
+
+    :param path: A string that is the path of a JSON file.
+    :return: The dictionary in the file, or an empty dictionary if the file does not exist.
+    """
+
+    if not os.path.isfile(path):
+        return {}
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def write_json(path, value):
+    """
+    Writes a JSON file of a snapshot.
+
+    :param path: A string that is the path of a JSON file.
+    :param value: A dictionary to write to the file.
+    :return: Nothing
+    """
+
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(value, file, indent=2, sort_keys=True)
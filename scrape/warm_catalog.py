@@ -0,0 +1,184 @@
+import threading                                                               # Requests and the background refresh share the catalog
+import time                                                                    # Time of the last refresh
+from classes_and_functions.class_base_exceptions import InvalidCourse          # Exceptions while parsing
+from classes_and_functions.class_base_exceptions import InvalidDepartment      # Exceptions while parsing
+from scrape.class_scraper import fetch_queries, get_course_number, split_course_numbers  # Scrape, and pick out courses by number
+
+
+class WarmCatalog:
+    """
+    The WarmCatalog class keeps the parsed courses of every department that has been asked for in memory, for a long running process (see
+    schedule_service). A course is only scraped the first time that it is asked for, and a background thread scrapes every known course again
+    now and then so that the seats stay fresh.
+
+    Attributes:
+        backend (object): A scraping backend (see class_scraper.get_backend), it stays open until the catalog is closed.
+        term (string): The term of the classes.
+        department_options (dictionary): The department codes (keys) and department names (values) that can be searched.
+        courses (dictionary): The Course objects of every department [dictionary of department codes and dictionaries of course numbers].
+        version (integer): A number that goes up every time the courses change (after a scrape or a refresh).
+        refreshed (float): The time (seconds since the epoch) of the last refresh.
+        concurrency (integer): The largest number of departments fetched at the same time.
+        timeout (float): The number of seconds to wait for the page of one department.
+        retries (integer): The number of times a failed department is fetched again.
+        lock (Lock): Guards 'courses' and 'version' while they are swapped.
+        fetch_lock (Lock): Only one scrape at a time, so that backends that are not thread safe can be used.
+        stop_refreshing (Event): Set to stop the background refresh.
+    """
+
+    def __init__(self, backend, concurrency=4, timeout=30, retries=3):
+        """
+        A constructor for a 'WarmCatalog' object, the term and the department options are scraped right away.
+
+        :param backend: A scraping backend (see class_scraper.get_backend).
+        :param concurrency: An integer that is the largest number of departments fetched at the same time.
+        :param timeout: A number of seconds to wait for the page of one department.
+        :param retries: An integer that is the number of times a failed department is fetched again.
+        """
+
+        self.backend = backend
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.term = backend.get_term()
+        self.department_options = backend.get_department_options()
+        self.courses = {}
+        self.version = 0
+        self.refreshed = time.time()
+        self.lock = threading.Lock()
+        self.fetch_lock = threading.Lock()
+        self.stop_refreshing = threading.Event()
+
+    def get_courses(self, departments, course_numbers):
+        """
+        Looks up the courses of a request, the courses that are not in memory yet are scraped first.
+
+        :param departments: A list of department codes, e.g. ["I&C SCI", "STATS"].
+        :param course_numbers: A list of strings of course numbers as typed in the search form, one per department, e.g. ["51, 139W", "67"].
+        :return: A list of departments (each department is a list of Course objects), in the order of the request.
+        :raises InvalidDepartment: If a department code can not be searched.
+        :raises InvalidCourse: If a course number was not found.
+        """
+
+        wanted = []
+        for i, department in enumerate(departments):
+            if department not in self.department_options:
+                raise InvalidDepartment("Invalid department entered: \"" + department + "\".")
+            numbers = split_course_numbers(course_numbers[i]) if i < len(course_numbers) else []
+            if len(numbers) == 0:
+                raise InvalidCourse("No course numbers entered for the \"" + department + "\" department.")
+            wanted.append((department, numbers))
+
+        missing = self.get_missing(wanted)
+        if len(missing) > 0:
+            self.load(missing)
+        courses = self.courses                                                 # The same courses for the whole request, even if a refresh swaps them
+        courses_per_department = []
+        for department, numbers in wanted:
+            not_found = [number for number in numbers if number not in courses.get(department, {})]
+            if len(not_found) > 0:
+                raise InvalidCourse("Invalid course number entered or is full/unavailable for the \"" + department + "\" department: "
+                                    + ", ".join(not_found) + ".")
+            courses_per_department.append([courses[department][number] for number in numbers])
+        return courses_per_department
+
+    def get_missing(self, wanted):
+        """
+        Finds the course numbers that are not in memory.
+
+        :param wanted: A list of (department code, list of course numbers) tuples.
+        :return: A list of (department code, list of course numbers) tuples, only the departments that miss a course.
+        """
+
+        missing = []
+        for department, numbers in wanted:
+            not_loaded = [number for number in numbers if number not in self.courses.get(department, {})]
+            if len(not_loaded) > 0:
+                missing.append((department, not_loaded))
+        return missing
+
+    def load(self, missing):
+        """
+        Scrapes courses that are not in memory yet and adds them to the catalog.
+
+        :param missing: A list of (department code, list of course numbers) tuples.
+        :return: Nothing
+        :raises ConnectionError: If a department still failed after every retry.
+        """
+
+        with self.fetch_lock:
+            missing = self.get_missing(missing)                                # Another request may have scraped them in the meantime
+            if len(missing) == 0:
+                return
+            queries = [(department, ', '.join(numbers)) for department, numbers in missing]
+            results = fetch_queries(self.backend, self.term, queries, self.concurrency, self.timeout, self.retries)
+            self.add_courses(missing, results, replace=False)
+
+    def refresh(self):
+        """
+        Scrapes every course in memory again (one search per department), so that the seats of the classes stay fresh.
+
+        :return: Nothing
+        :raises ConnectionError: If a department still failed after every retry.
+        """
+
+        with self.fetch_lock:
+            wanted = [(department, sorted(numbers)) for department, numbers in self.courses.items()]
+            queries = [(department, ', '.join(numbers)) for department, numbers in wanted]
+            results = fetch_queries(self.backend, self.term, queries, self.concurrency, self.timeout, self.retries)
+            self.add_courses(wanted, results, replace=True)
+            self.refreshed = time.time()
+
+    def add_courses(self, wanted, results, replace):
+        """
+        Swaps in a new dictionary of courses with the scraped courses added (requests that are being solved keep the old one).
+
+        :param wanted: A list of (department code, list of course numbers) tuples that were scraped.
+        :param results: A list with a list of Course objects (or the exception raised while parsing the page) per department.
+        :param replace: A boolean, True to replace the courses of the scraped departments, False to add to them.
+        :return: Nothing
+        """
+
+        with self.lock:
+            courses = dict(self.courses)
+            for (department, numbers), courses_of_department in zip(wanted, results):
+                if isinstance(courses_of_department, Exception):                  # e.g. InvalidCourse, none of the course numbers were found
+                    continue
+                found = {} if replace else dict(courses.get(department, {}))
+                for course in courses_of_department:
+                    number = get_course_number(course, department)
+                    if number is not None:
+                        found[number] = course
+                courses[department] = found
+            self.courses = courses
+            self.version += 1
+
+    def start_refreshing(self, interval=300):
+        """
+        Starts a background thread that refreshes the catalog every 'interval' seconds, a refresh that fails is reported and skipped.
+
+        :param interval: A number of seconds between refreshes.
+        :return: The Thread object.
+        """
+
+        def refresh_loop():
+            while not self.stop_refreshing.wait(interval):
+                try:
+                    self.refresh()
+                except ConnectionError as reason:
+                    print("Unable to refresh the catalog. " + str(reason))
+
+        thread = threading.Thread(target=refresh_loop, daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        """
+        Stops the background refresh and closes the backend.
+
+        :return: Nothing
+        """
+
+        self.stop_refreshing.set()
+        with self.fetch_lock:
+            self.backend.close()
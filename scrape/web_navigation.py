@@ -43,3 +43,120 @@ def display_web_results(driver):
     """
 
     driver.find_element_by_css_selector("input[value='Display Web Results']").click()
+
+
+class SeleniumBackend:
+    """
+    A scraping backend that fills in the WebSoc search form in a Chrome WebDriver. It offers the same functions as websoc_client.HttpBackend.
+
+    Attributes:
+        class_search_url (string): The URL of the WebSoc search page.
+        driver (WebDriver): The Chrome WebDriver that has the search page open, None until it is first needed.
+        include_full (boolean): True to also scrape classes that are full with a full wait list (e.g. to see them open up).
+        thread_safe (boolean): False, the browser can only show one search at a time.
+    """
+
+    thread_safe = False
+
+    def __init__(self, class_search_url="https://www.reg.uci.edu/perl/WebSoc/", include_full=False):
+        """
+        A constructor for a 'SeleniumBackend' object, Chrome is only started once a page is needed (e.g. not if every query is cached).
+
+        :param class_search_url: A string that is the URL of the WebSoc search page.
+        :param include_full: A boolean, True to also scrape classes that are full with a full wait list.
+        """
+
+        self.class_search_url = class_search_url
+        self.include_full = include_full
+        self.driver = None
+
+    def get_driver(self):
+        """
+        Opens the search page in a new Chrome WebDriver the first time that it is needed.
+
+        :return: A WebDriver that has the search page open.
+        """
+
+        if self.driver is None:
+            self.driver = open_web_driver()                                              # Create an instance of a Chrome WebDriver
+            self.driver.get(self.class_search_url)                                       # Open the class schedule
+        return self.driver
+
+    def get_term(self):
+        """
+        Scrapes the term that is selected on the search page.
+
+        :return: A string that is the name of the term.
+        """
+
+        select = Select(self.get_driver().find_element_by_name("YearTerm"))
+        return " ".join(select.first_selected_option.text.split())
+
+    def get_department_options(self):
+        """
+        Scrapes the departments that can be searched.
+
+        :return: A dictionary of department codes (keys) and department names (values).
+        """
+
+        department_options = {}
+        for option in select_department_menu(self.get_driver()).options:
+            department_line = option.text.split('.')
+            department_name = department_line[len(department_line) - 1].rstrip().lstrip()
+            department_code = department_line[0].rstrip().lstrip()
+            if department_name != "Include All Departments":                            # Don't add the first line to the dictionary (it's useless)
+                department_options[department_code] = department_name
+        return department_options
+
+    def fetch_department_html(self, department, course_numbers):
+        """
+        Fills in the search form for courses of one department and displays the results.
+
+        :param department: A string that is the department code, e.g. "I&C SCI".
+        :param course_numbers: A string of course numbers as typed in the search form, e.g. "51, 139W".
+        :return: A string that is the html of the results page.
+        """
+
+        driver = self.get_driver()
+        select = Select(driver.find_element_by_name("FullCourses"))
+        select.select_by_value("ANY" if self.include_full else "SkipFullWaitlist")      # Show classes that are full if there is room on the wait list
+        select_department_menu(driver).select_by_value(department)
+        course_number_box = driver.find_element_by_css_selector("input[name=CourseNum]")
+        course_number_box.clear()                                                       # Make sure that the text box is clear before entering new courses
+        course_number_box.send_keys(course_numbers)
+        driver.find_element_by_css_selector("input[name=CourseCodes]").clear()          # Left over from a search for class codes
+        display_web_results(driver)
+        html = driver.page_source
+        driver.back()
+        return html
+
+    def fetch_class_codes_html(self, class_codes):
+        """
+        Fills in the search form for a list of class codes and displays the results. Full classes are shown as well, so that classes can be seen
+        filling up and opening again.
+
+        :param class_codes: A string of class codes separated by commas, e.g. "35600,35602".
+        :return: A string that is the html of the results page.
+        """
+
+        driver = self.get_driver()
+        Select(driver.find_element_by_name("FullCourses")).select_by_value("ANY")
+        select_department_menu(driver).select_by_value(" ALL")                          # The value of "Include All Departments"
+        driver.find_element_by_css_selector("input[name=CourseNum]").clear()
+        class_code_box = driver.find_element_by_css_selector("input[name=CourseCodes]")
+        class_code_box.clear()
+        class_code_box.send_keys(class_codes)
+        display_web_results(driver)
+        html = driver.page_source
+        driver.back()
+        return html
+
+    def close(self):
+        """
+        Closes the Chrome WebDriver.
+
+        :return: Nothing
+        """
+
+        if self.driver is not None:
+            self.driver.close()
@@ -0,0 +1,240 @@
+import http.client                                     # Plain HTTP(S) connections that can be kept alive
+import queue                                           # Pool of idle connections
+from urllib.parse import urlencode, urlsplit           # Build the WebSoc query and split up the base URL
+
+WEBSOC_URL = "https://www.reg.uci.edu/perl/WebSoc/"    # Class Search URL
+
+
+class ConnectionPool:
+    """
+    A small pool of keep-alive connections to one host, so that every query does not pay for a new TCP/TLS handshake.
+
+    Attributes:
+        scheme (string): 'http' or 'https'.
+        host (string): The host (and port) of the server.
+        timeout (float): The number of seconds to wait for the server.
+        idle_connections (LifoQueue): The connections that are not in use (the last used connection is the most likely to still be open).
+    """
+
+    def __init__(self, scheme, host, size=4, timeout=30):
+        """
+        A constructor for a 'ConnectionPool' object, connections are only made when they are needed.
+
+        :param scheme: A string, 'http' or 'https'.
+        :param host: A string that is the host (and port) of the server, e.g. "www.reg.uci.edu".
+        :param size: An integer that is the largest number of idle connections to keep.
+        :param timeout: A number of seconds to wait for the server.
+        """
+
+        self.scheme = scheme
+        self.host = host
+        self.timeout = timeout
+        self.idle_connections = queue.LifoQueue(size)
+
+    def new_connection(self):
+        """
+        Opens a new connection to the host.
+
+        :return: An HTTPConnection or HTTPSConnection object.
+        """
+
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, timeout=self.timeout)
+
+    def request(self, method, path, body=None, headers=None):
+        """
+        Sends a request over an idle connection (or a new one) and reads the whole response. A connection that the server closed while it was
+        idle is replaced once.
+
+        :param method: A string, e.g. 'GET' or 'POST'.
+        :param path: A string that is the path (and query) of the request.
+        :param body: A string that is the body of the request, if any.
+        :param headers: A dictionary of headers of the request.
+        :return: The status code (an integer) and body (bytes) of the response.
+        """
+
+        try:
+            connection = self.idle_connections.get_nowait()
+            reused = True
+        except queue.Empty:
+            connection = self.new_connection()
+            reused = False
+        try:
+            response, data = send_request(connection, method, path, body, headers)
+        except (http.client.RemoteDisconnected, http.client.CannotSendRequest, ConnectionResetError, BrokenPipeError):
+            if not reused:
+                raise
+            connection = self.new_connection()                                                  # The server dropped the idle connection, try once more
+            response, data = send_request(connection, method, path, body, headers)
+        if response.will_close:
+            connection.close()
+        else:
+            try:
+                self.idle_connections.put_nowait(connection)
+            except queue.Full:
+                connection.close()
+        return response.status, data
+
+    def close(self):
+        """
+        Closes every idle connection.
+
+        :return: Nothing
+        """
+
+        try:
+            while True:
+                self.idle_connections.get_nowait().close()
+        except queue.Empty:
+            pass
+
+
+def send_request(connection, method, path, body, headers):
+    """
+    Sends a request over a connection and reads the whole response, the connection is closed if that fails.
+
+    :param connection: An HTTPConnection or HTTPSConnection object.
+    :param method: A string, e.g. 'GET' or 'POST'.
+    :param path: A string that is the path (and query) of the request.
+    :param body: A string that is the body of the request, if any.
+    :param headers: A dictionary of headers of the request.
+    :return: The HTTPResponse object and its body (bytes).
+    """
+
+    try:
+        connection.request(method, path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        return response, response.read()
+    except Exception:
+        connection.close()
+        raise
+
+
+class HttpBackend:
+    """
+    A scraping backend that sends the WebSoc search form straight over HTTP, no browser is needed. It offers the same functions as
+    web_navigation.SeleniumBackend.
+
+    Attributes:
+        base_url (string): The URL of the WebSoc search page.
+        path (string): The path of the WebSoc search page.
+        pool (ConnectionPool): The keep-alive connections to the WebSoc server.
+        search_form (BeautifulSoup): The search page, it is read once for the term and department options.
+        year_term (string): The value of the selected term of the search form, it is sent with every query.
+        include_full (boolean): True to also scrape classes that are full with a full wait list (e.g. to see them open up).
+        thread_safe (boolean): True, departments can be fetched from several threads at once (every thread gets its own connection).
+    """
+
+    thread_safe = True
+
+    def __init__(self, base_url=WEBSOC_URL, pool_size=4, timeout=30, include_full=False):
+        """
+        A constructor for a 'HttpBackend' object.
+
+        :param base_url: A string that is the URL of the WebSoc search page, e.g. the URL of a local server that serves recorded pages.
+        :param pool_size: An integer that is the largest number of idle connections to keep.
+        :param timeout: A number of seconds to wait for the server.
+        :param include_full: A boolean, True to also scrape classes that are full with a full wait list.
+        """
+
+        parts = urlsplit(base_url)
+        self.base_url = base_url
+        self.path = parts.path or '/'
+        self.pool = ConnectionPool(parts.scheme, parts.netloc, pool_size, timeout)
+        self.search_form = None
+        self.year_term = None
+        self.include_full = include_full
+
+    def get_search_form(self):
+        """
+        Downloads the search page the first time that it is needed.
+
+        :return: A BeautifulSoup object of the search page.
+        """
+
+        if self.search_form is None:
+            from bs4 import BeautifulSoup                                                       # Late import, a run from the cache never reads the form
+            status, data = self.pool.request('GET', self.path)
+            if status != 200:
+                raise ConnectionError("WebSoc answered " + str(status) + " for " + self.base_url)
+            self.search_form = BeautifulSoup(data.decode('utf-8', 'replace'), 'html.parser')
+        return self.search_form
+
+    def get_term(self):
+        """
+        Scrapes the term that is selected on the search page.
+
+        :return: A string that is the name of the term, e.g. "2019 Fall Quarter".
+        """
+
+        select = self.get_search_form().find('select', attrs={'name': 'YearTerm'})
+        option = select.find('option', selected=True) or select.find('option')
+        self.year_term = option.get('value')
+        return " ".join(option.text.split())
+
+    def get_department_options(self):
+        """
+        Scrapes the departments that can be searched.
+
+        :return: A dictionary of department codes (keys) and department names (values).
+        """
+
+        department_options = {}
+        for option in self.get_search_form().find('select', attrs={'name': 'Dept'}).find_all('option'):
+            department_line = option.text.split('.')
+            department_name = department_line[len(department_line) - 1].strip()
+            if department_name != "Include All Departments":                                  # Don't add the first line to the dictionary (it's useless)
+                department_options[option.get('value', department_line[0].strip())] = department_name
+        return department_options
+
+    def fetch_department_html(self, department, course_numbers):
+        """
+        Sends the search form for courses of one department.
+
+        :param department: A string that is the department code, e.g. "I&C SCI".
+        :param course_numbers: A string of course numbers as typed in the search form, e.g. "51, 139W".
+        :return: A string that is the html of the results page.
+        """
+
+        full_courses = 'ANY' if self.include_full else 'SkipFullWaitlist'                    # Classes that are full with a full wait list are skipped by default
+        return self.post_search_form({'Dept': department, 'CourseNum': course_numbers, 'FullCourses': full_courses}, department)
+
+    def fetch_class_codes_html(self, class_codes):
+        """
+        Sends the search form for a list of class codes. Full classes are shown as well, so that classes can be seen filling up and opening again.
+
+        :param class_codes: A string of class codes separated by commas, e.g. "35600,35602".
+        :return: A string that is the html of the results page.
+        """
+
+        return self.post_search_form({'Dept': ' ALL', 'CourseCodes': class_codes, 'FullCourses': 'ANY'}, "class codes " + class_codes)
+
+    def post_search_form(self, fields, description):
+        """
+        Sends the search form, the fields that are not given keep the values of a plain search.
+
+        :param fields: A dictionary of the fields of the form to set, e.g. {'Dept': "I&C SCI"}.
+        :param description: A string that names the search in errors.
+        :return: A string that is the html of the results page.
+        """
+
+        if self.year_term is None:
+            self.get_term()
+        form = {'Submit': 'Display Web Results', 'YearTerm': self.year_term, 'ShowDebug': '0', 'ShowFinals': '1', 'Breadth': 'ANY',
+                'Dept': ' ALL', 'CourseNum': '', 'CourseCodes': '', 'Division': 'ANY', 'ClassType': 'ALL', 'FullCourses': 'SkipFullWaitlist',
+                'FontSize': '100', 'CancelledCourses': 'Exclude'}
+        form.update(fields)
+        status, data = self.pool.request('POST', self.path, urlencode(form), {'Content-Type': 'application/x-www-form-urlencoded'})
+        if status != 200:
+            raise ConnectionError("WebSoc answered " + str(status) + " for " + description)
+        return data.decode('utf-8', 'replace')
+
+    def close(self):
+        """
+        Closes the connections to the server.
+
+        :return: Nothing
+        """
+
+        self.pool.close()